@@ -0,0 +1,308 @@
+"""Headless benchmarks: drive family_feud_streamlit.py through complete games.
+
+    python bench/bench_app.py                                   # default sizes, all scenarios
+    python bench/bench_app.py --answers 15 --teams 15 --out bench/results.json
+    python bench/bench_app.py --compare bench/baseline.json     # print deltas vs an older run
+
+Uses Streamlit's AppTest harness (no browser, no server). For each scenario
+it reports per-interaction rerun latency percentiles, the largest element
+count on a page, the largest serialized session_state (and key count; the
+marathon scenario also reports it after each of several games in one session,
+so leaks show up as growth) and peak Python memory
+(a second, slower pass under tracemalloc; skip it with --no-memory), and
+writes everything to a JSON file.
+"""
+import argparse
+import json
+import os
+import pickle
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT = os.path.join(ROOT, "family_feud_streamlit.py")
+SCENARIOS = ("full_game", "tiebreaker", "strike_storm", "marathon")
+
+# ---------------------------
+# Synthetic banks
+# ---------------------------
+def make_bank(rounds, questions, answers, tiebreakers):
+    def question(tag):
+        return {"prompt": f"Question {tag}", "answers": [
+            {"text": f"Answer {tag}.{a + 1}", "points": max(1, 50 - 3 * a)} for a in range(answers)
+        ]}
+    data = {"rounds": [
+        {"title": f"Round {r + 1}", "questions": [question(f"{r + 1}.{q + 1}") for q in range(questions)]}
+        for r in range(rounds)
+    ]}
+    for t in range(tiebreakers):
+        data["rounds"].append({"title": f"Sudden death {t + 1}", "tiebreaker": True, "questions": [question(f"TB{t + 1}")]})
+    return data
+
+# ---------------------------
+# Measurement helpers
+# ---------------------------
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))]
+
+def element_count(node):
+    children = getattr(node, "children", None) or {}
+    return 1 + sum(element_count(c) for c in children.values())
+
+def session_state_bytes(at):
+    state = at.session_state.filtered_state
+    try:
+        return len(pickle.dumps(state))
+    except Exception:
+        return len(repr(state).encode("utf-8"))
+
+class Driver:
+    # Wraps AppTest so every interaction is timed under a name
+    def __init__(self, teams):
+        from streamlit.testing.v1 import AppTest
+        self.at = AppTest.from_file(SCRIPT, default_timeout=120)
+        self.teams = teams
+        self.timings = {}
+        self.max_elements = 0
+        self.max_state_bytes = 0
+        self.max_state_keys = 0
+        self.loaded = False
+        self.per_game = []
+
+    def _run(self, kind, action=None):
+        t0 = time.perf_counter()
+        (action() if action else self.at).run()
+        self.timings.setdefault(kind, []).append(time.perf_counter() - t0)
+        if self.at.exception:
+            raise RuntimeError(f"app raised during {kind}: {self.at.exception[0].message}")
+        self.max_elements = max(self.max_elements, element_count(self.at._tree))
+        self.max_state_bytes = max(self.max_state_bytes, session_state_bytes(self.at))
+        self.max_state_keys = max(self.max_state_keys, len(self.at.session_state.filtered_state))
+
+    def button(self, label):
+        for b in self.at.button:
+            if b.label == label:
+                return b
+        raise LookupError(f"no button {label!r} on screen {self.screen()!r}")
+
+    def game(self):
+        # Game state lives in the host's room, not in its session
+        from feud.rooms import ROOMS
+        return ROOMS.open(self.at.session_state["room_id"], self.at.session_state["host_key"]).state
+
+    def screen(self):
+        return self.game().screen
+
+    def start(self):
+        if not self.loaded:
+            self._run("load")
+            self.loaded = True
+        # Like the browser: changing the selectbox reruns before Start is clicked
+        self._run("setup", lambda: self.at.selectbox(key="teams_select").set_value(self.teams))
+        self._run("start", lambda: self.button("🚀 Start").click())
+
+    def go(self):
+        self._run("go", lambda: self.button("🚀 GO!").click())
+
+    def select(self, ans_idx, value):
+        g = self.game()
+        key = f"sel_{g.round_index}_{g.q_in_round}_{ans_idx}"
+        kind = "reveal" if value == "Show" else "assign"
+        self._run(kind, lambda: self.at.selectbox(key=key).set_value(value))
+
+    def strike(self):
+        self._run("strike", lambda: self.at.button(key="strike_btn").click())
+
+    def next(self):
+        self._run("next", lambda: self.button("Next ➡️").click())
+
+    def finish(self):
+        self._run("continue", lambda: self.button("Continue ➡️").click())
+        self._run("home", lambda: self.button("🏠 Play again").click())
+
+    def answers_on_screen(self):
+        g = self.game()
+        prefix = f"sel_{g.round_index}_{g.q_in_round}_"
+        return sum(1 for box in self.at.selectbox if (box.key or "").startswith(prefix))
+
+# ---------------------------
+# Scenarios
+# ---------------------------
+def play(driver, per_question, max_steps=10000):
+    driver.start()
+    for _ in range(max_steps):
+        screen = driver.screen()
+        if screen == "round_intro":
+            driver.go()
+        elif screen == "question":
+            per_question(driver)
+            driver.next()
+        else:
+            break
+    driver.finish()
+
+def full_game(driver, labels):
+    def per_question(d):
+        for i in range(d.answers_on_screen()):
+            d.select(i, "Show" if i % 3 == 2 else labels[i % len(labels)])
+    play(driver, per_question)
+
+def tiebreaker(driver, labels):
+    # Only "Show": every team stays at 0, so the whole tiebreaker chain is played
+    def per_question(d):
+        for i in range(d.answers_on_screen()):
+            d.select(i, "Show")
+    play(driver, per_question)
+
+def strike_storm(driver, labels, strikes):
+    def per_question(d):
+        for _ in range(strikes):
+            d.strike()
+        d.select(0, labels[0])
+    play(driver, per_question)
+
+def marathon(driver, labels, games):
+    # One tab, many short games: session size after each game should stay flat
+    from feud import session
+
+    def per_question(d):
+        d.select(0, labels[0])
+    for _ in range(games):
+        play(driver, per_question)
+        mem = session.report(driver.at.session_state.filtered_state)
+        driver.per_game.append({"keys": mem["keys"], "bytes": mem["bytes"]})
+
+def run_scenario(name, args, labels):
+    from feud import render
+
+    def once():
+        driver = Driver(args.teams)
+        if name == "full_game":
+            full_game(driver, labels)
+        elif name == "tiebreaker":
+            tiebreaker(driver, labels)
+        elif name == "marathon":
+            marathon(driver, labels, args.games)
+        else:
+            strike_storm(driver, labels, args.strikes)
+        return driver
+
+    for cache in render.CACHES:
+        cache.clear()
+    t0 = time.perf_counter()
+    driver = once()
+    total = time.perf_counter() - t0
+    result = {
+        "total_s": round(total, 3),
+        "interactions": {
+            kind: {
+                "n": len(v),
+                "p50_ms": round(percentile(v, 50) * 1000, 2),
+                "p90_ms": round(percentile(v, 90) * 1000, 2),
+                "p99_ms": round(percentile(v, 99) * 1000, 2),
+                "max_ms": round(max(v) * 1000, 2),
+            }
+            for kind, v in driver.timings.items()
+        },
+        "max_elements": driver.max_elements,
+        "session_state_bytes": driver.max_state_bytes,
+        "session_state_keys": driver.max_state_keys,
+        "render_cache": render.stats(),
+    }
+    if driver.per_game:
+        result["per_game"] = driver.per_game
+
+    if not args.no_memory:
+        # Separate pass: tracemalloc would skew the latency numbers
+        tracemalloc.start()
+        once()
+        result["peak_memory_kb"] = tracemalloc.get_traced_memory()[1] // 1024
+        tracemalloc.stop()
+    return result
+
+# ---------------------------
+# Reporting
+# ---------------------------
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True).strip()
+    except Exception:
+        return None
+
+def compare(old, new):
+    for name, res in new["scenarios"].items():
+        prev = old.get("scenarios", {}).get(name)
+        if not prev:
+            continue
+        print(f"{name}:")
+        for kind, cur in res["interactions"].items():
+            before = prev["interactions"].get(kind)
+            if not before or not before["p50_ms"]:
+                continue
+            delta = (cur["p50_ms"] - before["p50_ms"]) / before["p50_ms"] * 100
+            print(f"  {kind:<10} p50 {before['p50_ms']:>8.2f} -> {cur['p50_ms']:>8.2f} ms ({delta:+.1f}%)")
+        for key in ("max_elements", "session_state_bytes", "session_state_keys", "peak_memory_kb"):
+            if key in prev and key in res:
+                print(f"  {key:<20} {prev[key]:>10} -> {res[key]:>10}")
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--rounds", type=int, default=3)
+    ap.add_argument("--questions", type=int, default=3, help="questions per round")
+    ap.add_argument("--answers", type=int, default=15, help="answers per question (max 15)")
+    ap.add_argument("--teams", type=int, default=15, help="number of teams (max 15)")
+    ap.add_argument("--tiebreakers", type=int, default=2, help="tiebreaker rounds appended to the bank")
+    ap.add_argument("--strikes", type=int, default=10, help="strikes per question in strike_storm")
+    ap.add_argument("--games", type=int, default=5, help="games played in one session by marathon")
+    ap.add_argument("--scenario", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    ap.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    ap.add_argument("--out", default=os.path.join(ROOT, "bench", "results.json"))
+    ap.add_argument("--compare", help="previous results file to diff against")
+    args = ap.parse_args(argv)
+    args.answers = max(1, min(args.answers, 15))
+    args.teams = max(1, min(args.teams, 15))
+
+    workdir = tempfile.mkdtemp(prefix="feud-bench-")
+    bank_path = os.path.join(workdir, "questions.json")
+    with open(bank_path, "w", encoding="utf-8") as f:
+        json.dump(make_bank(args.rounds, args.questions, args.answers, args.tiebreakers), f)
+    # Must be set before the app (and feud.journal / feud.library) is first imported
+    os.environ["FEUD_QUESTIONS"] = bank_path
+    os.environ["FEUD_DATA_DIR"] = os.path.join(workdir, "data")
+    os.environ["FEUD_CACHE_DIR"] = os.path.join(workdir, "cache")
+    os.chdir(ROOT)
+    sys.path.insert(0, ROOT)
+
+    labels = [chr(ord("A") + i) for i in range(args.teams)]
+    results = {
+        "meta": {
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "streamlit": __import__("streamlit").__version__,
+            "params": {k: getattr(args, k) for k in ("rounds", "questions", "answers", "teams", "tiebreakers", "strikes", "games")},
+            "timestamp": int(time.time()),
+        },
+        "scenarios": {},
+    }
+    for name in args.scenario:
+        print(f"running {name} ...", file=sys.stderr)
+        results["scenarios"][name] = run_scenario(name, args, labels)
+
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(json.dumps(results["scenarios"], indent=2))
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            compare(json.load(f), results)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
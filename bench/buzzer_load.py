@@ -0,0 +1,357 @@
+"""Buzzer load test: arbitration latency and fairness with many players pressing at once.
+
+    python bench/buzzer_load.py                                   # starts the app; 50, 100, 200 phones
+    python bench/buzzer_load.py --players 100 400 --teams 4 --rounds 20 --spread-ms 10
+    python bench/buzzer_load.py --inproc --players 100 500 1000   # the arbiter alone: threads, no server
+
+Over websockets (the default) a simulated host starts a game with player buzzers and
+every simulated phone opens the host's link ?room=<id>&view=buzzer&pad=<key>&team=<label>
+(teams dealt round robin) and enters its name, the way phone browsers do
+(loadgen.Session). From then on a phone is its buzz pad (feud/buzzpad_frontend), with
+the player id and pad key its page handed the pad: a long poll on the app's buzzer
+handler and presses posted to it, over keep-alive HTTP. Each round the host shows the
+next question, the phones' polls report the buzzer open, then all of them press at one
+shared instant plus a random offset in [0, --spread-ms]. The host board is polled as
+the browser would (its fragment timer) until it shows the presses.
+
+  press p50/p95/p99   press sent -> the handler's answer, verdict included
+  open p95            host's next-question rerun done -> a phone's poll showing the round open
+  board p50/p95       first press sent -> host board showing the first team (its poll included)
+  verdict p50/p99     server stamp -> arbiter verdict (inproc only: in-process counters)
+  fair                per team and round, the winner is the player who sent first;
+                      broken down by the gap between that team's first two senders
+
+Client and server share the machine and CLOCK_MONOTONIC, so send order is the
+ground truth; a wrong winner means the server saw the presses in another order
+than they were sent (socket or handler thread queueing). Everything runs on
+localhost; nothing is downloaded.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import urlencode, urlsplit
+
+from bench_app import ROOT, git_revision, make_bank, percentile
+from loadgen import ProcStats, Session, free_port, start_server, wait_healthy
+
+GAPS_MS = (1.0, 5.0, 20.0)  # fairness buckets: gap between a team's first two senders
+BOARD = re.compile(r"Team ([^<]+)</span><span>([^<]*)</span>")
+PAD_KEY = re.compile(r"[?&]pad=([\w-]+)")
+
+def gap_bucket(gap_ms):
+    for edge in GAPS_MS:
+        if gap_ms < edge:
+            return f"<{edge:g}ms"
+    return f">={GAPS_MS[-1]:g}ms"
+
+def judge(sent, winners, fair):
+    # sent: team -> [(t_ns, player)]; winners: team -> player shown first for it
+    for team, presses in sent.items():
+        presses.sort()
+        gap = (presses[1][0] - presses[0][0]) / 1e6 if len(presses) > 1 else float("inf")
+        ok, n = fair.setdefault(gap_bucket(gap), [0, 0])
+        fair[gap_bucket(gap)] = [ok + (winners.get(team) == presses[0][1]), n + 1]
+
+def summarize_fair(fair):
+    ok = sum(v[0] for v in fair.values())
+    n = sum(v[1] for v in fair.values())
+    return {
+        "fair_pct": round(100.0 * ok / n, 1) if n else None,
+        "by_gap": {k: {"fair_pct": round(100.0 * fair[k][0] / fair[k][1], 1), "n": fair[k][1]}
+                   for k in [f"<{edge:g}ms" for edge in GAPS_MS] + [f">={GAPS_MS[-1]:g}ms"] if k in fair},
+    }
+
+# ---------------------------
+# In process: the arbiter alone
+# ---------------------------
+def inproc_stage(players, teams, rounds, spread_ms, seed):
+    sys.path.insert(0, ROOT)
+    from feud import buzzer
+
+    rng = random.Random(seed)
+    b = buzzer.Buzzer("bench")
+    buzzer._LATENCY.clear()  # verdict percentiles per stage
+    press_lat, fair = [], {}
+    for r in range(rounds):
+        b.arm(("bench", seed, r))
+        while b.result.opened_ns == 0 or b.key != ("bench", seed, r):
+            time.sleep(0.001)
+        offsets = [rng.uniform(0, spread_ms) / 1000 for _ in range(players)]
+        sent = {}
+        lock = threading.Lock()
+        barrier = threading.Barrier(players)
+
+        def player(i):
+            barrier.wait()
+            time.sleep(offsets[i])
+            t0 = time.monotonic_ns()
+            b.press(i % teams, f"p{i}", f"p{i}")
+            t1 = time.monotonic_ns()
+            with lock:
+                sent.setdefault(i % teams, []).append((t0, f"p{i}"))
+                press_lat.append((t1 - t0) / 1e9)
+
+        threads = [threading.Thread(target=player, args=(i,)) for i in range(players)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        judge(sent, {p.team: p.player for p in b.result.firsts}, fair)
+    st = buzzer.stats()
+    return dict(players=players, teams=teams, rounds=rounds,
+                press_p50_ms=round(percentile(press_lat, 50) * 1000, 3),
+                press_p95_ms=round(percentile(press_lat, 95) * 1000, 3),
+                press_p99_ms=round(percentile(press_lat, 99) * 1000, 3),
+                verdict_p50_us=st["verdict_p50_us"], verdict_p99_us=st["verdict_p99_us"],
+                **summarize_fair(fair))
+
+# ---------------------------
+# Over websockets: a real server, one session per phone
+# ---------------------------
+def button(sess, label):
+    return next((w for w in sess.widgets.values() if w["type"] == "button" and w["label"] == label), None)
+
+async def host_start(host, teams):
+    await host.connect()
+    await host.rerun("load")
+    select = host.find("Choose the number of teams and press Start.")
+    await host.rerun("setup", values={select: str(teams)} if select else None)
+    await host.rerun("setup", values={host.find("🔔 Player buzzers"): True})
+    await host.rerun("start", trigger=button(host, "🚀 Start")["id"])
+    room = dict(p.split("=", 1) for p in host.query.split("&") if "=" in p)["room"]
+    pad = next(m.group(1) for text in host.texts for m in [PAD_KEY.search(text)] if m)  # the buzzer links
+    return room, pad
+
+async def phone_join(sess, name):
+    await sess.connect()
+    await sess.rerun("phone_load")
+    await sess.rerun("phone_name", values={sess.find("Your name"): name})
+    return sess.components["feud.buzzpad.feud_buzzpad"]  # what the page handed its pad
+
+class Pad:
+    # A phone's buzz pad: one keep-alive connection for its long poll, one for presses
+    def __init__(self, buzzer_url, args):
+        url = urlsplit(buzzer_url)
+        self.host, self.port = url.hostname, url.port
+        self.room, self.pad, self.team, self.player = args["room"], args["pad"], args["team"], args["player"]
+        self.game, self.since = args["game"], -1
+        self._conns = {}
+
+    async def _call(self, conn, method, target, body=b""):
+        if conn not in self._conns:
+            self._conns[conn] = await asyncio.open_connection(self.host, self.port)
+        reader, writer = self._conns[conn]
+        head = f"{method} {target} HTTP/1.1\r\nHost: {self.host}\r\nContent-Length: {len(body)}\r\n"
+        if body:
+            head += "Content-Type: application/x-www-form-urlencoded\r\n"
+        writer.write(head.encode() + b"\r\n" + body)
+        await writer.drain()
+        status = await reader.readline()
+        length = 0
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            key, _, value = line.decode("latin-1").partition(":")
+            if key.strip().lower() == "content-length":
+                length = int(value)
+        if b" 200 " not in status:
+            raise RuntimeError(f"{method} {target}: {status!r}")
+        view = json.loads(await reader.readexactly(length))
+        self.since, self.game = view["v"], view["game"]
+        return view
+
+    async def state(self, conn="poll"):
+        q = urlencode({"room": self.room, "pad": self.pad, "team": self.team, "player": self.player,
+                       "game": self.game, "since": self.since})
+        return await self._call(conn, "GET", f"/state?{q}")
+
+    async def warm(self):
+        # Like the pad's first poll: answers at once and leaves a connection open for presses
+        self.since = -1
+        return await self.state("press")
+
+    async def press(self):
+        body = urlencode({"room": self.room, "pad": self.pad, "team": self.team, "player": self.player,
+                          "game": self.game})
+        return await self._call("press", "POST", "/press", body.encode())
+
+    def close(self):
+        for _reader, writer in self._conns.values():
+            writer.close()
+
+async def wait_open(pad, round_no, since_ns, opened):
+    # The pad's long poll until this round is open
+    mark = f"Round {round_no}: buzz"
+    for _ in range(100):
+        view = await pad.state()
+        if view["open"] and view["text"].startswith(mark):
+            opened.append((time.monotonic_ns() - since_ns) / 1e9)
+            return
+    raise RuntimeError(f"buzzer round {round_no} never opened")
+
+async def press_at(pad, at, sent, team, name, lat):
+    await asyncio.sleep(max(0.0, at - time.monotonic()))
+    t0 = time.monotonic_ns()
+    await pad.press()
+    lat.append((time.monotonic_ns() - t0) / 1e9)
+    sent.setdefault(team, []).append((t0, name))
+
+async def board_until(host, labels, teams_pressing):
+    # The host board's timer, until every team that pressed shows up; returns winners and when the first showed
+    shown_ns = 0
+    while True:
+        await host.rerun("board_poll", fragment=host.fragment)
+        shown = dict(BOARD.findall(" ".join(host.texts)))
+        if shown and not shown_ns:
+            shown_ns = time.monotonic_ns()
+        if len(shown) >= teams_pressing:
+            return {labels.index(lab): name for lab, name in shown.items() if lab in labels}, shown_ns
+        await asyncio.sleep(host.interval or 0.5)
+
+async def ws_stage(ws_url, buzzer_url, players, teams, rounds, spread_ms, seed, stats):
+    rng = random.Random(seed)
+    labels = [chr(ord("A") + t) for t in range(teams)]
+    host = Session(ws_url, "", stats)
+    room, key = await host_start(host, teams)
+    phones = [Session(ws_url, f"room={room}&view=buzzer&pad={key}&team={labels[i % teams]}", stats)
+              for i in range(players)]
+    joined = await asyncio.gather(*(phone_join(p, f"p{i}") for i, p in enumerate(phones)))
+    pads = [Pad(buzzer_url, args) for args in joined]
+    await asyncio.gather(*(p.warm() for p in pads))
+    await host.rerun("go", trigger=button(host, "🚀 GO!")["id"])
+
+    fair, board_lat, errors = {}, [], []
+    press_lat, open_lat = stats.setdefault("pad_press", []), stats.setdefault("pad_open", [])
+    for r in range(rounds):
+        if r:
+            await host.rerun("next", trigger=button(host, "Next ➡️")["id"])
+        shown = time.monotonic_ns()
+        await asyncio.gather(*(wait_open(p, r + 1, shown, open_lat) for p in pads))
+        start = time.monotonic() + 0.2
+        sent = {}
+        watch = asyncio.ensure_future(board_until(host, labels, min(teams, players)))
+        results = await asyncio.gather(
+            *(press_at(p, start + rng.uniform(0, spread_ms) / 1000, sent, i % teams, f"p{i}", press_lat)
+              for i, p in enumerate(pads)),
+            return_exceptions=True)
+        errors += [repr(e) for e in results if isinstance(e, BaseException)]
+        winners, shown_ns = await asyncio.wait_for(watch, 30)
+        first_sent = min(t for presses in sent.values() for t, _name in presses)
+        board_lat.append(max(0, shown_ns - first_sent) / 1e9)
+        judge(sent, winners, fair)
+    for s in [host] + phones:
+        s.close()
+    for p in pads:
+        p.close()
+    return fair, board_lat, errors
+
+def ws_run(ws_url, buzzer_url, players, teams, rounds, spread_ms, seed, proc_stats):
+    stats = {}
+    cpu0, wall0, mine0 = proc_stats.cpu_seconds() if proc_stats else None, time.monotonic(), time.process_time()
+    fair, board_lat, errors = asyncio.run(ws_stage(ws_url, buzzer_url, players, teams, rounds, spread_ms, seed, stats))
+    wall = time.monotonic() - wall0
+    press = stats.get("pad_press", [])
+    return dict(players=players, teams=teams, rounds=rounds,
+                press_p50_ms=round(percentile(press, 50) * 1000, 2),
+                press_p95_ms=round(percentile(press, 95) * 1000, 2),
+                press_p99_ms=round(percentile(press, 99) * 1000, 2),
+                board_p50_ms=round(percentile(board_lat, 50) * 1000, 1) if board_lat else None,
+                board_p95_ms=round(percentile(board_lat, 95) * 1000, 1) if board_lat else None,
+                open_p95_ms=round(percentile(stats.get("pad_open", [0]), 95) * 1000, 1),
+                server_cpu_pct=round((proc_stats.cpu_seconds() - cpu0) / wall * 100, 1) if proc_stats else None,
+                server_rss_mb=round(proc_stats.rss_kb() / 1024, 1) if proc_stats else None,
+                loadgen_cpu_pct=round((time.process_time() - mine0) / wall * 100, 1),
+                errors=errors, **summarize_fair(fair))
+
+# ---------------------------
+# Reporting
+# ---------------------------
+def print_row(r):
+    board = "-" if r.get("board_p50_ms") is None else f"{r['board_p50_ms']:.0f}/{r['board_p95_ms']:.0f}"
+    opened = "-" if r.get("open_p95_ms") is None else f"{r['open_p95_ms']:.0f}"
+    verdict = "-" if r.get("verdict_p50_us") is None else f"{r['verdict_p50_us']:.0f}/{r['verdict_p99_us']:.0f}"
+    cpu = "-" if r.get("server_cpu_pct") is None else f"{r['server_cpu_pct']:.0f}%"
+    gaps = " ".join(f"{k} {v['fair_pct']:.0f}%" for k, v in r["by_gap"].items())
+    print(f"{r['players']:>7} {r['press_p50_ms']:>9.2f} {r['press_p95_ms']:>9.2f} {r['press_p99_ms']:>9.2f}"
+          f" {opened:>8} {board:>11} {verdict:>11} {cpu:>7} {r['fair_pct']:>6.1f}%  {gaps}"
+          f"{'  errors: %d' % len(r['errors']) if r.get('errors') else ''}")
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--players", type=int, nargs="+", default=[50, 100, 200], help="phones per stage")
+    ap.add_argument("--teams", type=int, default=4)
+    ap.add_argument("--rounds", type=int, default=10, help="buzzer rounds (questions) per stage")
+    ap.add_argument("--spread-ms", type=float, default=20.0, help="presses land within this window")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--inproc", action="store_true", help="time the arbiter in this process (threads, no server)")
+    ap.add_argument("--url", help="test this running server instead of starting one")
+    ap.add_argument("--pid", type=int, help="server pid for CPU/memory when using --url")
+    ap.add_argument("--buzzer-url", help="its buzzer handler (default: the --url host on port 8502)")
+    ap.add_argument("--out", default=os.path.join(ROOT, "bench", "buzzer_results.json"))
+    args = ap.parse_args(argv)
+    teams = max(1, min(args.teams, 15))
+
+    results = {
+        "meta": {
+            "revision": git_revision(),
+            "python": sys.version.split()[0],
+            "cpus": os.cpu_count(),
+            "mode": "inproc" if args.inproc else "websocket",
+            "params": {k: getattr(args, k) for k in ("teams", "rounds", "spread_ms", "seed")},
+            "timestamp": int(time.time()),
+        },
+        "stages": [],
+    }
+    proc = None
+    print(f"{'players':>7} {'press p50':>9} {'press p95':>9} {'press p99':>9} {'open p95':>8} {'board ms':>11} {'verdict us':>11}"
+          f" {'srv cpu':>7} {'fair':>7}  by gap between a team's first two presses")
+    try:
+        if not args.inproc:
+            workdir = tempfile.mkdtemp(prefix="feud-buzz-")
+            if args.url:
+                url, pid = args.url.rstrip("/"), args.pid
+                buzzer_url = args.buzzer_url or f"{urlsplit(url).scheme}://{urlsplit(url).hostname}:8502"
+            else:
+                bank_path = os.path.join(workdir, "questions.json")
+                with open(bank_path, "w", encoding="utf-8") as f:
+                    json.dump(make_bank(1, args.rounds + 1, 4, 0), f)
+                url = f"http://127.0.0.1:{free_port()}"
+                buzzer_url = f"http://127.0.0.1:{free_port()}"
+                os.environ["FEUD_BUZZER_PORT"] = buzzer_url.rsplit(":", 1)[1]  # the server inherits it
+                proc = start_server(bank_path, workdir, int(url.rsplit(":", 1)[1]))
+                pid = proc.pid
+                wait_healthy(url, proc=proc)
+            ws_url = url.replace("http", "ws", 1) + "/_stcore/stream"
+            proc_stats = ProcStats(pid) if pid and os.path.exists(f"/proc/{pid}") else None
+        for i, players in enumerate(args.players):
+            seed = args.seed * 1000 + i
+            if args.inproc:
+                r = inproc_stage(players, teams, args.rounds, args.spread_ms, seed)
+            else:
+                r = ws_run(ws_url, buzzer_url, players, teams, args.rounds, args.spread_ms, seed, proc_stats)
+            results["stages"].append(r)
+            print_row(r)
+    finally:
+        if proc is not None:
+            proc.terminate()
+            try:
+                proc.wait(10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"results in {args.out}", file=sys.stderr)
+    return 1 if any(r.get("errors") for r in results["stages"]) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,412 @@
+"""Load generator: many concurrent games and audience displays against a real server.
+
+    python bench/loadgen.py                                  # starts the app, ramps 1,2,4,8 games
+    python bench/loadgen.py --ramp 1 5 10 20 --viewers 3 --duration 60 --out bench/load.json
+    python bench/loadgen.py --url http://127.0.0.1:8501 --pid 1234   # an already running server
+
+Starts family_feud_streamlit.py on a free local port (like the Containerfile does,
+with a synthetic bank) and talks to it over Streamlit's own websocket protocol, the
+way browser tabs do: each simulated host opens a room and plays games (start, GO,
+reveal/assign answers, strikes, next, play again) with a think time between clicks,
+and each simulated audience display follows its host's room by sending the
+auto-rerun ticks a browser would. For every concurrency stage it reports reruns per
+second, p50/p95/p99 rerun latency per action and the server's CPU and memory (read
+from /proc, so Linux only). Everything runs on localhost; nothing is downloaded.
+The generator itself shares the machine: its own CPU time is reported too.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+from tornado.websocket import websocket_connect
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+from bench_app import ROOT, SCRIPT, git_revision, make_bank, percentile
+
+EARLY = ForwardMsg.DESCRIPTOR.fields_by_name["script_finished"].enum_type.values_by_name["FINISHED_EARLY_FOR_RERUN"].number
+READ_TIMEOUT = 120.0
+
+# ---------------------------
+# Server under test
+# ---------------------------
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def start_server(bank_path, workdir, port):
+    env = dict(os.environ, FEUD_QUESTIONS=bank_path, FEUD_DATA_DIR=os.path.join(workdir, "data"),
+               FEUD_CACHE_DIR=os.path.join(workdir, "cache"), STREAMLIT_BROWSER_GATHER_USAGE_STATS="false")
+    log = open(os.path.join(workdir, "server.log"), "w")
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", SCRIPT, "--server.address=127.0.0.1",
+         f"--server.port={port}", "--server.headless=true", "--server.fileWatcherType=none"],
+        cwd=ROOT, env=env, stdout=log, stderr=subprocess.STDOUT,
+    )
+    return proc
+
+def wait_healthy(url, timeout=60.0, proc=None):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc is not None and proc.poll() is not None:
+            raise RuntimeError(f"server exited with {proc.returncode}")
+        try:
+            with urllib.request.urlopen(f"{url}/_stcore/health", timeout=2) as r:
+                if r.read().strip() == b"ok":
+                    return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"{url} did not become healthy in {timeout:.0f}s")
+
+class ProcStats:
+    # CPU seconds and resident memory of one process, from /proc
+    def __init__(self, pid):
+        self.pid = pid
+        self.tick = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+    def cpu_seconds(self):
+        try:
+            with open(f"/proc/{self.pid}/stat") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+            return (int(fields[11]) + int(fields[12])) / self.tick  # utime + stime
+        except (OSError, IndexError, ValueError):
+            return None
+
+    def rss_kb(self):
+        try:
+            with open(f"/proc/{self.pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        return int(line.split()[1])
+        except (OSError, ValueError):
+            pass
+        return None
+
+# ---------------------------
+# Simulated browser tabs
+# ---------------------------
+class Session:
+    # One websocket session; keeps widget values like the frontend does
+    def __init__(self, ws_url, query, stats):
+        self.ws_url = ws_url
+        self.query = query
+        self.stats = stats          # kind -> [seconds]
+        self.widgets = {}           # id -> {"type", "label", "value", "options"}
+        self.fragment = None        # auto-rerun fragment id and interval (audience)
+        self.interval = None
+        self.texts = []             # markdown and alert bodies drawn by the last rerun
+        self.components = {}        # custom component name -> its args, as last drawn
+        self.ws = None
+
+    async def connect(self):
+        self.ws = await websocket_connect(self.ws_url, subprotocols=["streamlit"])
+
+    def close(self):
+        if self.ws is not None:
+            self.ws.close()
+
+    def _record_element(self, el, seen, fragment_id=""):
+        kind = el.WhichOneof("type")
+        if kind == "markdown":
+            self.texts.append(el.markdown.body)
+            return
+        if kind == "alert":
+            self.texts.append(el.alert.body)
+            return
+        if kind == "component_instance":
+            self.components[el.component_instance.component_name] = json.loads(el.component_instance.json_args)
+            return
+        if kind == "button":
+            w = {"type": "button", "label": el.button.label, "id": el.button.id, "disabled": el.button.disabled}
+        elif kind == "checkbox":
+            cb = el.checkbox
+            old = self.widgets.get(cb.id)
+            value = cb.value if cb.set_value else (old["value"] if old else cb.default)
+            w = {"type": "checkbox", "label": cb.label, "id": cb.id, "value": value}
+        elif kind == "selectbox":
+            sb = el.selectbox
+            old = self.widgets.get(sb.id)
+            if sb.HasField("raw_value"):
+                value = sb.raw_value
+            elif old is not None:
+                value = old["value"]
+            else:
+                value = sb.options[sb.default] if sb.HasField("default") and sb.options else None
+            w = {"type": "selectbox", "label": sb.label, "id": sb.id, "value": value, "options": list(sb.options)}
+        elif kind == "text_input":
+            ti = el.text_input
+            old = self.widgets.get(ti.id)
+            value = ti.value if ti.HasField("value") else (old["value"] if old else ti.default)
+            w = {"type": "text_input", "label": ti.label, "id": ti.id, "value": value}
+        else:
+            return
+        w["fragment"] = fragment_id
+        seen[w["id"]] = w
+
+    async def rerun(self, kind, trigger=None, values=None, fragment=None, auto=True):
+        # `fragment` reruns just that fragment: its timer (auto) or one of its widgets
+        bm = BackMsg()
+        cs = bm.rerun_script
+        cs.query_string = self.query
+        cs.page_script_hash = ""
+        if fragment:
+            cs.fragment_id = fragment
+            cs.is_auto_rerun = auto
+        for wid, w in self.widgets.items():
+            state = cs.widget_states.widgets.add()
+            state.id = wid
+            if w["type"] == "button":
+                state.trigger_value = wid == trigger
+            elif w["type"] == "checkbox":
+                state.bool_value = (values or {}).get(wid, w["value"])
+            elif w["value"] is not None:
+                state.string_value = (values or {}).get(wid, w["value"])
+        for wid, v in (values or {}).items():
+            if wid in self.widgets:
+                self.widgets[wid]["value"] = v
+
+        self.texts = []
+        t0 = time.perf_counter()
+        await self.ws.write_message(bm.SerializeToString(), binary=True)
+        seen, full = {}, not fragment
+        while True:
+            raw = await asyncio.wait_for(self.ws.read_message(), READ_TIMEOUT)
+            if raw is None:
+                raise ConnectionError("server closed the websocket")
+            fm = ForwardMsg()
+            fm.ParseFromString(raw)
+            msg = fm.WhichOneof("type")
+            if msg == "new_session":
+                # a full run (also when a fragment asked for one) redraws every widget
+                full = not fm.new_session.fragment_ids_this_run
+                seen = {}
+            elif msg == "delta" and fm.delta.WhichOneof("type") == "new_element":
+                self._record_element(fm.delta.new_element, seen, fm.delta.fragment_id)
+            elif msg == "page_info_changed":
+                self.query = fm.page_info_changed.query_string
+            elif msg == "auto_rerun":
+                self.fragment, self.interval = fm.auto_rerun.fragment_id, fm.auto_rerun.interval
+            elif msg == "script_finished" and fm.script_finished != EARLY:
+                break
+        elapsed = time.perf_counter() - t0
+        self.stats.setdefault(kind, []).append(elapsed)
+        if full:
+            self.widgets = seen
+        else:
+            self.widgets.update(seen)
+        return elapsed
+
+    def find(self, label):
+        for wid, w in self.widgets.items():
+            if w["label"] == label:
+                return wid
+        return None
+
+    def rows(self):
+        return [w for w in self.widgets.values()
+                if w["type"] == "selectbox" and w["label"].startswith("Select team for answer")]
+
+async def host_loop(sess, rng, think, until, reveals, strike_rate, rooms):
+    await sess.connect()
+    await sess.rerun("load")
+    rooms.append(dict(p.split("=", 1) for p in sess.query.split("&") if "=" in p).get("room"))
+
+    async def click(kind, label):
+        wid = sess.find(label)
+        if wid is None:
+            return False
+        await asyncio.sleep(think * rng.uniform(0.5, 1.5))
+        await sess.rerun(kind, trigger=wid)
+        return True
+
+    while time.monotonic() < until:
+        rows = sess.rows()
+        if rows:
+            for w in rng.sample(rows, min(reveals, len(rows))):
+                if time.monotonic() >= until:
+                    break
+                value = rng.choice(w["options"][1:])  # "Show" or a team
+                await asyncio.sleep(think * rng.uniform(0.5, 1.5))
+                await sess.rerun("reveal" if value == "Show" else "assign", values={w["id"]: value})
+            if rng.random() < strike_rate:
+                await click("strike", "❌")
+            await click("next", "Next ➡️")
+        elif not (await click("start", "🚀 Start") or await click("go", "🚀 GO!")
+                  or await click("continue", "Continue ➡️") or await click("home", "🏠 Play again")):
+            raise RuntimeError("host page has nothing to click")
+
+async def viewer_loop(sess, until):
+    await sess.connect()
+    await sess.rerun("view_load")
+    while time.monotonic() < until:
+        # like the browser: the audience fragment asks for a rerun every interval
+        await asyncio.sleep(sess.interval or 1.0)
+        await sess.rerun("view_tick", fragment=sess.fragment)
+
+# ---------------------------
+# Stages
+# ---------------------------
+async def run_stage(ws_url, games, args, seed):
+    stats = {}
+    rooms = []
+    until = time.monotonic() + args.duration
+    hosts = [Session(ws_url, "", stats) for _ in range(games)]
+    tasks = [asyncio.ensure_future(host_loop(h, random.Random(seed + i), args.think, until,
+                                             args.reveals, args.strike_rate, rooms))
+             for i, h in enumerate(hosts)]
+    # audience displays join once their host has a room
+    while len(rooms) < games and not any(t.done() for t in tasks):
+        await asyncio.sleep(0.05)
+    viewers = [Session(ws_url, f"room={room}&view=audience", stats) for room in rooms for _ in range(args.viewers)]
+    tasks += [asyncio.ensure_future(viewer_loop(v, until)) for v in viewers]
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    for s in hosts + viewers:
+        s.close()
+    errors = [repr(r) for r in results if isinstance(r, BaseException)]
+    return stats, errors
+
+def summarize(stats):
+    out = {}
+    for kind, v in sorted(stats.items()):
+        out[kind] = {
+            "n": len(v),
+            "p50_ms": round(percentile(v, 50) * 1000, 2),
+            "p95_ms": round(percentile(v, 95) * 1000, 2),
+            "p99_ms": round(percentile(v, 99) * 1000, 2),
+        }
+    return out
+
+def stage(ws_url, games, args, proc_stats, seed):
+    cpu0, wall0, mine0 = proc_stats.cpu_seconds() if proc_stats else None, time.monotonic(), time.process_time()
+    peak = [proc_stats.rss_kb() if proc_stats else None]
+
+    async def sample():
+        while True:
+            await asyncio.sleep(0.5)
+            peak.append(proc_stats.rss_kb())
+
+    async def main():
+        sampler = asyncio.ensure_future(sample()) if proc_stats else None
+        try:
+            return await run_stage(ws_url, games, args, seed)
+        finally:
+            if sampler:
+                sampler.cancel()
+
+    stats, errors = asyncio.run(main())
+    wall = time.monotonic() - wall0
+    cpu1 = proc_stats.cpu_seconds() if proc_stats else None
+    every = [x for v in stats.values() for x in v]
+    actions = [x for k, v in stats.items() if k != "load" and not k.startswith("view") for x in v]
+    rss = [p for p in peak if p is not None]
+    return {
+        "games": games,
+        "viewers": games * args.viewers,
+        "seconds": round(wall, 2),
+        "reruns_per_s": round(len(every) / wall, 2),
+        "host_p50_ms": round(percentile(actions, 50) * 1000, 2),
+        "host_p95_ms": round(percentile(actions, 95) * 1000, 2),
+        "host_p99_ms": round(percentile(actions, 99) * 1000, 2),
+        "all_p95_ms": round(percentile(every, 95) * 1000, 2),
+        "server_cpu_pct": round((cpu1 - cpu0) / wall * 100, 1) if cpu0 is not None and cpu1 is not None else None,
+        "server_rss_mb": round(max(rss) / 1024, 1) if rss else None,
+        "loadgen_cpu_pct": round((time.process_time() - mine0) / wall * 100, 1),
+        "errors": errors,
+        "interactions": summarize(stats),
+    }
+
+# ---------------------------
+# Reporting
+# ---------------------------
+def print_row(r, slo_ms):
+    flag = "  <- over SLO" if r["host_p95_ms"] > slo_ms else ""
+    cpu = "-" if r["server_cpu_pct"] is None else f"{r['server_cpu_pct']:.0f}%"
+    rss = "-" if r["server_rss_mb"] is None else f"{r['server_rss_mb']:.0f} MB"
+    print(f"{r['games']:>5} {r['viewers']:>7} {r['reruns_per_s']:>9.1f} {r['host_p50_ms']:>9.1f} {r['host_p95_ms']:>9.1f}"
+          f" {r['host_p99_ms']:>9.1f} {r['all_p95_ms']:>9.1f} {cpu:>7} {rss:>9} {r['loadgen_cpu_pct']:>6.0f}%"
+          f"{'  errors: %d' % len(r['errors']) if r['errors'] else ''}{flag}")
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--ramp", type=int, nargs="+", default=[1, 2, 4, 8], help="concurrent games per stage")
+    ap.add_argument("--viewers", type=int, default=2, help="audience displays per game")
+    ap.add_argument("--duration", type=float, default=30.0, help="seconds per stage")
+    ap.add_argument("--think", type=float, default=1.0, help="mean host pause between clicks, seconds (0 = flat out)")
+    ap.add_argument("--reveals", type=int, default=4, help="answers revealed/assigned per question")
+    ap.add_argument("--strike-rate", type=float, default=0.5, help="chance of a strike per question")
+    ap.add_argument("--slo-ms", type=float, default=500.0, help="host p95 latency that counts as degraded")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--url", help="test this running server instead of starting one (e.g. the container)")
+    ap.add_argument("--pid", type=int, help="server pid for CPU/memory when using --url")
+    ap.add_argument("--bank", help="question file for the started server (default: synthetic, like bench_app.py)")
+    ap.add_argument("--rounds", type=int, default=3)
+    ap.add_argument("--questions", type=int, default=3, help="questions per round")
+    ap.add_argument("--answers", type=int, default=8, help="answers per question (max 15)")
+    ap.add_argument("--out", default=os.path.join(ROOT, "bench", "load_results.json"))
+    args = ap.parse_args(argv)
+
+    proc = None
+    workdir = tempfile.mkdtemp(prefix="feud-load-")
+    if args.url:
+        url = args.url.rstrip("/")
+        pid = args.pid
+    else:
+        bank_path = args.bank
+        if not bank_path:
+            bank_path = os.path.join(workdir, "questions.json")
+            with open(bank_path, "w", encoding="utf-8") as f:
+                json.dump(make_bank(args.rounds, args.questions, max(1, min(args.answers, 15)), 0), f)
+        url = f"http://127.0.0.1:{free_port()}"
+        proc = start_server(os.path.abspath(bank_path), workdir, int(url.rsplit(":", 1)[1]))
+        pid = proc.pid
+    ws_url = url.replace("http", "ws", 1) + "/_stcore/stream"
+    proc_stats = ProcStats(pid) if pid and os.path.exists(f"/proc/{pid}") else None
+
+    results = {
+        "meta": {
+            "revision": git_revision(),
+            "python": sys.version.split()[0],
+            "streamlit": __import__("streamlit").__version__,
+            "cpus": os.cpu_count(),
+            "server": url if args.url else "started by loadgen",
+            "params": {k: getattr(args, k) for k in ("viewers", "duration", "think", "reveals", "strike_rate", "seed")},
+            "timestamp": int(time.time()),
+        },
+        "stages": [],
+    }
+    try:
+        wait_healthy(url, proc=proc)
+        print(f"{'games':>5} {'viewers':>7} {'reruns/s':>9} {'host p50':>9} {'host p95':>9} {'host p99':>9}"
+              f" {'all p95':>9} {'srv cpu':>7} {'srv rss':>9} {'loadgen':>7}")
+        for i, games in enumerate(args.ramp):
+            r = stage(ws_url, games, args, proc_stats, args.seed * 1000 + i * 100)
+            results["stages"].append(r)
+            print_row(r, args.slo_ms)
+    finally:
+        if proc is not None:
+            proc.terminate()
+            try:
+                proc.wait(10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+    degraded = [r["games"] for r in results["stages"] if r["host_p95_ms"] > args.slo_ms]
+    results["first_degraded_games"] = degraded[0] if degraded else None
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"first stage over {args.slo_ms:.0f} ms host p95: {degraded[0] if degraded else 'none'} (results in {args.out})",
+          file=sys.stderr)
+    return 1 if any(r["errors"] for r in results["stages"]) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,507 +1,672 @@
 import streamlit as st
-from typing import List, Dict, Optional, Tuple, Any
-import json
+from typing import List, Optional, Sequence, Tuple
 import os
-import base64
+import re
+import secrets
 import time
+from urllib.parse import quote
+
+from feud import archive, buzzpad, game, hotkeys, matcher, prefetch, search, session, styles
+from feud.assets import asset_url, preload
+from feud.bank import QuestionBank, Question, Round, get_bank, pinned_bank, watch_banks
+from feud.live import Snapshot
+from feud.rooms import DEFAULT_BANK, ROOMS, Room, bank_choices, bank_rejected
+from feud.validate import ERROR
+from feud.metrics import ensure_started as start_metrics, span, timed
+from feud.render import answer_cards_html, breakdown_html, buzzers_html, ranking_cards_html, scoreboard_html
 
 st.set_page_config(page_title="Fedora Feud", page_icon="❓", layout="wide")
 
-# --------- Styles (Glass look) ---------
-CUSTOM_CSS = """
-<style>
-  @import url('https://fonts.googleapis.com/css2?family=Poppins:wght@300;400;600;800&display=swap');
-
-  /* Force dark UI even if OS/browser is light */
-  :root { color-scheme: dark !important; }
-  html, body, [data-testid="stAppViewContainer"], [data-testid="stApp"], [data-testid="stAppViewContainer"] > .main {
-    background: rgb(1 24 51) !important;
-    color-scheme: dark !important;
-    color: rgba(255,255,255,0.92) !important;
-  }
-  [data-baseweb="popover"], [data-baseweb="menu"] { color-scheme: dark !important; }
-
-  .stMainBlockContainer { padding-top: 0 }
-  h3 { font-size: 3.75rem !important; }
-
-  .ff-card {
-    backdrop-filter: blur(10px);
-    background: rgba(255,255,255,0.06);
-    border: 1px solid rgba(255,255,255,0.08);
-    border-radius: 18px;
-    box-shadow: 0 10px 30px rgba(0,0,0,.35);
-    padding: 1rem 1.2rem;
-  }
-  .ff-success {
-    background: linear-gradient(180deg, rgb(247 182 18), rgb(255 174 10 / 54%));
-    border-color: rgb(255 192 0 / 35%);
-  }
-  .ff-title { font-weight: 800; letter-spacing: .5px; }
-  .ff-center { text-align:center; }
-  .ff-big { font-size: 2rem; font-weight: 800; }
-  .ff-num { font-size: 1.8rem; font-weight: 800; opacity:.95 }
-
-  .stButton>button {
-    border-radius: 9px !important;
-    padding: .24rem .4rem;
-    font-weight: 700;
-    font-size: .8rem;
-    border: 1px solid white;
-    background: transparent;
-    color: #fff;
-    box-shadow: 0 5px 12px rgba(79,70,229,.26);
-    transition: transform .06s ease, filter .2s ease;
-    min-width: 30px;
-  }
-  .stButton>button:hover { filter: brightness(1.07) }
-  .stButton>button:active { transform: translateY(1px) }
-
-  .ff-toolbar { display:flex; gap:10px; align-items:center; white-space:nowrap; overflow-x:auto; padding:.25rem .25rem; }
-  .ff-pill { display:inline-flex; align-items:center; gap:8px; backdrop-filter:blur(6px); background: rgba(255,255,255,0.08); border:1px solid rgba(255,255,255,0.15); border-radius:999px; padding:6px 10px; }
-  .ff-pill .lbl { font-weight:700 }
-  .ff-pill .val { font-weight:800 }
-
-  #MainMenu, header, footer {visibility: hidden;}
-
-  /* --- Strike overlay --- */
-  .ff-strike {
-    position: fixed; inset: 0;
-    display: flex; align-items: center; justify-content: center;
-    z-index: 10000;
-    pointer-events: none;
-  }
-  .ff-strike::before{
-    content:"";
-    position: absolute; inset: 0;
-    background: radial-gradient(circle at 50% 50%, rgba(255,70,70,.18), rgba(0,0,0,0) 60%);
-    animation: strikeFlash .6s ease-out;
-  }
-  .ff-x {
-    font-size: clamp(6rem, 22vw, 28rem);
-    font-weight: 900;
-    line-height: 1;
-    color: rgba(255,70,70,0.95);
-    text-shadow: 0 8px 24px rgba(0,0,0,.35), 0 0 30px rgba(255,70,70,.35);
-    transform: rotate(-8deg);
-    animation: strikePop .6s cubic-bezier(.2,.8,.2,1);
-  }
-  @keyframes strikePop {
-    0% { transform: scale(.6) rotate(-8deg); opacity: 0; }
-    60% { transform: scale(1.1) rotate(-8deg); opacity: 1; }
-    100% { transform: scale(1) rotate(-8deg); opacity: 1; }
-  }
-  @keyframes strikeFlash {
-    0% { opacity: .0; }
-    30% { opacity: .6; }
-    100% { opacity: .0; }
-  }
-
-  /* Compact selectbox styling */
-  [data-baseweb="select"] > div {
-    background: rgba(255,255,255,0.05) !important;
-    border-color: rgba(255,255,255,0.25) !important;
-    color: white !important;
-    font-weight: 600 !important;
-  }
-</style>
-"""
-st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
+# --------- Styles (Glass look): feud/styles.css, sent once per session ---------
+styles.inject()
+
+# Opt-in timing spans (FEUD_METRICS=1), exported in Prometheus format
+start_metrics()
+watch_banks()  # edits to the bank files are picked up in the background
 
 # ---------------------------
-# Data loading (with rounds)
+# Question bank (compiled once per process, shared by all sessions)
 # ---------------------------
-Question = Dict[str, Any]
-Round = Dict[str, Any]
-
-DEFAULT_QUESTIONS: List[Question] = [
-    {
-        "prompt": "Name something people double-check before leaving home",
-        "answers": [
-            {"text": "Keys", "points": 32},
-            {"text": "Phone", "points": 27},
-            {"text": "Wallet", "points": 18},
-            {"text": "Lights off", "points": 9},
-            {"text": "Door locked", "points": 8},
-            {"text": "Stove/Gas", "points": 6},
-        ],
-    }
-]
-
-def _clean_questions(raw_questions: Any, max_answers: int = 15) -> List[Question]:
-    if not isinstance(raw_questions, list):
-        return []
-    cleaned: List[Question] = []
-    for q in raw_questions:
-        if not isinstance(q, dict):
-            continue
-        prompt = q.get("prompt")
-        answers = q.get("answers", [])
-        if isinstance(prompt, str) and isinstance(answers, list) and 1 <= len(answers) <= max_answers:
-            cleaned.append({
-                "prompt": prompt,
-                "answers": [{"text": str(a.get("text", "")), "points": int(a.get("points", 0))} for a in answers if isinstance(a, dict)],
-            })
-    return cleaned
-
-def load_rounds_from_file(path: str) -> List[Round]:
-    # Supports:
-    #  - New format: {"rounds":[{"title":"Round 1","questions":[...]}]}
-    #  - Old format: [ {prompt, answers}, ... ]  -> becomes one round "Round 1"
-    if not os.path.exists(path):
-        return [{"title": "Round 1", "questions": DEFAULT_QUESTIONS}]
-
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        if isinstance(data, dict) and isinstance(data.get("rounds"), list):
-            rounds: List[Round] = []
-            for r in data["rounds"]:
-                if not isinstance(r, dict):
-                    continue
-                title = r.get("title", "Round")
-                questions = _clean_questions(r.get("questions", []))
-                if isinstance(title, str) and questions:
-                    rounds.append({
-                        "title": title,
-                        "questions": questions,
-                        "tiebreaker": bool(r.get("tiebreaker", False)),
-                    })
-            return rounds or [{"title": "Round 1", "questions": DEFAULT_QUESTIONS}]
-
-        if isinstance(data, list):
-            questions = _clean_questions(data)
-            return [{"title": "Round 1", "questions": questions or DEFAULT_QUESTIONS}]
-
-        return [{"title": "Round 1", "questions": DEFAULT_QUESTIONS}]
-    except Exception:
-        return [{"title": "Round 1", "questions": DEFAULT_QUESTIONS}]
-
-ROUNDS: List[Round] = load_rounds_from_file("files/questions.json")
-
-HAS_LOGO = os.path.exists("fedora_feud.png")
+QUESTIONS_PATH = DEFAULT_BANK  # $FEUD_QUESTIONS; rooms can pick other banks next to it
+# Shows the session's key count / approximate size in the sidebar (leak hunting)
+SESSION_REPORT = os.environ.get("FEUD_SESSION_REPORT", "").strip().lower() in ("1", "true", "yes", "on")
+with span("bank"):
+    BANK: QuestionBank = get_bank(QUESTIONS_PATH)
+
+# Images are hashed once per process and served from /app/static
+LOGO_ASSET = "fedora_feud.png"
+LOADING_ASSET = "load.gif"
+with span("assets"):
+    preload(LOGO_ASSET, LOADING_ASSET)
 
 # ---------------------------------
-# Game state
+# Game state lives in the room this session hosts (feud/rooms.py): transitions
+# from feud/game.py, applied under the room lock and journaled as events.
+# The session itself only keeps its room id, host key and widget values.
 # ---------------------------------
-defaults = {
-    "started": False,
-    "finished": False,
-    "team_names": [],  # frozen team labels for the whole game
-
-    # rounds
-    "screen": "home",        # home | round_intro | question | results_wait| final
-    "round_index": 0,
-    "q_in_round": 0,
-
-    # teams
-    "num_teams": 2,
-    "team_scores": [],
-
-    # per-question maps (keyed by (round_index, q_in_round))
-    "revealed_map": {},
-    "assigned_map": {},
-
-    # strike overlay
-    "show_strike": False,
-    "strike_nonce": 0,
-    "strike_hide_at": 0.0,
-    "tiebreaker_used": False,
-    "team_label_mode": "Letters",  # "Letters" | "Numbers"
-
-}
-for k, v in defaults.items():
-    if k not in st.session_state:
-        st.session_state[k] = v
+clamp = game.clamp
+
+def current_room() -> Room:
+    # Looked up on every use: an evicted room comes back from its journal. A key the
+    # room does not take gets a new room, which the session keeps from then on
+    room = ROOMS.open(st.session_state.get("room_id"), st.session_state.get("host_key"))
+    st.session_state.room_id, st.session_state.host_key = room.room_id, room.host_key
+    return room
+
+def room_state():
+    return current_room().state
 
 # ---------------------------
 # Helpers
 # ---------------------------
 def team_labels(n: int) -> List[str]:
     # If the game already started, use the frozen names
-    names = st.session_state.get("team_names", [])
+    names = room_state().team_names
     if isinstance(names, list) and len(names) == n and all(isinstance(x, str) for x in names):
         return names
 
     # Otherwise (home / before start), compute preview labels
     mode = str(st.session_state.get("team_label_mode", "letters")).strip().lower()
-    if mode.startswith("num"):
-        return [str(i + 1) for i in range(n)]
-    return [chr(ord("A") + i) for i in range(min(n, 26))]
+    return game.positional_labels(n, numbers=mode.startswith("num"))
 
-def clamp(n, mn, mx): return max(mn, min(n, mx))
+# Team names typed on the home screen replace the labels of their teams for the
+# whole game (and give them their own rows in the leaderboard). Only letters,
+# digits, spaces and a little punctuation: labels end up in HTML, markdown and URLs.
+TEAM_NAME_DROP = re.compile(r"[^\w .'!?-]|_")
+MAX_TEAM_NAME = 24
+
+def typed_team_names(n: int) -> List[str]:
+    typed = [TEAM_NAME_DROP.sub("", t).strip()[:MAX_TEAM_NAME]
+             for t in str(st.session_state.get("team_names_input", "")).split(",")]
+    return [typed[i] if i < len(typed) and typed[i] else lab for i, lab in enumerate(team_labels(n))]
+
+def team_names_clash(names: Sequence[str]) -> bool:
+    # Pickers map labels back to teams, next to a "Show" option
+    folded = [x.casefold() for x in names]
+    return len(set(folded)) < len(folded) or "show" in folded
+
+def game_bank() -> QuestionBank:
+    return current_room().game_bank()
 
 def current_round() -> Round:
-    return ROUNDS[st.session_state.round_index]
+    return game.current_round(room_state(), game_bank())
 
-def round_questions() -> List[Question]:
-    return current_round().get("questions", [])
+def round_questions() -> Sequence[Question]:
+    return game.round_questions(room_state(), game_bank())
 
 def current_question() -> Question:
-    return round_questions()[st.session_state.q_in_round]
-
-QKey = Tuple[int, int]
-
-def is_tiebreaker_round(idx: int) -> bool:
-    return bool(ROUNDS[idx].get("tiebreaker", False))
-
-def last_normal_round_index() -> int:
-    normal_idxs = [i for i in range(len(ROUNDS)) if not is_tiebreaker_round(i)]
-    return normal_idxs[-1] if normal_idxs else 0
-
-def next_normal_round_index(cur: int) -> Optional[int]:
-    for i in range(cur + 1, len(ROUNDS)):
-        if not is_tiebreaker_round(i):
-            return i
-    return None
-
-def top_is_tied() -> bool:
-    scores = st.session_state.team_scores
-    if not scores:
-        return False
-    best = max(scores)
-    return sum(1 for s in scores if s == best) >= 2
-
-def find_tiebreaker_round_index() -> Optional[int]:
-    for idx, r in enumerate(ROUNDS):
-        if bool(r.get("tiebreaker", False)):
-            return idx
-    return None
-
-def ensure_state_for_current_question() -> QKey:
-    rid: QKey = (st.session_state.round_index, st.session_state.q_in_round)
-    q = current_question()
-    n_answers = clamp(len(q.get("answers", [])), 1, 15)
+    return game.current_question(room_state(), game_bank())
 
-    if rid not in st.session_state.revealed_map:
-        st.session_state.revealed_map[rid] = [False] * n_answers
-    else:
-        cur = st.session_state.revealed_map[rid]
-        if len(cur) != n_answers:
-            st.session_state.revealed_map[rid] = (cur + [False] * n_answers)[:n_answers]
+def current_ordinal() -> int:
+    return game.current_ordinal(room_state(), game_bank())
 
-    if rid not in st.session_state.assigned_map:
-        st.session_state.assigned_map[rid] = [None] * n_answers
-    else:
-        cur2 = st.session_state.assigned_map[rid]
-        if len(cur2) != n_answers:
-            st.session_state.assigned_map[rid] = (cur2 + [None] * n_answers)[:n_answers]
+def record(event: game.Event):
+    # Apply to the room and append to its journal (for crash/refresh recovery)
+    with span(f"callback.{event[0]}"):
+        current_room().apply(event, time.time())
+
+def picked_bank() -> QuestionBank:
+    path = st.session_state.get("bank_select")
+    return get_bank(path if path in bank_choices() else QUESTIONS_PATH)
 
-    return rid
+def rounds_key(bank: QuestionBank) -> str:
+    # One picker per bank: round indices mean nothing in another file
+    return f"rounds_select:{bank.path}"
 
 def start_game(num_teams: int):
-    st.session_state.num_teams = clamp(int(num_teams), 1, 15)
-    
-    st.session_state.team_names = team_labels(st.session_state.num_teams)
-    st.session_state.team_scores = [0] * st.session_state.num_teams
+    n = clamp(int(num_teams), 1, 15)
+    bank = picked_bank()
+    names = typed_team_names(n)
+    if bank_rejected(bank) or team_names_clash(names):
+        return
+    meta = {"bank": bank.path, "digest": bank.digest}
+    # Only the picked rounds get decoded from the library; all of them when none are picked
+    picked = sorted(st.session_state.get(rounds_key(bank)) or [])
+    if picked and len(picked) < bank.round_count():
+        meta["rounds"] = picked
+    if st.session_state.get("buzzer_mode") and buzzpad.ensure_started():
+        meta["buzzers"] = True
+    record(["start_game", n, names, meta])
+    search.warm(bank)
 
-    st.session_state.round_index = 0
-    st.session_state.q_in_round = 0
-    st.session_state.revealed_map = {}
-    st.session_state.assigned_map = {}
+def go_prev():
+    record(["go_prev"])
 
-    st.session_state.finished = False
-    st.session_state.started = True
-    st.session_state.screen = "round_intro"
-    st.session_state.tiebreaker_used = False
+def go_next():
+    record(["go_next"])
 
-def go_prev():
-    if st.session_state.screen == "question":
-        if st.session_state.q_in_round > 0:
-            st.session_state.q_in_round -= 1
-            return
-        st.session_state.screen = "round_intro"
-        return
+def go_home():
+    record(["go_home"])
 
-    if st.session_state.screen == "round_intro":
-        if st.session_state.round_index > 0:
-            st.session_state.round_index -= 1
-            st.session_state.q_in_round = max(0, len(round_questions()) - 1)
-            st.session_state.screen = "question"
-            return
+def show_final():
+    record(["show_final"])
 
-def go_next():
-    if st.session_state.screen == "round_intro":
-        st.session_state.screen = "question"
-        return
+def assign_team(ans_idx: int, team_idx: Optional[int]):
+    record(["assign_team", ans_idx, team_idx])
 
-    if st.session_state.screen != "question":
-        return
+def reveal_only(ans_idx: int):
+    record(["reveal_only", ans_idx])
 
-    if st.session_state.q_in_round < len(round_questions()) - 1:
-        st.session_state.q_in_round += 1
+def trigger_strike():
+    record(["strike"])
+
+def swap_question(source: int):
+    # The answer rows start over with the new question
+    gs = room_state()
+    session.drop_rows(st.session_state, gs.round_index, gs.q_in_round)
+    st.session_state.pop("guess_result", None)
+    st.session_state.swap_query = ""
+    record(["swap_question", source])
+
+def pick_answer(ans_idx: int, team_idx: Optional[int]):
+    # Reveal (or give to a team) from the console's shortcuts, keeping the answer
+    # row's selectbox in step with the board
+    gs = room_state()
+    o = current_ordinal()
+    labels = team_labels(gs.num_teams)
+    row = session.row_key(gs.round_index, gs.q_in_round, ans_idx)
+    if team_idx is None:
+        if not gs.board.is_revealed(o, ans_idx):
+            reveal_only(ans_idx)
+            st.session_state[row] = "Show"
+    elif team_idx < len(labels):
+        assign_team(ans_idx, team_idx)
+        st.session_state[row] = labels[team_idx]
+
+def pick_guess(ans_idx: int, team_idx: Optional[int]):
+    # One of the candidates listed for an ambiguous guess
+    st.session_state.pop("guess_result", None)
+    pick_answer(ans_idx, team_idx)
+
+def on_guess():
+    # The host typed what a player said: reveal a confident match, strike a miss,
+    # and list the candidates when several answers fit
+    text = st.session_state.get("guess_text", "").strip()
+    st.session_state.guess_text = ""
+    gs = room_state()
+    if not text or not gs.started or gs.screen != "question":
+        return
+    q = current_question()
+    o = current_ordinal()
+    labels = team_labels(gs.num_teams)
+    pick = st.session_state.get("guess_team")
+    team = labels.index(pick) if pick in labels else None
+    guess = matcher.index_for(q).match(text)
+    if guess.verdict == matcher.MATCH:
+        i = guess.answer
+        already = gs.board.is_revealed(o, i) and (team is None or gs.board.assigned(o, i) == team)
+        pick_answer(i, team)
+        note = f"“{text}” is already on the board: {q.answers[i].text}" if already else f"“{text}” → {q.answers[i].text}"
+    elif guess.verdict == matcher.MISS:
+        trigger_strike()
+        note = f"“{text}” is not on the board"
+    else:
+        note = f"“{text}” could be:"
+    st.session_state.guess_result = (o, guess.verdict, note, [i for i, _ in guess.ranked[:4]])
+
+def on_hotkey():
+    # One key press from the keyboard controller (feud/hotkeys.py)
+    press = hotkeys.parse(st.session_state.get(hotkeys.KEY))
+    gs = room_state()
+    if press is None or not gs.started:
+        return
+    kind, args = press
+    if kind == "next":
+        show_final() if gs.screen == "results_wait" else go_next()
+    elif kind == "prev":
+        go_prev()
+    elif gs.screen != "question":
         return
+    elif kind == "strike":
+        trigger_strike()
+    elif args[0] < len(current_question().answers):
+        pick_answer(args[0], args[1] if kind == "assign" else None)
 
-    # end of round (NORMAL progression skips tiebreaker)
-    cur = st.session_state.round_index
-    last_normal = last_normal_round_index()
-
-    # If we finished the last NORMAL round, decide tie -> tiebreaker or results
-    if cur == last_normal:
-        tb_idx = find_tiebreaker_round_index()
-        if tb_idx is not None and top_is_tied():
-            st.session_state.round_index = tb_idx
-            st.session_state.q_in_round = 0
-            st.session_state.screen = "round_intro"
-            return
+# ---------------------------
+# HTML building blocks (shared by the host console and audience displays;
+# answer cards, score pills and standings are memoized in feud/render.py)
+# ---------------------------
+def round_title_html(title: str) -> str:
+    return f"""
+            <div class="ff-center" style="margin-top:2.5rem; margin-bottom:1.5rem;">
+                <h1 class="ff-title" style="font-size:4.2rem; margin:0;">
+                    🎯 {title}
+                </h1>
+            </div>
+            """
 
-        st.session_state.finished = True
-        st.session_state.screen = "results_wait"
+def render_standings(labels: Sequence[str], scores: Sequence[int], order: Sequence[int],
+                     round_scores: Sequence[Tuple[int, Sequence[int]]], bank: QuestionBank) -> None:
+    # Ranking cards, then points per round once more than one round has scored
+    for card in ranking_cards_html(labels, scores, order):
+        st.markdown(card, unsafe_allow_html=True)
+    if len(round_scores) > 1:
+        titles = [
+            (bank.round(ri).title if ri < bank.round_count() else "") or f"Round {ri + 1}"
+            for ri, _ in round_scores
+        ]
+        st.markdown(breakdown_html(labels, order, titles, [sub for _, sub in round_scores], scores),
+                    unsafe_allow_html=True)
+
+def render_game_standings(labels: Sequence[str]) -> None:
+    ledger = room_state().ledger
+    round_scores = [(ri, ledger.round_totals(ri)) for ri in ledger.rounds()]
+    render_standings(labels, ledger.totals(), ledger.ranking(), round_scores, game_bank())
+
+def strike_overlay_html(nonce: int, n: int) -> str:
+    return (
+        f"<div class='ff-strike{' multi' if n > 1 else ''}' id='strike-{nonce}'>"
+        + "<div class='ff-x'>✕</div>" * n + "</div>"
+    )
+
+FINAL_TITLE_HTML = "<h1 class='ff-title' style='font-size:4rem; margin-bottom:1rem;'>🏁 Final Standings</h1>"
+RESULTS_WAIT_HTML = """
+            <div class="ff-center" style="padding:2.8rem 0 1.2rem 0;">
+              <h1 class="ff-title" style="font-size:3.8rem; margin-bottom:.6rem;">
+                Calculating results…
+              </h1>
+              <div style="opacity:.85; font-size:1.1rem;">
+                Please wait a moment
+              </div>
+            </div>
+            """
+
+def render_logo() -> None:
+    logo_url = asset_url(LOGO_ASSET)
+    if logo_url:
+        st.markdown(
+            f"<div style='display:flex;justify-content:center;'><img src='{logo_url}' style='width:80%;height:auto;'></div>",
+            unsafe_allow_html=True
+        )
+
+def render_loading_gif() -> None:
+    loading_url = asset_url(LOADING_ASSET)
+    if loading_url:
+        st.markdown(
+            f"""
+            <div class="ff-center">
+            <img src="{loading_url}"
+                style="max-width:240px; width:100%; opacity:.95;" />
+            </div>
+            """,
+            unsafe_allow_html=True,
+        )
+
+# ---------------------------
+# Live channel: the host publishes a snapshot after every change and any
+# number of audience displays (?room=<id>&view=audience) follow it.
+# ---------------------------
+AUDIENCE_POLL_SECONDS = 1.0
+VIEW = st.query_params.get("view", "host")
+
+def state_snapshot(room: Room) -> Snapshot:
+    # Only from the room passed in: looking it up again (current_room) under its
+    # lock could wait on the registry while an eviction holds that and waits on us
+    ss = room.state
+    return {
+        "screen": ss.screen if (ss.started or ss.finished) else "home",
+        "round_index": ss.round_index,
+        "q_in_round": ss.q_in_round,
+        "bank": ss.bank_path,
+        "digest": ss.bank_digest,
+        "rounds": tuple(ss.round_selection or ()),
+        "team_names": tuple(ss.team_names),
+        "team_scores": ss.ledger.totals(),
+        "ranking": ss.ledger.ranking(),
+        "round_scores": tuple((ri, ss.ledger.round_totals(ri)) for ri in ss.ledger.rounds()),
+        "revealed": ss.board.revealed_mask(game.current_ordinal(ss, room.game_bank())) if ss.screen == "question" else 0,
+        "swaps": tuple(sorted(ss.swaps.items())),
+        "strike_nonce": ss.strike_nonce,
+        "strike_shown": ss.strike_shown,
+        "strike_hide_at": ss.strike_hide_at,
+    }
+
+def publish_state() -> None:
+    room = current_room()
+    with room.lock:
+        room.channel.publish(state_snapshot(room))
+
+def audience_channel(room_id: str):
+    room = ROOMS.get(room_id)
+    return room.channel if room is not None else None
+
+@st.fragment(run_every=AUDIENCE_POLL_SECONDS)
+def follow_channel(room_id: str) -> None:
+    # Cheap tick: a full redraw only happens when the host published a new version
+    channel = audience_channel(room_id)
+    version = channel.version if channel is not None else 0
+    if version != st.session_state.get("seen_version", 0):
+        st.rerun()
+
+def render_audience(room_id: str) -> None:
+    channel = audience_channel(room_id)
+    version, snap = channel.latest() if channel is not None else (0, None)
+    st.session_state.seen_version = version
+    follow_channel(room_id)
+
+    screen = snap["screen"] if snap else "home"
+    bank = pinned_bank(snap["bank"] or QUESTIONS_PATH, snap["digest"]).subset(snap["rounds"]) if snap else BANK
+    if screen == "question":
+        try:
+            aq = game.slot_question(bank, dict(snap["swaps"]), snap["round_index"], snap["q_in_round"])
+        except IndexError:
+            screen = "home"
+
+    if screen == "home":
+        c1, c2, c3 = st.columns([1, 2, 1])
+        with c2:
+            render_logo()
+            st.markdown("<div class='ff-center ff-big'>Waiting for the host…</div>", unsafe_allow_html=True)
         return
 
-    # Otherwise, go to the next NORMAL round (skip any tiebreaker rounds)
-    nxt = next_normal_round_index(cur)
-    if nxt is not None:
-        st.session_state.round_index = nxt
-        st.session_state.q_in_round = 0
-        st.session_state.screen = "round_intro"
+    labels, scores = list(snap["team_names"]), list(snap["team_scores"])
+    if screen in ("round_intro", "final"):
+        c1, c2, c3 = st.columns([1, 2, 1])
+        with c2:
+            if screen == "final":
+                st.markdown(f"<div class='ff-center' style='padding:2.0rem 0'>{FINAL_TITLE_HTML}</div>", unsafe_allow_html=True)
+                st.balloons()
+            else:
+                ri = snap["round_index"]
+                title = bank.round(ri).title if ri < bank.round_count() else f"Round {ri + 1}"
+                st.markdown(round_title_html(title), unsafe_allow_html=True)
+            if screen == "final" or snap["round_index"] > 0:
+                render_standings(labels, scores, snap["ranking"], snap["round_scores"], bank)
         return
 
-    # Fallback (shouldn't happen)
-    st.session_state.finished = True
-    st.session_state.screen = "results_wait"
+    if screen == "results_wait":
+        c1, c2, c3 = st.columns([1, 2, 1])
+        with c2:
+            st.markdown(RESULTS_WAIT_HTML, unsafe_allow_html=True)
+            render_loading_gif()
+        return
 
-def go_home():
-    for k, v in defaults.items():
-        st.session_state[k] = v
+    st.markdown(f"### ❓ {aq.prompt}")
+    st.divider()
+    for card in answer_cards_html(aq, snap["revealed"]):
+        st.markdown(card, unsafe_allow_html=True)
+    st.divider()
+    st.markdown(scoreboard_html(labels, scores), unsafe_allow_html=True)
+    if time.time() < snap["strike_hide_at"]:
+        st.markdown(strike_overlay_html(snap["strike_nonce"], snap["strike_shown"]), unsafe_allow_html=True)
 
-def assign_team(ans_idx: int, team_idx: Optional[int]):
-    rid = ensure_state_for_current_question()
-    q = current_question()
-    pts = int(q["answers"][ans_idx]["points"])
-    prev = st.session_state.assigned_map[rid][ans_idx]
+# ---------------------------
+# Leaderboard (?view=leaderboard): every finished game, from the results archive
+# ---------------------------
+LEADERBOARD_PERIODS = {"All time": None, "Last 30 days": 30, "Last 7 days": 7, "Today": 1}
+
+def render_leaderboard() -> None:
+    c1, c2, c3 = st.columns([1, 4, 1])
+    with c2:
+        render_logo()
+        if not archive.ARCHIVE.enabled:
+            st.info("The results archive is off on this server (`FEUD_ARCHIVE`).")
+            return
+        period = st.selectbox("Period", options=list(LEADERBOARD_PERIODS), key="leaderboard_period")
+        days = LEADERBOARD_PERIODS[period]
+        since = time.time() - days * 86400 if days else 0.0
+
+        st.subheader("🏆 Teams")
+        st.caption("Teams named on the start screen, across all their games. Unnamed teams (A, B… / 1, 2…) "
+                   "are only positions, so they count in their own games but not here.")
+        teams_board = archive.ARCHIVE.team_leaderboard(since)
+        if teams_board:
+            st.dataframe(teams_board, hide_index=True, use_container_width=True)
+        else:
+            st.info("No named team finished a game in this period yet.")
+        st.subheader("❓ Questions")
+        st.caption("How often each question was played and how much of its board the teams found.")
+        st.dataframe(archive.ARCHIVE.question_stats(since), hide_index=True, use_container_width=True)
+        st.subheader("🕘 Recent games")
+        recent = archive.ARCHIVE.recent_games()
+        for g in recent:
+            g["finished_at"] = time.strftime("%Y-%m-%d %H:%M", time.localtime(g["finished_at"]))
+        st.dataframe(recent, hide_index=True, use_container_width=True)
+        st.caption(f"{archive.ARCHIVE.game_count()} game(s) archived. "
+                   "Export them with `python tools/export_results.py <table> --format csv|json|jsonl`.")
 
-    if prev is not None:
-        st.session_state.team_scores[prev] = max(0, st.session_state.team_scores[prev] - pts)
+# ---------------------------
+# Player buzzers (?room=<id>&view=buzzer&pad=<key>[&team=<label>]): one phone per player.
+# The phone's pad presses and follows the round over feud/buzzpad.py's handler,
+# so its session only reruns for a new game; feud/buzzer.py judges the presses
+# and the host board shows the result. The links carry the room's pad key, not its host key.
+# ---------------------------
+HOST_BUZZER_POLL_SECONDS = 0.5  # host board: new presses
 
-    st.session_state.assigned_map[rid][ans_idx] = team_idx
-    if team_idx is not None:
-        st.session_state.team_scores[team_idx] += pts
+def buzzer_links(room: Room, labels: Sequence[str]) -> str:
+    return " · ".join(f"[Team {lab}](?room={room.room_id}&view=buzzer&pad={room.pad_key}&team={quote(lab)})"
+                      for lab in labels)
 
-    st.session_state.revealed_map[rid][ans_idx] = True
+def buzzer_player() -> str:
+    # The phone's player id: only this page and its pad know it, and presses count for joined ids only
+    if "buzzer_player" not in st.session_state:
+        st.session_state.buzzer_player = secrets.token_urlsafe(16)
+    return st.session_state.buzzer_player
 
-def reveal_only(ans_idx: int):
-    rid = ensure_state_for_current_question()
-    q = current_question()
-    pts = int(q["answers"][ans_idx]["points"])
+def buzzing(room) -> bool:
+    return room is not None and room.state.started and room.state.buzzers
+
+def render_buzzer(room_id: str) -> None:
+    room = ROOMS.get(room_id)
+    if not buzzpad.ensure_started():
+        st.error("Player buzzers are off on this server (`FEUD_BUZZER_PORT`).")
+        return
+    pad = st.query_params.get("pad", "")
+    if room is not None and not room.is_pad(pad):
+        st.error("This buzzer link is not valid for this room. Ask the host for the team links.")
+        return
+    buzzpad.allow_origin(st.context.url)
+    game_no = room.buzzer.game if room is not None else -1
+    if not buzzing(room):
+        render_logo()
+        st.markdown("<div class='ff-center ff-big'>Waiting for the host…</div>", unsafe_allow_html=True)
+        buzzpad.buzzpad(room_id, pad, -1, buzzer_player(), game_no)  # reruns this page when the game starts
+        return
+    labels = list(room.state.team_names)
+    picked = st.query_params.get("team")
+    if picked not in labels:
+        if st.session_state.get("buzzer_team") not in labels:
+            st.session_state.buzzer_team = labels[0]
+        picked = st.selectbox("Your team", options=labels, key="buzzer_team")
+    team = labels.index(picked)
+    st.markdown(f"<div class='ff-center ff-big'>Team {picked}</div>", unsafe_allow_html=True)
+    name = st.text_input("Your name", key="buzzer_name", max_chars=24).strip() or f"Player {buzzer_player()[:4]}"
+    room.buzzer.join(team, buzzer_player(), name)
+    buzzpad.buzzpad(room_id, pad, team, buzzer_player(), game_no)
+
+@st.fragment(run_every=HOST_BUZZER_POLL_SECONDS)
+def buzzer_board(room_id: str) -> None:
+    # Host: teams in buzz order, pushed to the board within one poll
+    room = ROOMS.get(room_id)
+    if room is None:
+        return
+    labels = team_labels(room.state.num_teams)
+    result = room.buzzer.result
+    lead = result.firsts[0].at_ns if result.firsts else 0
+    strip_col, reset_col = st.columns([11, 1])
+    with strip_col:
+        if result.firsts:
+            firsts = [(p.team, p.name, (p.at_ns - lead) / 1e6) for p in result.firsts if p.team < len(labels)]
+            st.markdown(buzzers_html(labels, firsts), unsafe_allow_html=True)
+        else:
+            joined = room.buzzer.team_players(len(labels))
+            st.caption(f"🔔 Waiting for a buzz · {sum(joined)} player(s) joined: "
+                       + ", ".join(f"{lab} {n}" for lab, n in zip(labels, joined))
+                       + f" · {buzzer_links(room, labels)}")
+    with reset_col:
+        st.button("🔁", key="buzzer_reset", on_click=room.buzzer.reset, help="Reset the buzzers for this question")
+
+# ?game=<id> is the pre-rooms spelling of ?room=<id>
+ROOM_PARAM = st.query_params.get("room") or st.query_params.get("game")
+
+if VIEW == "audience":
+    with span("screen.audience"):
+        render_audience(ROOM_PARAM or "")
+    st.stop()
 
-    prev_team = st.session_state.assigned_map[rid][ans_idx]
-    if prev_team is not None:
-        st.session_state.team_scores[prev_team] = max(0, st.session_state.team_scores[prev_team] - pts)
-        st.session_state.assigned_map[rid][ans_idx] = None
+if VIEW == "buzzer":
+    with span("screen.buzzer"):
+        render_buzzer(ROOM_PARAM or "")
+    st.stop()
 
-    st.session_state.revealed_map[rid][ans_idx] = True
+if VIEW == "leaderboard":
+    with span("screen.leaderboard"):
+        render_leaderboard()
+    st.stop()
 
-def trigger_strike():
-    st.session_state.show_strike = True
-    st.session_state.strike_nonce = st.session_state.get("strike_nonce", 0) + 1
-    st.session_state.strike_hide_at = time.time() + 2.0  # seconds
+# Host: the room named in the URL if the URL has its host key, or a new one; kept
+# across "Play again". After a browser refresh, an eviction or a pod restart the URL
+# still carries ?room=<id>&key=<key> and the room is rebuilt from its journal
+# (snapshot + later events). The audience and buzzer links carry the id only.
+if "room_id" not in st.session_state:
+    st.session_state.room_id = ROOM_PARAM
+    st.session_state.host_key = st.query_params.get("key")
+ROOM = current_room()
+if ROOM_PARAM != ROOM.room_id or st.query_params.get("key") != ROOM.host_key or "game" in st.query_params:
+    st.query_params.pop("game", None)
+    st.query_params["room"] = ROOM.room_id
+    st.query_params["key"] = ROOM.host_key
+if not st.session_state.get("journal_checked"):
+    st.session_state.journal_checked = True
+    if ROOM.restored and ROOM.state.started:
+        st.toast("♻️ Game restored")
+publish_state()
+
+# Everything below reads the room's state; the session keeps widget values
+GS = ROOM.state
+
+# Answer-row widget keys only live while their question is on screen
+session.collect(st.session_state, (GS.round_index, GS.q_in_round) if GS.started and GS.screen == "question" else None)
+if SESSION_REPORT:
+    mem = session.report(st.session_state.to_dict())
+    st.sidebar.caption(f"🧮 Session: {mem['keys']} keys, ~{mem['bytes'] / 1024:.1f} KB")
+
+# Keyboard controller: drawn first on every host screen so it mounts once per page
+on_question = GS.started and GS.screen == "question"
+# A buzzer round per question shown; closed on every other screen
+ROOM.buzzer.arm(("question", current_ordinal()) if on_question and GS.buzzers else None)
+hotkeys.hotkeys(
+    screen=GS.screen if GS.started or GS.finished else "home",
+    question=current_ordinal() if on_question else None,
+    answers=len(current_question().answers) if on_question else 0,
+    teams=team_labels(GS.num_teams) if GS.started else [],
+    on_key=on_hotkey,
+)
 
 # ---------------------------
 # Home (team count)
 # ---------------------------
-if not st.session_state.started and not st.session_state.finished:
-    c1, c2, c3 = st.columns([1,2,1])
-    with c2:
-        if HAS_LOGO:
-            with open("fedora_feud.png","rb") as fh:
-                b64 = base64.b64encode(fh.read()).decode()
-            st.markdown(
-                f"<div style='display:flex;justify-content:center;'><img src='data:image/png;base64,{b64}' style='width:80%;height:auto;'></div>",
-                unsafe_allow_html=True
+if not GS.started and not GS.finished:
+    with span("screen.home"):
+        c1, c2, c3 = st.columns([1,2,1])
+        with c2:
+            render_logo()
+
+            teams = st.selectbox(
+                "Choose the number of teams and press Start.",
+                options=list(range(1, 16)),
+                index=1,
+                help="From 1 to 15",
+                key="teams_select"
             )
-
-        teams = st.selectbox(
-            "Choose the number of teams and press Start.",
-            options=list(range(1, 16)),
-            index=1,
-            help="From 1 to 15",
-            key="teams_select"
-        )
-        st.write("")
-        label_mode = st.selectbox(
-            "Team labels",
-            options=["Letters", "Numbers"],
-            key="team_label_mode",
-            help="Choose how teams are displayed (A/B/C… or 1/2/3…).",
-        )
-        st.button("🚀 Start", use_container_width=True, on_click=start_game, args=(teams,))
+            st.write("")
+            label_mode = st.selectbox(
+                "Team labels",
+                options=["Letters", "Numbers"],
+                key="team_label_mode",
+                help="Choose how teams are displayed (A/B/C… or 1/2/3…).",
+            )
+            st.text_input(
+                "Team names (optional)",
+                key="team_names_input",
+                placeholder="Red Hats, Penguins, …",
+                help="Comma-separated, in team order; unnamed teams keep their label. "
+                     "Named teams get their own rows in the leaderboard across games.",
+            )
+            clash = team_names_clash(typed_team_names(teams))
+            if clash:
+                st.warning("Team names must differ from each other (and from the other teams' labels) and can't be “Show”.")
+            banks = bank_choices()
+            if len(banks) > 1:
+                st.selectbox("Question bank", options=banks, format_func=os.path.basename, key="bank_select")
+            home_bank = picked_bank()
+            if home_bank.round_count() > 1:
+                st.multiselect(
+                    "Rounds to play",
+                    options=list(range(home_bank.round_count())),
+                    format_func=lambda i: home_bank.round(i).title + (" (tiebreaker)" if home_bank.is_tiebreaker(i) else ""),
+                    key=rounds_key(home_bank),
+                    placeholder="All rounds",
+                    help="Leave empty to play every round of the question bank.",
+                )
+            pads = buzzpad.ensure_started()
+            st.checkbox("🔔 Player buzzers", key="buzzer_mode", disabled=not pads,
+                        help="Players join a team from their phones and buzz in; the first press per team shows on this board."
+                        if pads else "Off on this server: the buzzer handler has no port (`FEUD_BUZZER_PORT`).")
+            rejected = bank_rejected(home_bank)
+            if home_bank.problems:
+                errors = sum(p.severity == ERROR for p in home_bank.problems)
+                note = (f"**{os.path.basename(home_bank.path)}**: {errors} error(s), "
+                        f"{len(home_bank.problems) - errors} warning(s). "
+                        f"Check it with `python tools/compile_bank.py --check {home_bank.path}`.")
+                if rejected:
+                    st.error(note + " This server only starts games on valid banks.")
+                elif errors:
+                    st.warning(note + " What is broken is skipped; see the details.")
+                else:
+                    st.caption(note)
+                with st.expander("Details"):
+                    st.code("\n".join(str(p) for p in home_bank.problems[:50]), language=None)
+            st.button("🚀 Start", use_container_width=True, on_click=start_game, args=(teams,), disabled=rejected or clash)
+            st.caption(f"📺 [Audience display](?room={ROOM.room_id}&view=audience) — open it on the projector or any phone. "
+                       f"Room `{ROOM.room_id}`: bookmark this page to come back to the game, and keep its link "
+                       f"to yourself: it lets anyone host the room. "
+                       f"🏆 [Leaderboard](?view=leaderboard) of every finished game.")
     st.stop()
 
 # ---------------------------
 # Final results (centered)
 # ---------------------------
-if st.session_state.screen == "final":
-    labels = team_labels(st.session_state.num_teams)
-    scores = st.session_state.team_scores
-    ranking = sorted(zip(labels, scores), key=lambda x: x[1], reverse=True)
+if GS.screen == "final":
+    with span("screen.final"):
+        labels = team_labels(GS.num_teams)
 
-    c1, c2, c3 = st.columns([1, 2, 1])
-    with c2:
-        st.markdown("<div class='ff-center' style='padding:2.0rem 0'>", unsafe_allow_html=True)
-        st.markdown("<h1 class='ff-title' style='font-size:4rem; margin-bottom:1rem;'>🏁 Final Standings</h1>", unsafe_allow_html=True)
-        st.markdown("</div>", unsafe_allow_html=True)
-
-        for pos, (lab, pts) in enumerate(ranking, start=1):
-            st.markdown(
-                f"<div class='ff-card' style='margin:.45rem 0; text-align:left;'>"
-                f"<span class='ff-big'>#{pos}</span>"
-                f"<b class='ff-big' style='margin-left: 1%; margin-right: 1%'>Team {lab}</b>"
-                f"{pts} pts</div>",
-                unsafe_allow_html=True
-            )
+        c1, c2, c3 = st.columns([1, 2, 1])
+        with c2:
+            st.markdown("<div class='ff-center' style='padding:2.0rem 0'>", unsafe_allow_html=True)
+            st.markdown(FINAL_TITLE_HTML, unsafe_allow_html=True)
+            st.markdown("</div>", unsafe_allow_html=True)
 
-        st.divider()
+            render_game_standings(labels)
 
-        st.balloons()
-        
-        
-        st.button("🏠 Play again", on_click=go_home, use_container_width=True)
+            st.divider()
+
+            st.balloons()
+            if archive.ARCHIVE.enabled:
+                st.caption("🏆 This game is in the [leaderboard](?view=leaderboard).")
+
+            st.button("🏠 Play again", on_click=go_home, use_container_width=True)
 
     st.stop()
 # ---------------------------
 # Results wait screen (manual pause)
 # ---------------------------
-if st.session_state.finished and st.session_state.screen == "results_wait":
+if GS.finished and GS.screen == "results_wait":
+    with span("screen.results_wait"):
 
-    c1, c2, c3 = st.columns([1, 2, 1])
-    with c2:
-        st.markdown(
-            """
-            <div class="ff-center" style="padding:2.8rem 0 1.2rem 0;">
-              <h1 class="ff-title" style="font-size:3.8rem; margin-bottom:.6rem;">
-                Calculating results…
-              </h1>
-              <div style="opacity:.85; font-size:1.1rem;">
-                Please wait a moment
-              </div>
-            </div>
-            """,
-            unsafe_allow_html=True,
-        )
+        c1, c2, c3 = st.columns([1, 2, 1])
+        with c2:
+            st.markdown(RESULTS_WAIT_HTML, unsafe_allow_html=True)
 
-        st.markdown("<div style='height:24px'></div>", unsafe_allow_html=True)
+            st.markdown("<div style='height:24px'></div>", unsafe_allow_html=True)
 
+            # Loading GIF
+            render_loading_gif()
 
-        # Loading GIF
-        if os.path.exists("load.gif"):
-            with open("load.gif", "rb") as fh:
-                b64 = base64.b64encode(fh.read()).decode()
-
-            st.markdown(
-                f"""
-                <div class="ff-center">
-                <img src="data:image/gif;base64,{b64}"
-                    style="max-width:240px; width:100%; opacity:.95;" />
-                </div>
-                """,
-                unsafe_allow_html=True,
-            )
-            
-        st.divider()   
+            st.divider()   
         
 
-        st.button("Continue ➡️", on_click=lambda: setattr(st.session_state, "screen", "final"), use_container_width=True)
+            st.button("Continue ➡️", on_click=show_final, use_container_width=True)
 
     st.stop()
 
@@ -509,133 +674,146 @@ if st.session_state.finished and st.session_state.screen == "results_wait":
 # ---------------------------
 # Round intro screen
 # ---------------------------
-if st.session_state.started and st.session_state.screen == "round_intro":
-    labels = team_labels(st.session_state.num_teams)
-    r = current_round()
-    title = r.get("title", f"Round {st.session_state.round_index + 1}")
+if GS.started and GS.screen == "round_intro":
+    with span("screen.round_intro"):
+        labels = team_labels(GS.num_teams)
+        r = current_round()
+        title = r.title or f"Round {GS.round_index + 1}"
+        # Prepare the round's questions on a worker while the host builds suspense
+        prefetch.round_ahead(game_bank(), GS.round_index, GS.swaps, labels, GS.ledger.totals())
 
-    # ---- CENTERED CONTAINER ----
-    left, center, right = st.columns([1, 2, 1])
-    with center:
+        # ---- CENTERED CONTAINER ----
+        left, center, right = st.columns([1, 2, 1])
+        with center:
 
-        # Title (hard centered)
-        st.markdown(
-            f"""
-            <div class="ff-center" style="margin-top:2.5rem; margin-bottom:1.5rem;">
-                <h1 class="ff-title" style="font-size:4.2rem; margin:0;">
-                    🎯 {title}
-                </h1>
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
+            # Title (hard centered)
+            st.markdown(round_title_html(title), unsafe_allow_html=True)
 
-        st.button("🚀 GO!", on_click=go_next, use_container_width=True)
+            st.button("🚀 GO!", on_click=go_next, use_container_width=True)
+            if GS.buzzers:
+                st.caption(f"📱 Player buzzers: {buzzer_links(ROOM, labels)}")
 
-        # ---- Standings (only after round 1) ----
-        if st.session_state.round_index > 0:
-            st.markdown("<div style='margin-top:2.2rem;'></div>", unsafe_allow_html=True)
-
-            ranking = sorted(
-                zip(labels, st.session_state.team_scores),
-                key=lambda x: x[1],
-                reverse=True,
-            )
+            # ---- Standings (only after round 1) ----
+            if GS.round_index > 0:
+                st.markdown("<div style='margin-top:2.2rem;'></div>", unsafe_allow_html=True)
 
-            for pos, (lab, pts) in enumerate(ranking, start=1):
-                st.markdown(
-                    f"""
-                    <div class="ff-card" style="margin:.45rem 0;">
-                        <span class="ff-big">#{pos}</span>
-                        <b class="ff-big" style="margin-left:1%; margin-right:1%;">
-                            Team {lab}
-                        </b>
-                        {pts} pts
-                    </div>
-                    """,
-                    unsafe_allow_html=True,
-                )
+                render_game_standings(labels)
 
     st.stop()
 
 # ---------------------------
 # Question screen
 # ---------------------------
-q = current_question()
-rid = ensure_state_for_current_question()
-revealed = st.session_state.revealed_map[rid]
-assigned = st.session_state.assigned_map[rid]
-labels = team_labels(st.session_state.num_teams)
-
-head_left, head_right = st.columns([4, 1])
-with head_left:
-    st.markdown(f"### ❓ {q['prompt']}")
-with head_right:
-    rtitle = current_round().get("title", f"Round {st.session_state.round_index + 1}")
-    st.caption(f"{rtitle} - Q {st.session_state.q_in_round + 1} / {len(round_questions())}")
-
-# st.caption(f"{rtitle}\n\nQ {st.session_state.q_in_round + 1} / {len(round_questions())}" )
-
-st.divider()
+with span("screen.question.header"):
+    q = current_question()
 
-# Strike (button aligned to the right)
-_empt, strike_col = st.columns([12, 1])
-with strike_col:
-    st.button("❌", key="strike_btn", on_click=trigger_strike)
-
-st.components.v1.html(
-    """
-    <script>
-    (function () {
-      const doc = window.parent.document;
-
-      // Add once (Streamlit reruns the script often)
-      if (window.parent.__fedoraFeudHotkeysBound) return;
-      window.parent.__fedoraFeudHotkeysBound = true;
-
-      doc.addEventListener("keydown", function (evt) {
-
-        // Don't trigger while typing in inputs/selects
-        const el = doc.activeElement;
-        const tag = el ? el.tagName : "";
-        if (tag === "INPUT" || tag === "TEXTAREA" || tag === "SELECT") return;
-
-        if (evt.key === "e" || evt.key === "E") {
-          // Find the ❌ button and click it
-          const buttons = Array.from(doc.querySelectorAll("button"));
-          const strikeBtn = buttons.find(b => (b.innerText || "").trim() === "❌");
-          if (strikeBtn) strikeBtn.click();
-        }
-      });
-    })();
-    </script>
-    """,
-    height=0,
-)
+    head_left, head_right = st.columns([4, 1])
+    with head_left:
+        st.markdown(f"### ❓ {q.prompt}")
+    with head_right:
+        rtitle = current_round().title or f"Round {GS.round_index + 1}"
+        st.caption(f"{rtitle} - Q {GS.q_in_round + 1} / {len(round_questions())}")
+
+    # st.caption(f"{rtitle}\n\nQ {GS.q_in_round + 1} / {len(round_questions())}" )
+
+    st.divider()
+
+    # What the player said (matched against the answers) + strike, aligned to the right
+    matcher.index_for(q)
+    guess_col, team_col, _empt, strike_col = st.columns([6, 2, 4, 1])
+    with guess_col:
+        st.text_input(
+            "Player's answer",
+            key="guess_text",
+            placeholder="Type what the player said and press Enter",
+            label_visibility="collapsed",
+            on_change=on_guess,
+        )
+    with team_col:
+        team_options = ["Show"] + team_labels(GS.num_teams)
+        if st.session_state.get("guess_team") not in team_options:
+            st.session_state.guess_team = "Show"
+        st.selectbox("Give it to", options=team_options, key="guess_team", label_visibility="collapsed",
+                     help="Team that gets the points for a typed answer (Show = reveal only)")
+    with strike_col:
+        st.button("❌", key="strike_btn", on_click=trigger_strike)
+
+    result = st.session_state.get("guess_result")
+    if result and result[0] == current_ordinal():
+        _o, verdict, note, candidates = result
+        st.caption(note)
+        if verdict == matcher.AMBIGUOUS:
+            pick = st.session_state.get("guess_team")
+            team = team_labels(GS.num_teams).index(pick) if pick in team_options[1:] else None
+            for col, i in zip(st.columns(len(candidates)), candidates):
+                with col:
+                    st.button(f"{i + 1}. {q.answers[i].text}", key=f"guess_pick_{i}",
+                              on_click=pick_guess, args=(i, team), use_container_width=True)
+
+    if GS.buzzers:
+        buzzer_board(ROOM.room_id)
+
+    # Replace a question that fell flat with any question of the bank file
+    with st.expander("🔄 Swap this question"):
+        bank = game_bank()
+        here = bank.source_ordinal(GS.round_index, GS.q_in_round)
+        shown = GS.swaps.get(current_ordinal(), here)
+        if shown != here:
+            st.button("↩️ Back to the original question", key="swap_restore", on_click=swap_question, args=(here,))
+        query = st.text_input("Search questions", key="swap_query", placeholder="Words from a prompt or an answer")
+        if query.strip():
+            with span("screen.question.search"):
+                hits = search.search(bank, query)
+            if not hits:
+                st.caption("No question matches.")
+            whole = bank.whole()
+            for hit in hits:
+                hq = whole.question(hit.round_index, hit.q_index)
+                text_col, use_col = st.columns([5, 1])
+                with text_col:
+                    st.markdown(f"**{hq.prompt}**  \n"
+                                f"<small>{whole.round(hit.round_index).title} · {len(hq.answers)} answers</small>",
+                                unsafe_allow_html=True)
+                with use_col:
+                    st.button("On screen" if hit.ordinal == shown else "Use", key=f"swap_{hit.ordinal}",
+                              disabled=hit.ordinal == shown, on_click=swap_question, args=(hit.ordinal,),
+                              use_container_width=True)
+
+
+# Answers + scoreboard. Each answer row is its own fragment, so changing one
+# selectbox reruns just that row; the row then refreshes the score pills in place.
+@timed("scoreboard")
+def render_scoreboard(slot) -> None:
+    # Fragment reruns reach this too: resolve the room now, not from the full run's GS
+    gs = room_state()
+    slot.markdown(
+        scoreboard_html(team_labels(gs.num_teams), gs.ledger.totals()),
+        unsafe_allow_html=True,
+    )
 
+@st.fragment
+@timed("question.row")
+def answer_row(i: int, score_slot) -> None:
+    q = current_question()
+    if i >= len(q.answers):
+        return
+    o = current_ordinal()
+    gs = room_state()
+    board = gs.board
+    revealed = board.is_revealed(o, i)
+    assigned = board.assigned(o, i)
+    labels = team_labels(gs.num_teams)
 
-# Answers
-for i, a in enumerate(q["answers"]):
     left, right = st.columns([11, 1])
     with left:
-        if revealed[i]:
-            st.markdown(
-                f"<div class='ff-card ff-success ff-center popIn'>"
-                f"<div class='ff-big'>{a['text']}</div><div>{a['points']} pts</div></div>",
-                unsafe_allow_html=True,
-            )
-        else:
-            st.markdown(
-                f"<div class='ff-card ff-center'><div class='ff-num'>#{i+1}</div></div>",
-                unsafe_allow_html=True,
-            )
+        st.markdown(answer_cards_html(q, board.revealed_mask(o))[i], unsafe_allow_html=True)
 
     with right:
-        dd_key = f"sel_{st.session_state.round_index}_{st.session_state.q_in_round}_{i}"
+        dd_key = session.row_key(gs.round_index, gs.q_in_round, i)
         if dd_key not in st.session_state:
-            if assigned[i] is not None:
-                st.session_state[dd_key] = labels[assigned[i]]
-            elif revealed[i]:
+            if assigned is not None:
+                st.session_state[dd_key] = labels[assigned]
+            elif revealed:
                 st.session_state[dd_key] = "Show"
             else:
                 st.session_state[dd_key] = "(choose)"
@@ -643,6 +821,8 @@ for i, a in enumerate(q["answers"]):
         options = ["(choose)", "Show"] + labels
 
         def on_select_change(ans_idx=i, key=dd_key):
+            # Any change reruns this fragment; it must redraw the pills it last drew
+            st.session_state.scores_dirty = True
             val = st.session_state[key]
             if val == "(choose)":
                 return
@@ -651,7 +831,7 @@ for i, a in enumerate(q["answers"]):
                 return
             if val in labels:
                 assign_team(ans_idx, labels.index(val))
-                
+
         # Ensure current value is valid
         if st.session_state[dd_key] not in options:
             st.session_state[dd_key] = "(choose)"
@@ -666,36 +846,35 @@ for i, a in enumerate(q["answers"]):
 
     st.write("")
 
-st.divider()
-
-# Scoreboard
-items = ''.join([
-    f"<div class='ff-pill' style='background-color: orange;color: rgb(14, 17, 23);'>"
-    f"<span class='lbl'>Team {l}:</span><span class='val'>{v}</span></div>"
-    for l, v in zip(labels, st.session_state.team_scores)
-])
-st.markdown(f"<div class='ff-toolbar'>{items}</div>", unsafe_allow_html=True)
+    # Only set by this row's callback, i.e. on a fragment rerun. The frontend drops
+    # elements a fragment drew previously but not this time, so always redraw here.
+    if st.session_state.pop("scores_dirty", False):
+        render_scoreboard(score_slot)
+        publish_state()
+
+with span("screen.question.board"):
+    rows_box = st.container()
+    st.divider()
+    score_slot = st.empty()
+    with rows_box:
+        for i in range(len(q.answers)):
+            answer_row(i, score_slot)
+    render_scoreboard(score_slot)
 
 st.divider()
 
 # Navigation
-nav1, nav_mid, nav3 = st.columns([1, 2, 1])
-with nav1:
-    st.button("⬅️ Previous", use_container_width=True, on_click=go_prev)
-with nav3:
-    st.button("Next ➡️", use_container_width=True, on_click=go_next)
-
-# Strike overlay (auto-hide via rerun)
-if st.session_state.show_strike:
+with span("screen.question.nav"):
+    nav1, nav_mid, nav3 = st.columns([1, 2, 1])
+    with nav1:
+        st.button("⬅️ Previous", use_container_width=True, on_click=go_prev)
+    with nav3:
+        st.button("Next ➡️", use_container_width=True, on_click=go_next)
+
+# Strike overlay: the CSS animation hides it in the browser. We keep emitting the
+# identical element until it has faded so reruns (reveals) don't cut it short.
+if time.time() < GS.strike_hide_at:
     st.markdown(
-        f"<div class='ff-strike' id='strike-{st.session_state.strike_nonce}'><div class='ff-x'>✕</div></div>",
+        strike_overlay_html(GS.strike_nonce, GS.strike_shown),
         unsafe_allow_html=True
     )
-    remaining = st.session_state.strike_hide_at - time.time()
-    if remaining > 0:
-        time.sleep(remaining)
-    st.session_state.show_strike = False
-    try:
-        st.rerun()
-    except AttributeError:
-        st.experimental_rerun()
\ No newline at end of file
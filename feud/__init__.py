@@ -0,0 +1 @@
+# Support modules for the Fedora Feud Streamlit app (family_feud_streamlit.py).
@@ -0,0 +1,314 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, TextIO, Tuple
+import csv
+import json
+import logging
+import os
+import sqlite3
+import threading
+
+from feud import game
+from feud.bank import QuestionBank
+from feud.journal import DATA_DIR
+
+# ---------------------------
+# Results archive: every finished game in one SQLite file
+#
+#   FEUD_ARCHIVE=<path>   database file (default $FEUD_DATA_DIR/results.db, "" = off)
+#
+#   games      one row per game that reached the final screen
+#   teams      final total and rank of each team (rank 1 = winner, ties share it);
+#              `named` when the host named it, else its label is just its position
+#   rounds     per-round subtotal of each team
+#   questions  each question that was played: prompt, answers on the board, strikes
+#   answers    every answer of those questions: revealed or not, and to which team
+#
+# Games are written by one background thread (SQLite has a single writer anyway),
+# so reaching the final screen never waits on the disk. Leaderboards read through
+# covering indexes: a query over thousands of games touches index pages only.
+# Exports stream rows from a cursor; the archive is never loaded as a whole.
+# ---------------------------
+ARCHIVE_PATH = os.environ.get("FEUD_ARCHIVE", os.path.join(DATA_DIR, "results.db"))
+SCHEMA_VERSION = 1
+
+_LOG = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    game_key TEXT NOT NULL UNIQUE,
+    room_id TEXT NOT NULL,
+    finished_at REAL NOT NULL,
+    bank_path TEXT,
+    bank_digest TEXT,
+    num_teams INTEGER NOT NULL,
+    rounds_played INTEGER NOT NULL,
+    tiebreaker_used INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS games_finished ON games (finished_at);
+
+CREATE TABLE IF NOT EXISTS teams (
+    game_id INTEGER NOT NULL REFERENCES games (id),
+    team_idx INTEGER NOT NULL,
+    label TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    rank INTEGER NOT NULL,
+    named INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (game_id, team_idx)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS teams_named ON teams (named, label COLLATE NOCASE, rank, total, game_id);
+
+CREATE TABLE IF NOT EXISTS rounds (
+    game_id INTEGER NOT NULL REFERENCES games (id),
+    round_index INTEGER NOT NULL,
+    team_idx INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    points INTEGER NOT NULL,
+    PRIMARY KEY (game_id, round_index, team_idx)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS questions (
+    game_id INTEGER NOT NULL REFERENCES games (id),
+    ordinal INTEGER NOT NULL,
+    round_index INTEGER NOT NULL,
+    prompt TEXT NOT NULL,
+    answers INTEGER NOT NULL,
+    revealed INTEGER NOT NULL,
+    assigned INTEGER NOT NULL,
+    strikes INTEGER NOT NULL,
+    points INTEGER NOT NULL,
+    PRIMARY KEY (game_id, ordinal)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS questions_prompt ON questions (prompt, answers, revealed, strikes, points, game_id);
+
+CREATE TABLE IF NOT EXISTS answers (
+    game_id INTEGER NOT NULL REFERENCES games (id),
+    ordinal INTEGER NOT NULL,
+    answer_idx INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    points INTEGER NOT NULL,
+    revealed INTEGER NOT NULL,
+    team_idx INTEGER,
+    PRIMARY KEY (game_id, ordinal, answer_idx)
+) WITHOUT ROWID;
+"""
+
+# ---------------------------
+# Turning a finished game into rows
+# ---------------------------
+GameRecord = Dict[str, Any]
+
+def game_record(room_id: str, s, bank: QuestionBank, now: float) -> GameRecord:
+    # Everything the archive keeps about the game in `s` (a room's state, on its
+    # final screen); `bank` is the game's bank. Plain data: safe to hand to the writer.
+    ledger = s.ledger
+    totals = ledger.totals()
+    labels = list(s.team_names) or [chr(ord("A") + i) for i in range(len(totals))]
+    teams = [(t, labels[t], totals[t], 1 + sum(other > totals[t] for other in totals), int(game.is_named(labels[t], t)))
+             for t in range(len(totals))]
+    rounds = [
+        (ri, t, bank.round(ri).title if ri < bank.round_count() else f"Round {ri + 1}", pts)
+        for ri in ledger.rounds() for t, pts in enumerate(ledger.round_totals(ri))
+    ]
+    questions: List[Tuple] = []
+    answers: List[Tuple] = []
+    for o in range(min(len(s.board), bank.question_count)):
+        mask, strikes = s.board.revealed_mask(o), s.board.strikes(o)
+        if not mask and not strikes:
+            continue  # never played (or only passed through)
+        ri, qi = bank.locate(o)
+        q = game.slot_question(bank, s.swaps, ri, qi)
+        assigned = points = 0
+        for i, a in enumerate(q.answers):
+            team = s.board.assigned(o, i)
+            revealed = bool(mask >> i & 1)
+            if team is not None:
+                assigned += 1
+                points += a.points
+            answers.append((o, i, a.text, a.points, int(revealed), team))
+        questions.append((o, ri, q.prompt, len(q.answers), bin(mask).count("1"), assigned, strikes, points))
+    return {
+        "game": (f"{room_id}:{now:.6f}", room_id, now, s.bank_path or bank.path, bank.digest,
+                 s.num_teams, len({q[1] for q in questions}), int(bool(s.tiebreaker_used))),
+        "teams": teams,
+        "rounds": rounds,
+        "questions": questions,
+        "answers": answers,
+    }
+
+# ---------------------------
+# Archive
+# ---------------------------
+class ResultsArchive:
+    def __init__(self, path: str = ARCHIVE_PATH):
+        self.path = path
+        self.enabled = bool(path)
+        self._ready = False
+        self._lock = threading.Lock()
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="feud-archive")
+
+    def _disable(self, exc: Exception) -> None:
+        # Like the journal: a read-only or full disk must never break the game itself
+        _LOG.warning("Results archive disabled (%s): %s", self.path, exc)
+        self.enabled = False
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        if not self._ready:
+            with self._lock:
+                if not self._ready:
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.executescript(_SCHEMA)
+                    conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+                    conn.commit()
+                    self._ready = True
+        return conn
+
+    def open(self) -> Optional[sqlite3.Connection]:
+        # A read connection, or None when the archive is off or unusable
+        if not self.enabled:
+            return None
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            return self._connect()
+        except (OSError, sqlite3.Error) as exc:
+            self._disable(exc)
+            return None
+
+    def record(self, rec: GameRecord):
+        # Queue one game for writing; returns the writer's future (None when off)
+        if not self.enabled:
+            return None
+        return self._writer.submit(self._write, rec)
+
+    def _write(self, rec: GameRecord) -> Optional[int]:
+        conn = self.open()
+        if conn is None:
+            return None
+        try:
+            with conn:
+                cur = conn.execute(
+                    "INSERT OR IGNORE INTO games (game_key, room_id, finished_at, bank_path, bank_digest,"
+                    " num_teams, rounds_played, tiebreaker_used) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rec["game"])
+                if not cur.rowcount:
+                    return None  # already archived
+                gid = cur.lastrowid
+                conn.executemany("INSERT INTO teams (game_id, team_idx, label, total, rank, named)"
+                                 " VALUES (?, ?, ?, ?, ?, ?)", [(gid,) + t for t in rec["teams"]])
+                conn.executemany("INSERT INTO rounds VALUES (?, ?, ?, ?, ?)", [(gid,) + r for r in rec["rounds"]])
+                conn.executemany("INSERT INTO questions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                 [(gid,) + q for q in rec["questions"]])
+                conn.executemany("INSERT INTO answers VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                 [(gid,) + a for a in rec["answers"]])
+            return gid
+        except sqlite3.Error as exc:
+            _LOG.warning("could not archive game %s: %s", rec["game"][0], exc)
+            return None
+        finally:
+            conn.close()
+
+    def flush(self) -> None:
+        # Wait for the games queued so far (tests, tools, shutdown)
+        self._writer.submit(lambda: None).result()
+
+    # ---------------------------
+    # Leaderboards
+    # ---------------------------
+    def _query(self, sql: str, args: Sequence[Any]) -> List[Dict[str, Any]]:
+        conn = self.open()
+        if conn is None:
+            return []
+        try:
+            conn.row_factory = sqlite3.Row
+            return [dict(r) for r in conn.execute(sql, args)]
+        except sqlite3.Error as exc:
+            _LOG.warning("results archive query failed: %s", exc)
+            return []
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _games_join(table: str, alias: str, since: float) -> str:
+        # All time: scan the table's covering index (already grouped by team/prompt).
+        # A window: walk the games in it by finish time, then their rows by primary
+        # key (CROSS JOIN pins that order in SQLite), so recent stats stay cheap.
+        if since > 0:
+            return f"games g CROSS JOIN {table} {alias} ON {alias}.game_id = g.id"
+        return f"{table} {alias} JOIN games g ON g.id = {alias}.game_id"
+
+    def team_leaderboard(self, since: float = 0.0, limit: int = 50) -> List[Dict[str, Any]]:
+        # Named teams only (names match case-insensitively): "Team A" of one game
+        # has nothing to do with "Team A" of the next. In a window, `+` keeps
+        # SQLite on each game's rows by primary key instead of the named index.
+        return self._query(
+            "SELECT MAX(t.label) AS team, COUNT(*) AS games, SUM(t.rank = 1) AS wins,"
+            " SUM(t.total) AS points, ROUND(AVG(t.total), 1) AS avg_points, MAX(t.total) AS best"
+            f" FROM {self._games_join('teams', 't', since)} WHERE {'+' if since > 0 else ''}t.named = 1"
+            " AND g.finished_at >= ?"
+            " GROUP BY t.label COLLATE NOCASE ORDER BY wins DESC, points DESC, team LIMIT ?", (since, limit))
+
+    def question_stats(self, since: float = 0.0, limit: int = 50) -> List[Dict[str, Any]]:
+        # Per prompt: how often it was played, how much of its board got found, strikes
+        return self._query(
+            "SELECT q.prompt, COUNT(*) AS plays, ROUND(AVG(100.0 * q.revealed / q.answers), 1) AS found_pct,"
+            " ROUND(AVG(q.strikes), 2) AS avg_strikes, ROUND(AVG(q.points), 1) AS avg_points"
+            f" FROM {self._games_join('questions', 'q', since)} WHERE g.finished_at >= ?"
+            " GROUP BY q.prompt ORDER BY plays DESC, found_pct, q.prompt LIMIT ?", (since, limit))
+
+    def recent_games(self, limit: int = 20) -> List[Dict[str, Any]]:
+        return self._query(
+            "SELECT g.id, g.finished_at, g.room_id, g.num_teams, g.rounds_played,"
+            " (SELECT group_concat(t.label || ' ' || t.total, ', ') FROM"
+            "   (SELECT label, total FROM teams WHERE game_id = g.id ORDER BY rank, team_idx) t) AS standings"
+            " FROM games g ORDER BY g.finished_at DESC LIMIT ?", (limit,))
+
+    def game_count(self) -> int:
+        rows = self._query("SELECT COUNT(*) AS n FROM games", ())
+        return rows[0]["n"] if rows else 0
+
+    # ---------------------------
+    # Streaming export
+    # ---------------------------
+    def export(self, table: str, fmt: str, out: TextIO, since: float = 0.0) -> int:
+        # Writes `table` (each row with its game's finish time) as csv, json (one
+        # array) or jsonl to `out`, row by row off the cursor; returns rows written
+        if table not in EXPORT_TABLES:
+            raise ValueError(f"unknown table {table!r} (one of {', '.join(EXPORT_TABLES)})")
+        if fmt not in ("csv", "json", "jsonl"):
+            raise ValueError(f"unknown format {fmt!r}")
+        conn = self.open()
+        if conn is None:
+            return 0
+        if table == "games":
+            sql = "SELECT * FROM games WHERE finished_at >= ? ORDER BY id"
+        else:
+            sql = (f"SELECT g.finished_at, x.* FROM {table} x JOIN games g ON g.id = x.game_id"
+                   f" WHERE g.finished_at >= ? ORDER BY x.game_id")
+        n = 0
+        try:
+            cur = conn.execute(sql, (since,))
+            columns = [d[0] for d in cur.description]
+            if fmt == "csv":
+                writer = csv.writer(out)
+                writer.writerow(columns)
+                for row in cur:
+                    writer.writerow(row)
+                    n += 1
+                return n
+            out.write("[" if fmt == "json" else "")
+            for row in cur:
+                if fmt == "json":
+                    out.write(",\n" if n else "\n")
+                out.write(json.dumps(dict(zip(columns, row)), ensure_ascii=False))
+                out.write("" if fmt == "json" else "\n")
+                n += 1
+            out.write("\n]\n" if fmt == "json" else "")
+            return n
+        finally:
+            conn.close()
+
+EXPORT_TABLES = ("games", "teams", "rounds", "questions", "answers")
+
+ARCHIVE = ResultsArchive()
@@ -0,0 +1,50 @@
+from typing import Dict, Optional, Tuple
+import hashlib
+import os
+import threading
+
+# ---------------------------
+# Static assets (served by Streamlit from ./static at /app/static)
+# ---------------------------
+STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static")
+STATIC_URL = "app/static"
+
+# name -> ((mtime_ns, size), url)
+_ASSETS: Dict[str, Tuple[Tuple[int, int], str]] = {}
+_ASSETS_LOCK = threading.Lock()
+
+def _content_hash(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            h.update(chunk)
+    return h.hexdigest()[:12]
+
+def asset_url(name: str) -> Optional[str]:
+    # The ?v=<content hash> query makes the static handler send a long-lived
+    # Cache-Control header; swapping the file changes the hash and so the URL.
+    path = os.path.join(STATIC_DIR, name)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    signature = (st.st_mtime_ns, st.st_size)
+
+    cached = _ASSETS.get(name)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    with _ASSETS_LOCK:
+        cached = _ASSETS.get(name)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        try:
+            url = f"{STATIC_URL}/{name}?v={_content_hash(path)}"
+        except OSError:
+            return None
+        _ASSETS[name] = (signature, url)
+        return url
+
+def preload(*names: str) -> None:
+    for name in names:
+        asset_url(name)
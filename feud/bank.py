@@ -0,0 +1,383 @@
+from typing import List, Dict, Optional, Sequence, Tuple, Any
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+import weakref
+
+from feud import metrics
+
+log = logging.getLogger(__name__)
+
+# ---------------------------
+# Data loading (with rounds)
+# ---------------------------
+# Raw JSON-ish dicts (what parse_rounds returns); compiled into records below
+RawQuestion = Dict[str, Any]
+RawRound = Dict[str, Any]
+
+DEFAULT_QUESTIONS: List[RawQuestion] = [
+    {
+        "prompt": "Name something people double-check before leaving home",
+        "answers": [
+            {"text": "Keys", "points": 32},
+            {"text": "Phone", "points": 27},
+            {"text": "Wallet", "points": 18},
+            {"text": "Lights off", "points": 9},
+            {"text": "Door locked", "points": 8},
+            {"text": "Stove/Gas", "points": 6},
+        ],
+    }
+]
+
+def _clean_questions(raw_questions: Any, max_answers: int = 15) -> List[RawQuestion]:
+    if not isinstance(raw_questions, list):
+        return []
+    cleaned: List[RawQuestion] = []
+    for q in raw_questions:
+        if not isinstance(q, dict):
+            continue
+        prompt = q.get("prompt")
+        answers = q.get("answers", [])
+        if isinstance(prompt, str) and isinstance(answers, list) and 1 <= len(answers) <= max_answers:
+            cleaned.append({
+                "prompt": prompt,
+                "answers": [{"text": str(a.get("text", "")), "points": int(a.get("points", 0))} for a in answers if isinstance(a, dict)],
+            })
+    return cleaned
+
+def _default_rounds() -> List[RawRound]:
+    return [{"title": "Round 1", "questions": DEFAULT_QUESTIONS}]
+
+def parse_rounds(data: Any) -> List[RawRound]:
+    # Supports:
+    #  - New format: {"rounds":[{"title":"Round 1","questions":[...]}]}
+    #  - Old format: [ {prompt, answers}, ... ]  -> becomes one round "Round 1"
+    if isinstance(data, dict) and isinstance(data.get("rounds"), list):
+        rounds: List[RawRound] = []
+        for r in data["rounds"]:
+            if not isinstance(r, dict):
+                continue
+            title = r.get("title", "Round")
+            questions = _clean_questions(r.get("questions", []))
+            if isinstance(title, str) and questions:
+                rounds.append({
+                    "title": title,
+                    "questions": questions,
+                    "tiebreaker": bool(r.get("tiebreaker", False)),
+                })
+        return rounds or _default_rounds()
+
+    if isinstance(data, list):
+        questions = _clean_questions(data)
+        return [{"title": "Round 1", "questions": questions or DEFAULT_QUESTIONS}]
+
+    return _default_rounds()
+
+def load_rounds_from_file(path: str) -> List[RawRound]:
+    if not os.path.exists(path):
+        return _default_rounds()
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return parse_rounds(json.load(f))
+    except Exception:
+        return _default_rounds()
+
+# ---------------------------
+# Compiled, process-wide bank
+# ---------------------------
+Signature = Optional[Tuple[int, int]]  # (mtime_ns, size) or None when the file is missing
+
+# Compiled records are shared by every session in the process: treat them as read-only.
+class Answer:
+    __slots__ = ("text", "points")
+
+    def __init__(self, text: str, points: int):
+        self.text = text
+        self.points = points
+
+class Question:
+    __slots__ = ("prompt", "answers", "match_index")
+
+    def __init__(self, prompt: str, answers: Tuple[Answer, ...]):
+        self.prompt = prompt
+        self.answers = answers
+        self.match_index = None  # feud.matcher.AnswerIndex, built the first time the question is shown
+
+def compile_question(q: RawQuestion) -> Question:
+    return Question(q["prompt"], tuple(Answer(a["text"], a["points"]) for a in q["answers"]))
+
+class Round:
+    # `questions` is a tuple, or a lazy sequence for indexed libraries (feud/library.py)
+    __slots__ = ("index", "title", "questions", "tiebreaker", "first_ordinal")
+
+    def __init__(self, index: int, title: str, questions: Sequence[Question], tiebreaker: bool, first_ordinal: int = 0):
+        self.index = index
+        self.title = title
+        self.questions = questions
+        self.tiebreaker = tiebreaker
+        self.first_ordinal = first_ordinal  # flat position of the round's first question in the bank
+
+def compile_rounds(rounds: List[RawRound]) -> List[Round]:
+    return [
+        Round(idx, r.get("title", "Round"), tuple(compile_question(q) for q in r.get("questions", [])), bool(r.get("tiebreaker", False)))
+        for idx, r in enumerate(rounds)
+    ]
+
+class QuestionBank:
+    # Navigation is precomputed once per bank so every Next/Previous is a table lookup:
+    #   next_round[i]      next NORMAL round after normal round i (None after the last one)
+    #   prev_round[i]      round Previous goes back to from round i's intro
+    #   next_tiebreaker[i] sudden-death round to play after round i if the top is tied
+    #                      (defined for the last normal round and for each tiebreaker,
+    #                      so several tiebreaker rounds chain in file order)
+    __slots__ = ("path", "signature", "digest", "selection", "problems", "rounds", "question_count",
+                 "last_normal", "tiebreakers", "next_round", "prev_round", "next_tiebreaker",
+                 "parent", "search_index", "version", "_subsets", "_firsts", "__weakref__")
+
+    def __init__(self, path: str, rounds: Sequence[Round], signature: Signature, digest: str,
+                 selection: Optional[Tuple[int, ...]] = None, problems: Tuple[Any, ...] = ()):
+        self.path = path
+        self.signature = signature
+        self.digest = digest
+        self.selection = selection  # source round indices when this is a subset() of a bank
+        self.problems = problems    # feud.validate.Problem list for the file; errors mean it was rejected or cut
+        self.parent: Optional["QuestionBank"] = None  # the whole bank, for a subset()
+        self.search_index = None    # feud.search.SearchIndex, built on the first search
+        self.version = 1            # bumped each time the file's content changes (see get_bank)
+        self._subsets: Dict[Tuple[int, ...], "QuestionBank"] = {}
+
+        # Only len() of each round's questions is needed here: lazy rounds stay undecoded
+        compiled: List[Round] = []
+        ordinal = 0
+        for idx, r in enumerate(rounds):
+            compiled.append(Round(idx, r.title, r.questions, r.tiebreaker, ordinal))
+            ordinal += len(r.questions)
+        self.rounds: Tuple[Round, ...] = tuple(compiled)
+        self.question_count = ordinal
+        self._firsts = [r.first_ordinal for r in compiled]
+        self._build_navigation()
+
+    def _build_navigation(self) -> None:
+        n = len(self.rounds)
+        normal = [r.index for r in self.rounds if not r.tiebreaker]
+        self.tiebreakers: Tuple[int, ...] = tuple(r.index for r in self.rounds if r.tiebreaker)
+        self.last_normal = normal[-1] if normal else 0
+
+        next_round: List[Optional[int]] = [None] * n
+        prev_round: List[Optional[int]] = [None] * n
+        for a, b in zip(normal, normal[1:]):
+            next_round[a] = b
+            prev_round[b] = a
+
+        next_tiebreaker: List[Optional[int]] = [None] * n
+        chain = [self.last_normal] + [t for t in self.tiebreakers if t != self.last_normal]
+        for a, b in zip(chain, chain[1:]):
+            next_tiebreaker[a] = b
+            prev_round[b] = a
+
+        self.next_round = tuple(next_round)
+        self.prev_round = tuple(prev_round)
+        self.next_tiebreaker = tuple(next_tiebreaker)
+
+    def round_count(self) -> int:
+        return len(self.rounds)
+
+    def round(self, idx: int) -> Round:
+        return self.rounds[idx]
+
+    def questions(self, round_idx: int) -> Sequence[Question]:
+        return self.rounds[round_idx].questions
+
+    def question(self, round_idx: int, q_idx: int) -> Question:
+        return self.rounds[round_idx].questions[q_idx]
+
+    def ordinal(self, round_idx: int, q_idx: int) -> int:
+        return self.rounds[round_idx].first_ordinal + q_idx
+
+    def locate(self, ordinal: int) -> Tuple[int, int]:
+        # Flat question ordinal -> (round index, question index)
+        if not 0 <= ordinal < self.question_count:
+            raise IndexError(f"no question {ordinal}")
+        ri = bisect.bisect_right(self._firsts, ordinal) - 1
+        return ri, ordinal - self._firsts[ri]
+
+    def question_at(self, ordinal: int) -> Question:
+        return self.question(*self.locate(ordinal))
+
+    def whole(self) -> "QuestionBank":
+        # The full bank a subset() was cut from (itself otherwise)
+        return self.parent or self
+
+    def source_ordinal(self, round_idx: int, q_idx: int) -> int:
+        # A question's ordinal in whole()
+        if self.parent is None:
+            return self.ordinal(round_idx, q_idx)
+        return self.parent.ordinal(self.selection[round_idx], q_idx)
+
+    def is_tiebreaker(self, round_idx: int) -> bool:
+        return self.rounds[round_idx].tiebreaker
+
+    def subset(self, round_indices: Sequence[int]) -> "QuestionBank":
+        # A game built from some rounds only; shares (and never decodes) the others
+        key = tuple(i for i in round_indices if 0 <= i < len(self.rounds))
+        if not key or key == tuple(range(len(self.rounds))):
+            return self
+        sub = self._subsets.get(key)
+        if sub is None:
+            sub = QuestionBank(self.path, [self.rounds[i] for i in key], self.signature, self.digest, key, self.problems)
+            sub.parent = self
+            self._subsets[key] = sub
+        return sub
+
+    def with_signature(self, signature: Signature) -> "QuestionBank":
+        # Same content under a new stat (touch, copy-in-place): reuse the compiled rounds
+        clone = QuestionBank.__new__(QuestionBank)
+        for slot in QuestionBank.__slots__[:-1]:  # all but __weakref__
+            setattr(clone, slot, getattr(self, slot))
+        clone.signature = signature
+        clone._subsets = {}
+        return clone
+
+# ---------------------------
+# Bank versions and hot reload
+#
+#   FEUD_BANK_POLL_SECONDS=2   how often the watcher stats the bank files (0 = stat on every get_bank)
+#
+# _BANKS holds the current version of each file. Once watch_banks() runs (the
+# app starts it), get_bank() is a dict lookup: a watcher thread stats every
+# known file, and when a file changed (and stayed the same for one more poll,
+# so a half-written file is not picked up) compiles it off the request path
+# and swaps the new version in. A new version that fails to open while the
+# current one is fine is not swapped in.
+# A game is pinned to the version it started with (pinned_bank, by digest) until
+# go_home: versions live in a weak map, so an old one (and its copy of the
+# file's bytes) is freed as soon as no game references it any more.
+# ---------------------------
+POLL_SECONDS = float(os.environ.get("FEUD_BANK_POLL_SECONDS", "2"))
+
+_BANKS: Dict[str, QuestionBank] = {}
+_BANKS_LOCK = threading.Lock()
+_VERSIONS: "weakref.WeakValueDictionary[Tuple[str, str], QuestionBank]" = weakref.WeakValueDictionary()
+_RELOADS = {"count": 0}
+_watcher: Optional[threading.Thread] = None
+
+def _stat_signature(path: str) -> Signature:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+def _default_bank(path: str, signature: Signature, problems: Tuple[Any, ...] = ()) -> QuestionBank:
+    return QuestionBank(path, compile_rounds(_default_rounds()), signature, "", problems=problems)
+
+def _compile(path: str, signature: Signature, cached: Optional[QuestionBank]) -> QuestionBank:
+    from feud.library import open_library
+    from feud.validate import describe_failure
+
+    if signature is None:
+        bank = _default_bank(path, None, tuple(describe_failure(path, FileNotFoundError("file not found"))))
+    else:
+        try:
+            library = open_library(path, signature)
+        except (OSError, ValueError, TypeError, OverflowError) as e:
+            # int() on odd "points" raises TypeError/OverflowError too
+            bank = _default_bank(path, signature, tuple(describe_failure(path, e)))
+        else:
+            if cached is not None and cached.digest == library.digest:
+                return cached.with_signature(signature)
+            bank = QuestionBank(path, library.rounds(), signature, library.digest, problems=library.problems)
+
+    if bank.problems:
+        log.warning("%s: %d problem(s) in the question bank, first: %s", path, len(bank.problems), bank.problems[0])
+    return bank
+
+def _install(path: str, bank: QuestionBank, cached: Optional[QuestionBank]) -> None:
+    # Under _BANKS_LOCK: make `bank` the current version of `path`
+    if cached is not None and bank is not cached:
+        bank.version = cached.version + (bank.digest != cached.digest)
+    _BANKS[path] = bank
+    if bank.digest:
+        _VERSIONS[(path, bank.digest)] = bank
+
+def get_bank(path: str) -> QuestionBank:
+    # The current version of the file. Without the watcher: one stat() per call and
+    # the file is re-indexed when mtime/size move. Either way questions are only
+    # decoded when a game actually shows them.
+    cached = _BANKS.get(path)
+    if cached is not None and _watcher is not None:
+        return cached
+    signature = _stat_signature(path)
+    if cached is not None and cached.signature == signature:
+        return cached
+
+    with _BANKS_LOCK:
+        cached = _BANKS.get(path)
+        if cached is not None and cached.signature == signature:
+            return cached
+        bank = _compile(path, signature, cached)
+        _install(path, bank, cached)
+        return bank
+
+def pinned_bank(path: str, digest: Optional[str]) -> QuestionBank:
+    # The version of `path` with this digest while any game still holds it,
+    # else the current one (a game restored after a restart, or no pin at all)
+    if digest:
+        bank = _VERSIONS.get((path, digest))
+        if bank is not None:
+            return bank
+    return get_bank(path)
+
+def reload_bank(path: str, signature: Signature) -> Optional[QuestionBank]:
+    # Compile `path` (seen at `signature`) and swap it in; None when nothing changed
+    # or the new content failed to open. The compile runs outside _BANKS_LOCK.
+    cached = _BANKS.get(path)
+    if cached is None or cached.signature == signature:
+        return None
+    bank = _compile(path, signature, cached)
+    if bank.digest == "" and cached.digest != "":
+        log.warning("%s changed but could not be loaded; still serving version %d", path, cached.version)
+        return None
+    with _BANKS_LOCK:
+        if _BANKS.get(path) is not cached:
+            return None  # someone else swapped it meanwhile
+        _install(path, bank, cached)
+    if bank.version != cached.version:
+        _RELOADS["count"] += 1
+        log.info("%s reloaded: version %d (%s)", path, bank.version, bank.digest[:12])
+    return bank
+
+def _watch(interval: float) -> None:
+    seen: Dict[str, Signature] = {}   # signature at the previous poll
+    tried: Dict[str, Signature] = {}  # last signature compiled (once per change, even if it failed)
+    while True:
+        time.sleep(interval)
+        for path in list(_BANKS):
+            signature = _stat_signature(path)
+            settled = seen.get(path) == signature
+            seen[path] = signature
+            if settled and tried.get(path) != signature:
+                tried[path] = signature
+                try:
+                    reload_bank(path, signature)
+                except Exception:
+                    log.warning("reloading %s failed", path, exc_info=True)
+
+def watch_banks(interval: float = POLL_SECONDS) -> None:
+    # Called on every rerun; starts the watcher thread once per process
+    global _watcher
+    if interval <= 0 or _watcher is not None:
+        return
+    with _BANKS_LOCK:
+        if _watcher is not None:
+            return
+        _watcher = threading.Thread(target=_watch, args=(interval,), name="feud-bank-watch", daemon=True)
+        _watcher.start()
+
+metrics.register_counter("feud_bank_reloads_total", "Question bank versions swapped in by the watcher.",
+                         lambda: _RELOADS["count"])
+metrics.register_gauge("feud_bank_versions", "Question bank versions in memory (current ones and pinned by games).",
+                       lambda: len(_VERSIONS))
@@ -0,0 +1,103 @@
+from typing import List, Optional
+import struct
+
+# ---------------------------
+# Per-question game state, indexed by flat question ordinal (QuestionBank.ordinal)
+# ---------------------------
+# Fixed-size slots in three byte arrays instead of dicts of Python lists:
+#   revealed  2 bytes per question, bit i = answer i is on the board
+#   assigned  15 bytes per question, 0 = nobody, t + 1 = team t
+#   strikes   1 byte per question
+# Arrays grow up to the highest ordinal touched, so a game costs ~18 bytes per
+# question it reached, and to_bytes()/from_bytes() is a header plus three copies.
+MAX_ANSWERS = 15
+MASK_BYTES = 2
+
+_HEADER = struct.Struct("<4sI")  # magic, question slots
+_MAGIC = b"FFB1"
+
+class Board:
+    __slots__ = ("_revealed", "_assigned", "_strikes")
+
+    def __init__(self):
+        self._revealed = bytearray()
+        self._assigned = bytearray()
+        self._strikes = bytearray()
+
+    def __len__(self) -> int:
+        return len(self._strikes)
+
+    def _grow(self, ordinal: int) -> None:
+        missing = ordinal + 1 - len(self._strikes)
+        if missing > 0:
+            self._revealed.extend(bytes(missing * MASK_BYTES))
+            self._assigned.extend(bytes(missing * MAX_ANSWERS))
+            self._strikes.extend(bytes(missing))
+
+    # revealed flags
+    def revealed_mask(self, ordinal: int) -> int:
+        pos = ordinal * MASK_BYTES
+        return int.from_bytes(self._revealed[pos:pos + MASK_BYTES], "little")
+
+    def is_revealed(self, ordinal: int, ans_idx: int) -> bool:
+        return bool(self.revealed_mask(ordinal) >> ans_idx & 1)
+
+    def revealed(self, ordinal: int, n_answers: int) -> List[bool]:
+        mask = self.revealed_mask(ordinal)
+        return [bool(mask >> i & 1) for i in range(n_answers)]
+
+    def reveal(self, ordinal: int, ans_idx: int) -> None:
+        self._grow(ordinal)
+        self._revealed[ordinal * MASK_BYTES + ans_idx // 8] |= 1 << (ans_idx % 8)
+
+    # team assignments
+    def assigned(self, ordinal: int, ans_idx: int) -> Optional[int]:
+        pos = ordinal * MAX_ANSWERS + ans_idx
+        team = self._assigned[pos] if pos < len(self._assigned) else 0
+        return team - 1 if team else None
+
+    def assign(self, ordinal: int, ans_idx: int, team_idx: Optional[int]) -> None:
+        self._grow(ordinal)
+        self._assigned[ordinal * MAX_ANSWERS + ans_idx] = 0 if team_idx is None else team_idx + 1
+
+    # strikes
+    def strikes(self, ordinal: int) -> int:
+        return self._strikes[ordinal] if ordinal < len(self._strikes) else 0
+
+    def set_strikes(self, ordinal: int, count: int) -> None:
+        self._grow(ordinal)
+        self._strikes[ordinal] = count
+
+    def clear(self, ordinal: int) -> None:
+        # Forget everything about one question (swapped for another)
+        if ordinal < len(self._strikes):
+            self._revealed[ordinal * MASK_BYTES:(ordinal + 1) * MASK_BYTES] = bytes(MASK_BYTES)
+            self._assigned[ordinal * MAX_ANSWERS:(ordinal + 1) * MAX_ANSWERS] = bytes(MAX_ANSWERS)
+            self._strikes[ordinal] = 0
+
+    # serialization
+    def to_bytes(self) -> bytes:
+        return _HEADER.pack(_MAGIC, len(self._strikes)) + self._revealed + self._assigned + self._strikes
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Board":
+        if len(data) < _HEADER.size:
+            raise ValueError("truncated board")
+        magic, n = _HEADER.unpack_from(data)
+        if magic != _MAGIC or len(data) != _HEADER.size + n * (MASK_BYTES + MAX_ANSWERS + 1):
+            raise ValueError("not a board")
+        board = cls()
+        a = _HEADER.size
+        b = a + n * MASK_BYTES
+        c = b + n * MAX_ANSWERS
+        board._revealed = bytearray(data[a:b])
+        board._assigned = bytearray(data[b:c])
+        board._strikes = bytearray(data[c:])
+        return board
+
+    def __reduce__(self):
+        # pickle / deepcopy (session state, game.defaults) go through the compact form
+        return (Board.from_bytes, (self.to_bytes(),))
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Board) and self.to_bytes() == other.to_bytes()
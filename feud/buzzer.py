@@ -0,0 +1,209 @@
+from collections import deque
+from typing import Any, Deque, Dict, Hashable, List, NamedTuple, Optional, Tuple
+import logging
+import queue
+import threading
+import time
+
+from feud import metrics
+
+log = logging.getLogger(__name__)
+
+# ---------------------------
+# Player buzzers (?room=<id>&view=buzzer&team=<label>), one Buzzer per room
+# ---------------------------
+# Phones reach the buzzers through feud/buzzpad.py's HTTP handler, not through
+# Streamlit reruns. Each press is stamped with time.monotonic_ns() by the
+# handler thread as soon as the request arrives, and goes on one process-wide queue. The arbiter thread
+# is the only writer of buzzer state. It takes everything queued, orders it by
+# stamp and keeps, for each team, the earliest press of the open round. So the
+# result depends on when presses reached the server, not on which of hundreds
+# of session threads the scheduler ran first. A press that reaches the queue
+# after a later-stamped one (the two threads raced between stamp and put) still
+# wins.
+# A round opens when the host's board shows a question (or the host resets the
+# buzzers). Presses stamped before that belonged to the round before and are
+# dropped. Readers (host board, phones) only see the immutable Result the
+# arbiter publishes; `version` tells them when it changed, and wait() blocks
+# until it does. A new game (or going home) forgets the players and bumps `game`.
+PRESS_WAIT_SECONDS = 0.25  # a press waits this long at most for its verdict (normally microseconds)
+LATENCY_SAMPLES = 4096     # recent stamp -> verdict latencies kept for stats()
+
+class Press(NamedTuple):
+    at_ns: int    # time.monotonic_ns() when the server got it
+    team: int     # index into the game's team_labels
+    player: str   # player id (one per phone session)
+    name: str
+
+class Result(NamedTuple):
+    round_no: int               # 0 = no round yet
+    opened_ns: int              # 0 while closed
+    firsts: Tuple[Press, ...]   # earliest press of each team that buzzed, earliest first
+    presses: int                # presses counted this round, repeats included
+
+CLOSED = Result(0, 0, (), 0)
+
+class Buzzer:
+    __slots__ = ("room_id", "version", "result", "key", "game", "players", "_cond")
+
+    def __init__(self, room_id: str):
+        self.room_id = room_id
+        self.version = 0
+        self.result = CLOSED
+        self.key: Optional[Hashable] = None      # what the open round is for (the host's question)
+        self.game = 0                            # bumped by clear(): phones reload on a new game
+        self.players: Dict[str, Tuple[int, str]] = {}  # player -> (team, name)
+        self._cond = threading.Condition()
+
+    # --- host / phones (any thread): only queue commands ---
+    def arm(self, key: Optional[Hashable]) -> None:
+        # Open a round for `key` unless it is the open one; None closes the buzzers
+        if key != self.key:
+            _submit(("arm", time.monotonic_ns(), self, key, None))
+
+    def reset(self) -> None:
+        # A fresh round for the same question
+        _submit(("reset", time.monotonic_ns(), self, None, None))
+
+    def clear(self) -> None:
+        # A new game or home: close the buzzers and forget who joined
+        _submit(("clear", time.monotonic_ns(), self, None, None))
+
+    def join(self, team: int, player: str, name: str) -> None:
+        if self.players.get(player) != (team, name):
+            _submit(("join", time.monotonic_ns(), self, (team, player, name), None))
+
+    def press(self, team: int, player: str, name: str, at: Optional[int] = None,
+              wait: float = PRESS_WAIT_SECONDS) -> Optional[Press]:
+        # Stamped on arrival (`at`, else now), judged by the arbiter; returns the team's first press once decided
+        if at is None:
+            at = time.monotonic_ns()
+        done = threading.Event()
+        _submit(("press", at, self, Press(at, team, player, name), done))
+        done.wait(wait)
+        return self.first(team)
+
+    # --- readers ---
+    def first(self, team: int) -> Optional[Press]:
+        for p in self.result.firsts:
+            if p.team == team:
+                return p
+        return None
+
+    def team_players(self, teams: int) -> List[int]:
+        counts = [0] * teams
+        for team, _name in list(self.players.values()):
+            if 0 <= team < teams:
+                counts[team] += 1
+        return counts
+
+    def wait(self, since: int, timeout: float) -> Tuple[int, Result]:
+        # Phones' long poll: returns as soon as the version passes `since`, else after `timeout`
+        with self._cond:
+            self._cond.wait_for(lambda: self.version > since, timeout)
+            return self.version, self.result
+
+    # --- arbiter thread only ---
+    def _publish(self, result: Result) -> None:
+        with self._cond:
+            self.result = result
+            self.version += 1
+            self._cond.notify_all()
+
+# ---------------------------
+# Arbiter (single writer)
+# ---------------------------
+Command = Tuple[str, int, Buzzer, Any, Optional[threading.Event]]  # kind, stamp, buzzer, payload, done
+
+_QUEUE: "queue.SimpleQueue[Command]" = queue.SimpleQueue()
+_LATENCY: Deque[int] = deque(maxlen=LATENCY_SAMPLES)  # ns from stamp to verdict
+_STATS = {"presses": 0, "dropped": 0, "rounds": 0}
+_arbiter: Optional[threading.Thread] = None
+_START_LOCK = threading.Lock()
+
+metrics.register_counter("feud_buzzer_presses_total", "Buzzer presses judged.", lambda: _STATS["presses"])
+metrics.register_counter("feud_buzzer_dropped_total", "Buzzer presses dropped (closed or an earlier round).",
+                         lambda: _STATS["dropped"])
+
+def _submit(cmd: Command) -> None:
+    if _arbiter is None:
+        _start()
+    _QUEUE.put(cmd)
+
+def _start() -> None:
+    global _arbiter
+    with _START_LOCK:
+        if _arbiter is None:
+            _arbiter = threading.Thread(target=_arbitrate, name="feud-buzzer", daemon=True)
+            _arbiter.start()
+
+def _apply(cmd: Command, pending: Dict[Buzzer, Result]) -> None:
+    kind, at, buzzer, payload, _done = cmd
+    current = pending.get(buzzer, buzzer.result)
+    if kind == "press":
+        press: Press = payload
+        if not current.opened_ns or at < current.opened_ns:
+            _STATS["dropped"] += 1
+            return
+        _STATS["presses"] += 1
+        firsts = list(current.firsts)
+        mine = next((i for i, p in enumerate(firsts) if p.team == press.team), None)
+        if mine is None or press.at_ns < firsts[mine].at_ns:
+            if mine is not None:
+                del firsts[mine]
+            firsts.append(press)
+            firsts.sort()
+        pending[buzzer] = current._replace(firsts=tuple(firsts), presses=current.presses + 1)
+    elif kind == "arm" or kind == "reset":
+        if kind == "arm":
+            if payload == buzzer.key:
+                return
+            buzzer.key = payload
+        if buzzer.key is None:
+            pending[buzzer] = CLOSED._replace(round_no=current.round_no)
+        else:
+            _STATS["rounds"] += 1
+            pending[buzzer] = Result(current.round_no + 1, at, (), 0)
+    elif kind == "clear":
+        buzzer.key = None
+        buzzer.game += 1
+        buzzer.players.clear()
+        pending[buzzer] = CLOSED._replace(round_no=current.round_no)
+    elif kind == "join":
+        team, player, name = payload
+        buzzer.players[player] = (team, name)
+
+def _arbitrate() -> None:
+    while True:
+        batch = [_QUEUE.get()]
+        while True:
+            try:
+                batch.append(_QUEUE.get_nowait())
+            except queue.Empty:
+                break
+        batch.sort(key=lambda cmd: cmd[1])
+        pending: Dict[Buzzer, Result] = {}
+        for cmd in batch:
+            try:
+                _apply(cmd, pending)
+            except Exception:
+                log.warning("buzzer command %s failed", cmd[0], exc_info=True)
+        for buzzer, result in pending.items():
+            buzzer._publish(result)
+        now = time.monotonic_ns()
+        for kind, at, _buzzer, _payload, done in batch:
+            if kind == "press":
+                _LATENCY.append(now - at)
+                if metrics.ENABLED:
+                    metrics.observe("buzzer.verdict", (now - at) / 1e9)
+            if done is not None:
+                done.set()
+
+def stats() -> Dict[str, Any]:
+    # Counters plus verdict latency percentiles (microseconds) over recent presses
+    lat = sorted(_LATENCY)
+
+    def pct(q: float) -> Optional[float]:
+        return round(lat[min(len(lat) - 1, int(q / 100 * len(lat)))] / 1000, 1) if lat else None
+
+    return dict(_STATS, queued=_QUEUE.qsize(), verdict_p50_us=pct(50), verdict_p99_us=pct(99))
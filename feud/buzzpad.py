@@ -0,0 +1,211 @@
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, urlsplit
+import json
+import logging
+import os
+import threading
+import time
+
+import streamlit.components.v1 as components
+
+from feud.rooms import ROOMS, Room
+
+# ---------------------------
+# Phone buzz pad (custom component) and its HTTP handler
+#
+#   FEUD_BUZZER_PORT=8502       port of the phones' buzzer handler (0 = off, and so are phone buzzers)
+#   FEUD_BUZZER_URL=            its address as phones see it (default: the app's host name on that port)
+#   FEUD_BUZZER_MAX_POLLS=500   long polls held at once; more are told to come back later
+#
+# A phone's Streamlit session only draws the page (team, name) and mounts the
+# pad (buzzpad_frontend/index.html); while the game runs it does not rerun at
+# all. The pad talks to a small ThreadingHTTPServer in this process instead:
+#
+#   GET  /state?room=&pad=&team=&player=&game=&since=  long poll: answers as soon as the room's
+#                                                      buzzer changes (else after HOLD_SECONDS)
+#   POST /press  room, pad, team, player, game         stamped on arrival, answers after the verdict
+#
+# Both answer with the pad's view (view()). A waiting phone costs a blocked
+# thread, not a script rerun a second; past MAX_POLLS a poll gets 503 and a
+# retry_ms at once instead. When the view's `game` is not the one the page was
+# drawn for (a new game, home, the room appeared or was dropped), the pad sets
+# its value and the page reruns once.
+#
+# `pad` is the room's pad key from the buzzer link (feud/rooms.py); without it
+# both answer 403. A press only counts for a player id the phone's page joined
+# to that team (Buzzer.join), under the name it joined with. Browsers may only
+# call the handler from the app's own origin, as phone pages saw it
+# (allow_origin); requests without an Origin header are not from a page.
+# ---------------------------
+PORT = int(os.environ.get("FEUD_BUZZER_PORT", "8502"))
+URL = os.environ.get("FEUD_BUZZER_URL", "").rstrip("/")
+HOLD_SECONDS = 20.0        # a long poll answers at least this often (proxies drop idle requests)
+MISSING_ROOM_SECONDS = 5.0  # ...and this often for a room that is not open (yet)
+MAX_POLLS = max(1, int(os.environ.get("FEUD_BUZZER_MAX_POLLS", "500")))
+BUSY_RETRY_MS = 3000        # ...and a poll over that cap comes back after this
+MAX_BODY = 1024
+MAX_ORIGINS = 16
+
+KEY = "buzzpad"
+_FRONTEND = os.path.join(os.path.dirname(os.path.abspath(__file__)), "buzzpad_frontend")
+_component = components.declare_component("feud_buzzpad", path=_FRONTEND)
+
+_LOG = logging.getLogger(__name__)
+
+_origins: "OrderedDict[str, None]" = OrderedDict()  # most recently seen last
+_polls = threading.BoundedSemaphore(MAX_POLLS)
+_LOCK = threading.Lock()
+
+def buzzpad(room_id: str, pad: str, team: int, player: str, game: int) -> None:
+    # team -1: nothing to press (waiting page), the pad only watches for the game to start
+    _component(url=URL, port=PORT, room=room_id, pad=pad, team=team, player=player, game=game,
+               key=KEY, default=None)
+
+def allow_origin(url: Optional[str]) -> None:
+    # A phone page's URL (st.context.url): its origin is where the pads' requests come from
+    parts = urlsplit(url or "")
+    if parts.scheme in ("http", "https") and parts.netloc:
+        origin = f"{parts.scheme}://{parts.netloc}"
+        with _LOCK:
+            _origins[origin] = None
+            _origins.move_to_end(origin)
+            while len(_origins) > MAX_ORIGINS:
+                _origins.popitem(last=False)
+
+def view(room: Optional[Room], team: int, player: str) -> Dict[str, Any]:
+    # What a phone of `team` shows: open or not, and who of its team buzzed first
+    if room is None:
+        return {"v": 0, "game": -1, "open": False, "kind": "", "text": ""}
+    buzzer = room.buzzer
+    version, game, result = buzzer.version, buzzer.game, buzzer.result  # the version first: never newer than result
+    out = {"v": version, "game": game, "open": bool(result.opened_ns), "kind": "info", "text": ""}
+    labels = room.state.team_names
+    if not (room.state.started and room.state.buzzers) or not 0 <= team < len(labels):
+        out["open"] = False
+        return out
+    if not result.opened_ns:
+        out["text"] = "Buzzers open when the host shows a question."
+        return out
+    mine = buzzer.first(team)
+    if mine is None:
+        out["text"] = f"Round {result.round_no}: buzz to answer for Team {labels[team]}!"
+        return out
+    lead = result.firsts[0]
+    who = "You" if mine.player == player else mine.name
+    if lead.team == team:
+        out.update(kind="success", text=f"⚡ {who} buzzed first!")
+    else:
+        out.update(kind="warning", text=f"{who} buzzed for Team {labels[team]}, {(mine.at_ns - lead.at_ns) / 1e6:.0f} ms "
+                                        f"after Team {labels[lead.team]}.")
+    return out
+
+def _int(value: Optional[str], default: int = -1) -> int:
+    try:
+        return int(value) if value is not None else default
+    except ValueError:
+        return default
+
+class _PadHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # phones keep their connection between polls
+    timeout = 2 * HOLD_SECONDS     # ...and an idle one is closed
+    received_ns = 0
+
+    def parse_request(self):
+        # Runs as soon as the request line is in: a press's stamp, before its headers and body
+        self.received_ns = time.monotonic_ns()
+        return super().parse_request()
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path != "/state":
+            self._reply(404, {"error": "not found"})
+            return
+        if not self._origin_allowed():
+            return
+        q = dict(parse_qsl(url.query))
+        if not _polls.acquire(blocking=False):
+            self._reply(503, {"error": "busy", "retry_ms": BUSY_RETRY_MS})
+            return
+        try:
+            room = ROOMS.get(q.get("room"))
+            if room is None:
+                time.sleep(MISSING_ROOM_SECONDS)
+                room = ROOMS.get(q.get("room"))
+            if room is not None and not room.is_pad(q.get("pad")):
+                self._reply(403, {"error": "not a buzzer link of this room"})
+                return
+            if room is not None and _int(q.get("game")) == room.buzzer.game:  # a stale game answers at once
+                room.buzzer.wait(_int(q.get("since"), 0), HOLD_SECONDS)
+        finally:
+            _polls.release()
+        self._reply(200, view(room, _int(q.get("team")), q.get("player", "")))
+
+    def do_POST(self):
+        if urlsplit(self.path).path != "/press":
+            self._reply(404, {"error": "not found"})
+            return
+        if not self._origin_allowed():
+            return
+        length = min(_int(self.headers.get("Content-Length"), 0), MAX_BODY)
+        form = dict(parse_qsl(self.rfile.read(max(0, length)).decode("utf-8", "replace")))
+        room = ROOMS.get(form.get("room"))
+        if room is not None and not room.is_pad(form.get("pad")):
+            self._reply(403, {"error": "not a buzzer link of this room"})
+            return
+        team, player = _int(form.get("team")), form.get("player", "")
+        joined = room.buzzer.players.get(player) if room is not None else None
+        if joined is not None and joined[0] == team and _int(form.get("game")) == room.buzzer.game \
+                and room.state.started and room.state.buzzers and 0 <= team < room.state.num_teams:
+            room.buzzer.press(team, player, joined[1], at=self.received_ns)
+        self._reply(200, view(room, team, player))
+
+    def _origin_allowed(self) -> bool:
+        origin = self.headers.get("Origin")
+        if origin is None or origin in _origins:
+            return True
+        self.close_connection = True  # a press's body is left unread
+        self._reply(403, {"error": "origin not allowed"})
+        return False
+
+    def _reply(self, status: int, body: Dict[str, Any]) -> None:
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        origin = self.headers.get("Origin")
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.send_header("Cache-Control", "no-store")
+            if origin in _origins:  # the pad's frame is on the app's port, not this one
+                self.send_header("Access-Control-Allow-Origin", origin)
+                self.send_header("Vary", "Origin")
+            self.end_headers()
+            self.wfile.write(data)
+        except OSError:
+            self.close_connection = True  # the phone went away while its poll waited
+
+    def log_message(self, *args):
+        pass
+
+class _PadServer(ThreadingHTTPServer):
+    request_queue_size = 512  # a room's phones all connect at once on their first press
+
+_running: Optional[bool] = None
+
+def ensure_started() -> bool:
+    # Called by every phone page; starts the handler once per process. False when it is off or could not start
+    global _running
+    if _running is not None:
+        return _running
+    with _LOCK:
+        if _running is None:
+            _running = False
+            if PORT:
+                try:
+                    server = _PadServer(("0.0.0.0", PORT), _PadHandler)
+                    threading.Thread(target=server.serve_forever, name="feud-buzzpad", daemon=True).start()
+                    _running = True
+                except OSError as exc:
+                    _LOG.warning("Buzzer handler not started on port %s: %s", PORT, exc)
+    return _running
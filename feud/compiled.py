@@ -0,0 +1,126 @@
+from typing import Any, Dict, List, Tuple
+import hashlib
+import json
+import os
+import struct
+
+from feud.bank import Answer, Question, RawRound, parse_rounds
+from feud.library import Library, Span
+
+# ---------------------------
+# Precompiled question banks (.feudb, written by tools/compile_bank.py)
+# ---------------------------
+# A JSON bank has to be indexed (and validated) the first time a process opens
+# it. A compiled bank is laid out so that opening it only reads its header:
+#
+#   header    magic "FFQB", version, source sha256, round count, question count
+#   rounds    per round: title length, tiebreaker flag, question count, title (UTF-8)
+#   offsets   question count + 1 offsets, question i spans offsets[i]..offsets[i+1]
+#   records   per question: prompt length, answer count, prompt,
+#             then per answer: points, text length, text
+#
+# All integers are little-endian. The bank's digest is the sha256 of the JSON it
+# was compiled from, so journals recorded against either file replay the same.
+MAGIC = b"FFQB"
+VERSION = 1
+SUFFIX = ".feudb"
+
+_HEADER = struct.Struct("<4sHH32sII")  # magic, version, reserved, source digest, rounds, questions
+_ROUND = struct.Struct("<HBI")         # title bytes, tiebreaker, questions
+_QUESTION = struct.Struct("<IB")       # prompt bytes, answers
+_ANSWER = struct.Struct("<iI")         # points, text bytes
+
+def is_compiled(buf) -> bool:
+    return buf[:len(MAGIC)] == MAGIC
+
+# ---------------------------
+# Writing
+# ---------------------------
+def _record(q: Dict[str, Any]) -> bytes:
+    prompt = q["prompt"].encode("utf-8")
+    parts = [_QUESTION.pack(len(prompt), len(q["answers"])), prompt]
+    for a in q["answers"]:
+        text = a["text"].encode("utf-8")
+        parts += [_ANSWER.pack(a["points"], len(text)), text]
+    return b"".join(parts)
+
+def compile_rounds_to_bytes(rounds: List[RawRound], source_digest: str) -> bytes:
+    # Raises struct.error for values the format cannot hold (points beyond 32 bits)
+    table: List[bytes] = []
+    records: List[bytes] = []
+    for r in rounds:
+        title = r["title"].encode("utf-8")
+        table += [_ROUND.pack(len(title), bool(r.get("tiebreaker", False)), len(r["questions"])), title]
+        records += [_record(q) for q in r["questions"]]
+
+    head = _HEADER.pack(MAGIC, VERSION, 0, bytes.fromhex(source_digest), len(rounds), len(records))
+    pos = len(head) + sum(len(t) for t in table) + 4 * (len(records) + 1)
+    offsets = [pos]
+    for rec in records:
+        pos += len(rec)
+        offsets.append(pos)
+    return head + b"".join(table) + struct.pack(f"<{len(offsets)}I", *offsets) + b"".join(records)
+
+def compile_file(src: str, dst: str) -> Dict[str, Any]:
+    # JSON bank -> compiled bank, replaced atomically; the caller validates `src` first
+    with open(src, "rb") as f:
+        data = f.read()
+    rounds = parse_rounds(json.loads(data))
+    out = compile_rounds_to_bytes(rounds, hashlib.sha256(data).hexdigest())
+    tmp = f"{dst}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(out)
+    os.replace(tmp, dst)
+    return {
+        "rounds": len(rounds),
+        "questions": sum(len(r["questions"]) for r in rounds),
+        "json_bytes": len(data),
+        "bytes": len(out),
+    }
+
+# ---------------------------
+# Reading
+# ---------------------------
+def _decode_record(buf, span: Span) -> Question:
+    pos, end = span
+    plen, n = _QUESTION.unpack_from(buf, pos)
+    pos += _QUESTION.size
+    prompt = buf[pos:pos + plen].decode("utf-8")
+    pos += plen
+    answers = []
+    for _ in range(n):
+        points, tlen = _ANSWER.unpack_from(buf, pos)
+        pos += _ANSWER.size
+        answers.append(Answer(buf[pos:pos + tlen].decode("utf-8"), points))
+        pos += tlen
+    if pos != end:
+        raise ValueError(f"corrupt question record at byte {span[0]}")
+    return Question(prompt, tuple(answers))
+
+def open_compiled(path: str, buf) -> Library:
+    # Reads the header and round table only; raises ValueError for damaged files
+    try:
+        _, version, _, digest, n_rounds, n_questions = _HEADER.unpack_from(buf, 0)
+        if version != VERSION:
+            raise ValueError(f"compiled bank version {version} (this app reads {VERSION}); recompile it")
+        pos = _HEADER.size
+        rounds: List[Tuple[str, bool, int]] = []
+        for _ in range(n_rounds):
+            tlen, tiebreaker, count = _ROUND.unpack_from(buf, pos)
+            pos += _ROUND.size
+            rounds.append((buf[pos:pos + tlen].decode("utf-8"), bool(tiebreaker), count))
+            pos += tlen
+        offsets = struct.unpack_from(f"<{n_questions + 1}I", buf, pos)
+    except (struct.error, UnicodeDecodeError) as e:
+        raise ValueError(f"damaged compiled bank: {e}") from None
+    if sum(r[2] for r in rounds) != n_questions or offsets[-1] != len(buf) \
+            or any(a > b for a, b in zip(offsets, offsets[1:])):
+        raise ValueError("damaged compiled bank: offsets do not match the file")
+
+    index = []
+    first = 0
+    for title, tiebreaker, count in rounds:
+        spans = [(offsets[i], offsets[i + 1]) for i in range(first, first + count)]
+        index.append({"title": title, "tiebreaker": tiebreaker, "spans": spans})
+        first += count
+    return Library(path, digest.hex(), index, buf, decode=_decode_record)
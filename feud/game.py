@@ -0,0 +1,273 @@
+from types import SimpleNamespace
+from typing import List, Dict, Optional, Sequence, Any
+import base64
+import copy
+
+from feud.bank import QuestionBank, Question, Round
+from feud.board import Board
+from feud.ledger import ScoreLedger
+
+# ---------------------------------
+# Game state
+# ---------------------------------
+# The transitions below work on any object with attribute access: a room's
+# state while playing, or a plain namespace when replaying a journal.
+defaults: Dict[str, Any] = {
+    "started": False,
+    "finished": False,
+    "team_names": [],  # frozen team labels for the whole game
+
+    # rounds
+    "screen": "home",        # home | round_intro | question | results_wait| final
+    "round_index": 0,
+    "q_in_round": 0,
+    "bank_path": None,        # question bank this game plays (None = the server default)
+    "bank_digest": None,      # ...and its version: the game stays on it until go_home (bank.pinned_bank)
+    "round_selection": None,  # bank round indices this game plays (None = all of them)
+
+    # teams
+    "num_teams": 2,
+    "ledger": ScoreLedger(),  # awards, per-round subtotals and ranking (feud/ledger.py)
+
+    # per-question reveals, assignments and strikes, by question ordinal (feud/board.py)
+    "board": Board(),
+    # questions the host swapped in: question ordinal -> ordinal in the whole bank
+    "swaps": {},
+
+    # strike overlay
+    "strike_shown": 0,
+    "strike_nonce": 0,
+    "strike_hide_at": 0.0,
+    "tiebreaker_used": False,
+    "buzzers": False,  # players buzz from their phones (feud/buzzer.py)
+
+}
+
+def new_state() -> SimpleNamespace:
+    return SimpleNamespace(**copy.deepcopy(defaults))
+
+MAX_STRIKES = 3
+STRIKE_SECONDS = 2.0  # keep in sync with the strikeOut animation
+
+# ---------------------------
+# Helpers
+# ---------------------------
+def clamp(n, mn, mx): return max(mn, min(n, mx))
+
+def positional_labels(n: int, numbers: bool = False) -> List[str]:
+    # Default team labels: A, B, C... or 1, 2, 3...
+    return [str(i + 1) if numbers else chr(ord("A") + i) for i in range(min(n, 26))]
+
+def is_named(label: str, team_idx: int) -> bool:
+    # A team the host gave a name, rather than its positional label in either mode
+    return label not in (chr(ord("A") + team_idx), str(team_idx + 1))
+
+def game_bank(s, bank: QuestionBank) -> QuestionBank:
+    # The rounds this game was started with; round_index counts within them
+    selection = getattr(s, "round_selection", None)
+    return bank.subset(selection) if selection else bank
+
+def current_round(s, bank: QuestionBank) -> Round:
+    return bank.round(s.round_index)
+
+def round_questions(s, bank: QuestionBank) -> Sequence[Question]:
+    return bank.questions(s.round_index)
+
+def slot_question(bank: QuestionBank, swaps: Dict[int, int], round_index: int, q_in_round: int) -> Question:
+    # The question a slot shows: the bank's, unless the host swapped another one in
+    src = swaps.get(bank.ordinal(round_index, q_in_round))
+    if src is not None:
+        return bank.whole().question_at(src)
+    return bank.question(round_index, q_in_round)
+
+def current_question(s, bank: QuestionBank) -> Question:
+    return slot_question(bank, s.swaps, s.round_index, s.q_in_round)
+
+def top_is_tied(s) -> bool:
+    return s.ledger.top_is_tied()
+
+def current_ordinal(s, bank: QuestionBank) -> int:
+    # The current question's slot in s.board
+    return bank.ordinal(s.round_index, s.q_in_round)
+
+# ---------------------------
+# Transitions
+# ---------------------------
+def start_game(s, num_teams: int, team_names: List[str], round_selection: Optional[List[int]] = None,
+               bank_path: Optional[str] = None, bank_digest: Optional[str] = None, buzzers: bool = False):
+    s.num_teams = clamp(int(num_teams), 1, 15)
+    s.buzzers = bool(buzzers)
+    s.bank_path = bank_path
+    s.bank_digest = bank_digest or None
+    s.round_selection = list(round_selection) if round_selection else None
+
+    s.team_names = list(team_names)
+    s.ledger = ScoreLedger(s.num_teams)
+
+    s.round_index = 0
+    s.q_in_round = 0
+    s.board = Board()
+    s.swaps = {}
+
+    s.finished = False
+    s.started = True
+    s.screen = "round_intro"
+    s.tiebreaker_used = False
+
+def go_prev(s, bank: QuestionBank):
+    if s.screen == "question":
+        if s.q_in_round > 0:
+            s.q_in_round -= 1
+            return
+        s.screen = "round_intro"
+        return
+
+    if s.screen == "round_intro":
+        prv = bank.prev_round[s.round_index]
+        if prv is not None:
+            s.round_index = prv
+            s.q_in_round = max(0, len(round_questions(s, bank)) - 1)
+            s.screen = "question"
+            return
+
+def _enter_round(s, idx: int):
+    s.round_index = idx
+    s.q_in_round = 0
+    s.screen = "round_intro"
+
+def go_next(s, bank: QuestionBank):
+    if s.screen == "round_intro":
+        s.screen = "question"
+        return
+
+    if s.screen != "question":
+        return
+
+    if s.q_in_round < len(round_questions(s, bank)) - 1:
+        s.q_in_round += 1
+        return
+
+    # end of round: NORMAL progression skips tiebreakers
+    nxt = bank.next_round[s.round_index]
+    if nxt is not None:
+        _enter_round(s, nxt)
+        return
+
+    # After the last normal round (or a tiebreaker), a tied top goes to the next
+    # sudden-death round in the chain; otherwise on to the results
+    tb_idx = bank.next_tiebreaker[s.round_index]
+    if tb_idx is not None and top_is_tied(s):
+        s.tiebreaker_used = True
+        _enter_round(s, tb_idx)
+        return
+
+    s.finished = True
+    s.screen = "results_wait"
+
+def show_final(s):
+    s.screen = "final"
+
+def go_home(s):
+    for k, v in copy.deepcopy(defaults).items():
+        setattr(s, k, v)
+
+def assign_team(s, bank: QuestionBank, ans_idx: int, team_idx: Optional[int]):
+    o = current_ordinal(s, bank)
+    pts = current_question(s, bank).answers[ans_idx].points
+
+    s.ledger.withdraw(o, ans_idx)
+    s.board.assign(o, ans_idx, team_idx)
+    if team_idx is not None:
+        s.ledger.record(o, ans_idx, team_idx, s.round_index, pts)
+
+    s.board.reveal(o, ans_idx)
+
+def reveal_only(s, bank: QuestionBank, ans_idx: int):
+    o = current_ordinal(s, bank)
+
+    if s.ledger.withdraw(o, ans_idx) is not None:
+        s.board.assign(o, ans_idx, None)
+
+    s.board.reveal(o, ans_idx)
+
+def trigger_strike(s, bank: QuestionBank, now: float):
+    o = current_ordinal(s, bank)
+    count = min(MAX_STRIKES, s.board.strikes(o) + 1)
+    s.board.set_strikes(o, count)
+    s.strike_shown = count
+    s.strike_nonce = s.strike_nonce + 1
+    s.strike_hide_at = now + STRIKE_SECONDS
+
+def swap_question(s, bank: QuestionBank, source: int):
+    # Put question `source` (an ordinal in the whole bank) in the current slot.
+    # The slot starts over: its awards are taken back, reveals and strikes cleared.
+    if s.screen != "question":
+        return
+    o = current_ordinal(s, bank)
+    for ans_idx in range(len(current_question(s, bank).answers)):
+        s.ledger.withdraw(o, ans_idx)
+    s.board.clear(o)
+    s.strike_hide_at = 0.0
+    if source == bank.source_ordinal(s.round_index, s.q_in_round):
+        s.swaps.pop(o, None)
+    else:
+        s.swaps[o] = source
+
+# ---------------------------
+# Events: every transition as a compact list, e.g. ["assign_team", 3, 1]
+# ---------------------------
+Event = List[Any]
+
+def apply_event(s, bank: QuestionBank, event: Event, now: float = 0.0) -> None:
+    # `bank` is the whole bank; events after start_game run on the game's rounds
+    kind, args = event[0], event[1:]
+    if kind == "start_game":
+        meta = args[2] if len(args) > 2 else {}
+        start_game(s, args[0], args[1], meta.get("rounds"), meta.get("bank"), meta.get("digest"),
+                   meta.get("buzzers", False))
+        return
+    bank = game_bank(s, bank)
+    if kind == "go_next":
+        go_next(s, bank)
+    elif kind == "go_prev":
+        go_prev(s, bank)
+    elif kind == "assign_team":
+        assign_team(s, bank, args[0], args[1])
+    elif kind == "reveal_only":
+        reveal_only(s, bank, args[0])
+    elif kind == "strike":
+        trigger_strike(s, bank, now)
+    elif kind == "swap_question":
+        swap_question(s, bank, args[0])
+    elif kind == "show_final":
+        show_final(s)
+    elif kind == "go_home":
+        go_home(s)
+    else:
+        raise ValueError(f"unknown event {kind!r}")
+
+def state_to_dict(s) -> Dict[str, Any]:
+    # JSON-friendly: the board is stored as base64 of Board.to_bytes(), the
+    # ledger as its award list, swaps as [ordinal, source] pairs
+    out: Dict[str, Any] = {}
+    for k, default in defaults.items():
+        v = getattr(s, k, default)
+        if k == "board":
+            v = base64.b64encode(v.to_bytes()).decode("ascii")
+        elif k == "ledger":
+            v = v.to_list()
+        elif k == "swaps":
+            v = sorted(v.items())
+        out[k] = v
+    return out
+
+def state_from_dict(s, data: Dict[str, Any]) -> None:
+    # Raises (before touching `s`) for snapshots without a readable board or
+    # ledger, e.g. ones written before them; the journal then replays its log
+    parsed = {
+        "board": Board.from_bytes(base64.b64decode(data["board"])),
+        "ledger": ScoreLedger.from_list(data["ledger"]),
+        "swaps": {int(o): int(src) for o, src in data.get("swaps", [])},
+    }
+    for k, v in copy.deepcopy(defaults).items():
+        setattr(s, k, parsed[k] if k in parsed else data.get(k, v))
@@ -0,0 +1,41 @@
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+import os
+
+import streamlit.components.v1 as components
+
+# ---------------------------
+# Host keyboard controller (custom component)
+# ---------------------------
+# The frontend (hotkeys_frontend/index.html) is mounted once per host page under
+# a fixed key and stays mounted across reruns: new arguments reach it as render
+# messages, and every key press comes back as one component value
+# [seq, kind, *args], handled by an on_change callback before the rerun.
+#
+#   1-9, 0     reveal answer 1-10 (and pick it for assigning)
+#   A-O        give the picked answer to the 1st-15th team
+#   X          strike (E too while there are fewer than 5 teams)
+#   Right/Left next / previous; Right or Enter continues on the intro and results screens
+#   Esc        drop the picked answer
+KEY = "hotkeys"
+_FRONTEND = os.path.join(os.path.dirname(os.path.abspath(__file__)), "hotkeys_frontend")
+_component = components.declare_component("feud_hotkeys", path=_FRONTEND)
+
+# key press kind -> number of integer arguments
+KINDS = {"reveal": 1, "assign": 2, "strike": 0, "next": 0, "prev": 0}
+
+def hotkeys(screen: str, question: Optional[int], answers: int, teams: Sequence[str],
+            on_key: Callable[[], None]) -> None:
+    # `question` only has to change when the question on screen does
+    _component(screen=screen, question=question, answers=answers, teams=list(teams),
+               key=KEY, default=None, on_change=on_key)
+
+def parse(value: Any) -> Optional[Tuple[str, List[int]]]:
+    # The last key press as (kind, args); None for anything malformed
+    if not isinstance(value, list) or len(value) < 2:
+        return None
+    kind, args = value[1], value[2:]
+    if kind not in KINDS or len(args) != KINDS[kind]:
+        return None
+    if not all(isinstance(a, int) and not isinstance(a, bool) and a >= 0 for a in args):
+        return None
+    return kind, args
@@ -0,0 +1,180 @@
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+import json
+import logging
+import os
+import threading
+
+from feud.bank import QuestionBank
+from feud.game import Event, apply_event, go_home, state_to_dict, state_from_dict
+
+# ---------------------------
+# Game journal: append-only event log + periodic snapshots per game id
+#
+#   <dir>/<game_id>.log   one compact JSON event per line
+#   <dir>/<game_id>.snap  {"seq": n, "offset": bytes, "state": {...}, "keys": {...}} (atomic replace)
+#   <dir>/<game_id>.rejected  log lines replay could not apply (kept aside, see restore)
+#
+# Restoring loads the snapshot and replays only the events after its offset,
+# so resume time is bounded by SNAPSHOT_EVERY, not by the game length.
+# The snapshot also keeps the game's secrets (`keys`, e.g. the room's host key):
+# while they are not on disk yet, the next event writes one, so a restart never loses them.
+# ---------------------------
+DATA_DIR = os.environ.get("FEUD_DATA_DIR", "data")
+JOURNAL_DIR = os.path.join(DATA_DIR, "journal")
+SNAPSHOT_EVERY = 100
+# What a journaled event raises when it no longer applies: corrupt JSON, an
+# unknown event, or indices the (edited) bank does not have
+REPLAY_ERRORS = (ValueError, IndexError, KeyError, TypeError)
+
+_LOG = logging.getLogger(__name__)
+
+def _dumps(obj: Any) -> str:
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+def read_events(log_path: str, offset: int = 0) -> Iterator[Event]:
+    # Stops at a torn last line (crash in the middle of a write)
+    with open(log_path, "rb") as f:
+        f.seek(offset)
+        for raw in f:
+            if not raw.endswith(b"\n"):
+                return
+            yield json.loads(raw)
+
+class GameJournal:
+    def __init__(self, game_id: str, directory: str = JOURNAL_DIR, snapshot_every: int = SNAPSHOT_EVERY):
+        self.game_id = game_id
+        self.log_path = os.path.join(directory, f"{game_id}.log")
+        self.snap_path = os.path.join(directory, f"{game_id}.snap")
+        self.rejected_path = os.path.join(directory, f"{game_id}.rejected")
+        self.snapshot_every = snapshot_every
+        self.enabled = True
+        self.seq = 0
+        self.keys: Dict[str, str] = {}
+        self._keys_saved = False
+        self._since_snapshot = 0
+        self._fh = None
+        self._lock = threading.Lock()
+        try:
+            os.makedirs(directory, exist_ok=True)
+        except OSError as exc:
+            self._disable(exc)
+
+    def _disable(self, exc: Exception) -> None:
+        # A read-only or full disk must never break the game itself
+        _LOG.warning("Game journal disabled for %s: %s", self.game_id, exc)
+        self.enabled = False
+
+    def _file(self):
+        if self._fh is None:
+            self._fh = open(self.log_path, "ab")
+        return self._fh
+
+    def append(self, event: Event, state=None) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            try:
+                fh = self._file()
+                fh.write((_dumps(event) + "\n").encode("utf-8"))
+                fh.flush()
+                self.seq += 1
+                self._since_snapshot += 1
+                if state is not None and (self._since_snapshot >= self.snapshot_every
+                                          or (self.keys and not self._keys_saved)):
+                    self._write_snapshot(state)
+            except OSError as exc:
+                self._disable(exc)
+
+    def snapshot(self, state) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            try:
+                self._write_snapshot(state)
+            except OSError as exc:
+                self._disable(exc)
+
+    def _write_snapshot(self, state) -> None:
+        offset = self._file().tell()
+        tmp = self.snap_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(_dumps({"seq": self.seq, "offset": offset, "state": state_to_dict(state), "keys": self.keys}))
+        os.replace(tmp, self.snap_path)
+        self._since_snapshot = 0
+        self._keys_saved = True
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+
+    def restore(self, state, bank_for: Callable[[Any], QuestionBank]) -> bool:
+        # Loads the latest snapshot into `state` and replays the tail of the log;
+        # bank_for(state) gives the game's bank (it can change at each start_game).
+        # Replay stops at the first event that does not apply (a corrupt line, or
+        # an answer the edited bank no longer has): the game resumes from just
+        # before it and the rest of the log is moved to <game_id>.rejected.
+        if not self.enabled or not os.path.exists(self.log_path):
+            return False
+        with self._lock:
+            offset, seq = self._load_snapshot(state)
+            good_offset, tail, failure = self._replay(state, bank_for, offset)
+            if failure is not None:
+                _LOG.warning("Game journal %s: event at byte %d does not apply (%s); resuming before it",
+                             self.game_id, good_offset, failure)
+                # The failed event may have half-changed `state`: rebuild it up to the event before
+                go_home(state)
+                self._load_snapshot(state)
+                self._replay(state, bank_for, offset, good_offset)
+                self._set_aside(good_offset)
+            # Drop a torn last line (or the rejected tail) so new events start on a clean line
+            if good_offset < os.path.getsize(self.log_path):
+                with open(self.log_path, "r+b") as f:
+                    f.truncate(good_offset)
+
+            self.seq = seq + tail
+            self._since_snapshot = tail
+            return seq + tail > 0
+
+    def _load_snapshot(self, state) -> Tuple[int, int]:
+        # (log offset, seq) the snapshot covers; (0, 0) without a usable one.
+        # Saved keys replace the ones set before restore
+        try:
+            with open(self.snap_path, "r", encoding="utf-8") as f:
+                snap = json.load(f)
+            state_from_dict(state, snap["state"])
+            keys = snap.get("keys")
+            if isinstance(keys, dict) and keys:
+                self._keys_saved = self.keys.keys() <= keys.keys()  # else the new ones go out with the next event
+                self.keys.update((str(k), str(v)) for k, v in keys.items())
+            return int(snap["offset"]), int(snap["seq"])
+        except (OSError, ValueError, KeyError):
+            return 0, 0
+
+    def _replay(self, state, bank_for: Callable[[Any], QuestionBank], offset: int,
+                stop: Optional[int] = None) -> Tuple[int, int, Optional[Exception]]:
+        # Applies the complete lines from `offset` (up to `stop`); returns the offset
+        # after the last applied event, how many were applied and what stopped it
+        good_offset, tail = offset, 0
+        with open(self.log_path, "rb") as f:
+            f.seek(offset)
+            for raw in f:
+                if not raw.endswith(b"\n") or (stop is not None and good_offset >= stop):
+                    break
+                try:
+                    apply_event(state, bank_for(state), json.loads(raw))
+                except REPLAY_ERRORS as exc:
+                    return good_offset, tail, exc
+                good_offset += len(raw)
+                tail += 1
+        return good_offset, tail, None
+
+    def _set_aside(self, offset: int) -> None:
+        # Keep what replay could not apply next to the log, for a look by hand
+        try:
+            with open(self.log_path, "rb") as src, open(self.rejected_path, "ab") as dst:
+                src.seek(offset)
+                dst.write(src.read())
+        except OSError as exc:
+            _LOG.warning("Game journal %s: could not keep the rejected events: %s", self.game_id, exc)
@@ -0,0 +1,57 @@
+from typing import Any, Callable, Tuple
+import json
+import re
+
+# ---------------------------
+# Positional JSON walking
+# ---------------------------
+# Walks a JSON document held as text by hand, container by container, and reads
+# every value with json's C scanner, which validates it and returns where it
+# ended. Used to index question files (feud/library.py) and to report problems
+# with their line and column (feud/validate.py). Positions are str indices.
+_WS = re.compile(r"[ \t\r\n]*")
+_scan_once = json.JSONDecoder().scan_once
+
+def skip_ws(text: str, pos: int) -> int:
+    return _WS.match(text, pos).end()
+
+def read_value(text: str, pos: int) -> Tuple[Any, int]:
+    try:
+        return _scan_once(text, pos)
+    except StopIteration:
+        raise ValueError(f"invalid JSON value at char {pos}") from None
+
+def _after_item(text: str, pos: int, close: str) -> Tuple[int, bool]:
+    pos = skip_ws(text, pos)
+    c = text[pos:pos + 1]
+    if c == close:
+        return pos + 1, True
+    if c != ",":
+        raise ValueError(f"expected ',' or {close!r} at char {pos}")
+    return skip_ws(text, pos + 1), False
+
+def walk_array(text: str, pos: int, on_item: Callable[[int], int]) -> int:
+    # pos is on '['; on_item(pos) reads the element there and returns where it ended
+    pos = skip_ws(text, pos + 1)
+    if text[pos:pos + 1] == "]":
+        return pos + 1
+    while True:
+        pos, done = _after_item(text, on_item(pos), "]")
+        if done:
+            return pos
+
+def walk_object(text: str, pos: int, on_member: Callable[[str, int], int]) -> int:
+    # pos is on '{'; on_member(key, pos) reads the value there and returns where it ended
+    pos = skip_ws(text, pos + 1)
+    if text[pos:pos + 1] == "}":
+        return pos + 1
+    while True:
+        if text[pos:pos + 1] != '"':
+            raise ValueError(f"expected a key at char {pos}")
+        key, pos = read_value(text, pos)
+        pos = skip_ws(text, pos)
+        if text[pos:pos + 1] != ":":
+            raise ValueError(f"expected ':' at char {pos}")
+        pos, done = _after_item(text, on_member(key, skip_ws(text, pos + 1)), "}")
+        if done:
+            return pos
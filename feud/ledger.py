@@ -0,0 +1,109 @@
+from typing import Dict, List, Optional, Tuple
+
+# ---------------------------
+# Scores as a ledger of awards
+# ---------------------------
+# Every assigned answer is one award: (question ordinal, answer index) -> team,
+# round and points. Team totals, per-round subtotals and the ranking are kept up
+# to date as awards are recorded or withdrawn, so they always add up to what is
+# assigned on the board (a reassignment takes back exactly what it gave) and
+# reading them costs O(1) / O(teams) instead of a sort per rerun.
+Award = Tuple[int, int, int]  # team, round index, points
+
+class ScoreLedger:
+    __slots__ = ("_awards", "_totals", "_rounds", "_ranking")
+
+    def __init__(self, num_teams: int = 0):
+        self._awards: Dict[Tuple[int, int], Award] = {}
+        self._totals: List[int] = [0] * num_teams
+        self._rounds: Dict[int, List[int]] = {}  # round index -> per-team subtotal
+        self._ranking: List[int] = list(range(num_teams))
+
+    def __len__(self) -> int:
+        return len(self._totals)
+
+    # reads
+    def totals(self) -> Tuple[int, ...]:
+        return tuple(self._totals)
+
+    def total(self, team: int) -> int:
+        return self._totals[team]
+
+    def ranking(self) -> Tuple[int, ...]:
+        # Team indices, best first; ties keep team order
+        return tuple(self._ranking)
+
+    def round_totals(self, round_index: int) -> Tuple[int, ...]:
+        sub = self._rounds.get(round_index)
+        return tuple(sub) if sub is not None else (0,) * len(self._totals)
+
+    def rounds(self) -> List[int]:
+        # Rounds that currently hold points, in play order
+        return [r for r in sorted(self._rounds) if any(self._rounds[r])]
+
+    def award(self, ordinal: int, ans_idx: int) -> Optional[Award]:
+        return self._awards.get((ordinal, ans_idx))
+
+    def top_is_tied(self) -> bool:
+        r = self._ranking
+        return len(r) >= 2 and self._totals[r[0]] == self._totals[r[1]]
+
+    # writes
+    def record(self, ordinal: int, ans_idx: int, team: int, round_index: int, points: int) -> None:
+        self.withdraw(ordinal, ans_idx)
+        self._awards[(ordinal, ans_idx)] = (team, round_index, points)
+        self._add(team, round_index, points)
+
+    def withdraw(self, ordinal: int, ans_idx: int) -> Optional[int]:
+        # Takes an award back; returns the team that had it
+        award = self._awards.pop((ordinal, ans_idx), None)
+        if award is None:
+            return None
+        team, round_index, points = award
+        self._add(team, round_index, -points)
+        return team
+
+    def _add(self, team: int, round_index: int, delta: int) -> None:
+        self._totals[team] += delta
+        sub = self._rounds.get(round_index)
+        if sub is None:
+            sub = self._rounds[round_index] = [0] * len(self._totals)
+        sub[team] += delta
+        self._rerank(team)
+
+    def _rerank(self, team: int) -> None:
+        # Only `team` moved: take it out and walk it back in, O(teams)
+        r = self._ranking
+        r.remove(team)
+        key = (-self._totals[team], team)
+        pos = 0
+        while pos < len(r) and (-self._totals[r[pos]], r[pos]) < key:
+            pos += 1
+        r.insert(pos, team)
+
+    # serialization
+    def to_list(self) -> List[List[int]]:
+        # [[num_teams], [ordinal, answer, team, round, points], ...]
+        rows = [[o, a, t, r, p] for (o, a), (t, r, p) in sorted(self._awards.items())]
+        return [[len(self._totals)]] + rows
+
+    @classmethod
+    def from_list(cls, data: List[List[int]]) -> "ScoreLedger":
+        try:
+            (num_teams,), rows = data[0], data[1:]
+            ledger = cls(int(num_teams))
+            for row in rows:
+                o, a, t, r, p = (int(x) for x in row)
+                if not 0 <= t < len(ledger):
+                    raise ValueError(f"award for unknown team {t}")
+                ledger.record(o, a, t, r, p)
+        except (TypeError, IndexError) as exc:
+            raise ValueError(f"not a score ledger: {exc}") from None
+        return ledger
+
+    def __reduce__(self):
+        # pickle / deepcopy (game.defaults, go_home) go through the award list
+        return (ScoreLedger.from_list, (self.to_list(),))
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, ScoreLedger) and self._awards == other._awards and len(self) == len(other)
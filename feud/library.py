@@ -0,0 +1,259 @@
+from collections.abc import Sequence
+from typing import Callable, List, Dict, Optional, Tuple, Any
+import hashlib
+import json
+import logging
+import os
+import struct
+import tempfile
+
+from feud.bank import (
+    Question, Round, Signature, RawQuestion,
+    _clean_questions, _default_rounds, compile_question, compile_rounds,
+)
+from feud.jsonwalk import read_value, skip_ws, walk_array, walk_object
+from feud.validate import Problem, check_text
+
+log = logging.getLogger(__name__)
+
+# ---------------------------
+# Indexed question library
+# ---------------------------
+# A company-wide questions.json can hold thousands of questions while a game
+# only shows a few rounds. Instead of json.load-ing the whole file, its bytes are
+# read once and indexed by the byte span of every valid question; the index is
+# saved under FEUD_CACHE_DIR and reused while the file's mtime/size are
+# unchanged. Questions are decoded from their span the first time a game shows them.
+#
+# Each version keeps its own copy of the bytes, not a mapping of the file: games
+# pinned to an old version (feud/bank.py) keep reading it however the file is
+# rewritten meanwhile, in place included. A shared mmap would let an in-place
+# rewrite change the spans under a running game. The cost: every version held
+# (feud_bank_versions) keeps the whole file in process memory, about 1 MB per
+# 2,000 questions; only the questions are still decoded lazily.
+#
+# Files compiled by tools/compile_bank.py (feud/compiled.py) are read the same
+# way but need no index: their header already is one.
+CACHE_DIR = os.environ.get("FEUD_CACHE_DIR") or os.path.join(tempfile.gettempdir(), "fedora-feud-cache")
+INDEX_VERSION = 2
+
+Span = Tuple[int, int]
+
+# ---------------------------
+# Index building
+# ---------------------------
+# Indexing walks the JSON structure by hand only down to the questions
+# (feud/jsonwalk.py). The file is decoded to text once for this, so text
+# positions are mapped back to byte offsets (in file order) for the spans.
+class _Cursor:
+    __slots__ = ("text", "_ascii", "_char", "_byte")
+
+    def __init__(self, buf):
+        self.text: str = buf[:].decode("utf-8")
+        self._ascii = self.text.isascii()
+        self._char = 0
+        self._byte = 0
+
+    def byte(self, pos: int) -> int:
+        # positions must be asked for in increasing order
+        if self._ascii:
+            return pos
+        self._byte += len(self.text[self._char:pos].encode("utf-8"))
+        self._char = pos
+        return self._byte
+
+def _clean_one(raw: Any) -> Optional[RawQuestion]:
+    cleaned = _clean_questions([raw])
+    return cleaned[0] if cleaned else None
+
+def build_index(buf) -> List[Dict[str, Any]]:
+    # Mirrors parse_rounds(): [{"title", "tiebreaker", "spans"}], empty = use the defaults.
+    # Questions are decoded here only to be validated; just their byte spans are kept.
+    cur = _Cursor(buf)
+    text = cur.text
+
+    def questions_at(pos: int, spans: List[Span]) -> int:
+        if text[pos:pos + 1] != "[":
+            return read_value(text, pos)[1]
+
+        def question(start: int) -> int:
+            raw, end = read_value(text, start)
+            if _clean_one(raw) is not None:
+                spans.append((cur.byte(start), cur.byte(end)))
+            return end
+        return walk_array(text, pos, question)
+
+    rounds: List[Dict[str, Any]] = []
+    pos = skip_ws(text, 0)
+    top = text[pos:pos + 1]
+    if top == "{":
+        def round_at(start: int) -> int:
+            if text[start:start + 1] != "{":
+                return read_value(text, start)[1]
+            fields: Dict[str, Any] = {"title": "Round", "tiebreaker": False, "spans": []}
+
+            def member(key: str, vpos: int) -> int:
+                if key == "questions":
+                    fields["spans"] = []
+                    return questions_at(vpos, fields["spans"])
+                value, end = read_value(text, vpos)
+                fields[key] = value
+                return end
+            end = walk_object(text, start, member)
+            if isinstance(fields["title"], str) and fields["spans"]:
+                rounds.append({"title": fields["title"], "tiebreaker": bool(fields["tiebreaker"]), "spans": fields["spans"]})
+            return end
+
+        def top_member(key: str, vpos: int) -> int:
+            if key != "rounds":
+                return read_value(text, vpos)[1]
+            del rounds[:]
+            if text[vpos:vpos + 1] != "[":
+                return read_value(text, vpos)[1]
+            return walk_array(text, vpos, round_at)
+        end = walk_object(text, pos, top_member)
+    elif top == "[":
+        spans: List[Span] = []
+        end = questions_at(pos, spans)
+        # an old-format file with no valid question plays the default one
+        if spans:
+            rounds.append({"title": "Round 1", "tiebreaker": False, "spans": spans})
+    else:
+        raise ValueError("questions file must be a JSON object or array")
+
+    if skip_ws(text, end) != len(text):
+        raise ValueError(f"extra data at char {end}")
+    return rounds
+
+def _decode(buf, span: Span) -> Question:
+    return compile_question(_clean_one(json.loads(buf[span[0]:span[1]])))
+
+def _unreadable(span: Span, exc: Exception) -> Question:
+    # A span that no longer decodes (an index that does not match the bytes)
+    # plays the built-in question instead of failing the game
+    log.warning("question at bytes %d-%d could not be decoded: %s", span[0], span[1], exc)
+    return compile_rounds(_default_rounds())[0].questions[0]
+
+_DECODE_ERRORS = (ValueError, TypeError, KeyError, IndexError, struct.error)
+
+# ---------------------------
+# Lazy question sequences
+# ---------------------------
+Decoder = Callable[[Any, Span], Question]
+
+class LazyQuestions(Sequence):
+    # A round's questions, decoded from the file's bytes the first time each is read
+    __slots__ = ("_buf", "_spans", "_decode", "_decoded")
+
+    def __init__(self, buf, spans: List[Span], decode: Decoder = _decode):
+        self._buf = buf
+        self._spans = spans
+        self._decode = decode
+        self._decoded: List[Optional[Question]] = [None] * len(spans)
+
+    def __len__(self) -> int:
+        return len(self._spans)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+        q = self._decoded[idx]
+        if q is None:
+            q = self._decode_at(idx)
+            self._decoded[idx] = q
+        return q
+
+    def peek(self, idx: int) -> Question:
+        # Decoded but not kept, for one-off scans (feud/search.py)
+        q = self._decoded[idx]
+        return q if q is not None else self._decode_at(idx)
+
+    def _decode_at(self, idx: int) -> Question:
+        span = self._spans[idx]
+        try:
+            return self._decode(self._buf, span)
+        except _DECODE_ERRORS as e:
+            return _unreadable(span, e)
+
+    def decoded_count(self) -> int:
+        return sum(q is not None for q in self._decoded)
+
+# ---------------------------
+# Library files
+# ---------------------------
+class Library:
+    __slots__ = ("path", "digest", "index", "problems", "_buf", "_decode")
+
+    def __init__(self, path: str, digest: str, index: List[Dict[str, Any]], buf,
+                 problems: Tuple[Problem, ...] = (), decode: Decoder = _decode):
+        self.path = path
+        self.digest = digest
+        self.index = index
+        self.problems = problems  # what feud/validate.py found in the file
+        self._buf = buf
+        self._decode = decode
+
+    def rounds(self) -> List[Round]:
+        if not self.index:
+            return compile_rounds(_default_rounds())
+        return [
+            Round(idx, r["title"], LazyQuestions(self._buf, [tuple(sp) for sp in r["spans"]], self._decode), r["tiebreaker"])
+            for idx, r in enumerate(self.index)
+        ]
+
+def _index_path(path: str) -> str:
+    key = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(CACHE_DIR, f"{key}.idx.json")
+
+def _load_index(path: str, signature: Signature) -> Optional[Dict[str, Any]]:
+    try:
+        with open(_index_path(path), "r", encoding="utf-8") as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if (not isinstance(saved, dict) or saved.get("version") != INDEX_VERSION
+            or [saved.get("mtime_ns"), saved.get("size")] != list(signature)
+            or not isinstance(saved.get("rounds"), list) or not isinstance(saved.get("digest"), str)
+            or not isinstance(saved.get("problems"), list)):
+        return None
+    return saved
+
+def _save_index(path: str, signature: Signature, digest: str, index: List[Dict[str, Any]],
+                problems: Tuple[Problem, ...]) -> None:
+    target = _index_path(path)
+    tmp = f"{target}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": INDEX_VERSION, "mtime_ns": signature[0], "size": signature[1],
+                       "digest": digest, "rounds": index, "problems": problems}, f, separators=(",", ":"))
+        os.replace(tmp, target)
+    except OSError as e:
+        log.warning("could not save question index for %s: %s", path, e)
+
+def open_library(path: str, signature: Signature) -> Library:
+    # Raises OSError/ValueError for unreadable or malformed files (callers fall back to the defaults)
+    from feud import compiled
+
+    with open(path, "rb") as f:
+        st = os.fstat(f.fileno())
+        buf = f.read()  # private bytes, not an mmap (see the header): one file's size per version held
+    if not buf:
+        raise ValueError("empty questions file")
+    if compiled.is_compiled(buf):
+        return compiled.open_compiled(path, buf)
+
+    # The saved index only describes these bytes if the file was not rewritten since `signature`
+    current = (st.st_mtime_ns, st.st_size) == tuple(signature) and len(buf) == st.st_size
+    saved = _load_index(path, signature) if current else None
+    if saved is not None:
+        problems = tuple(Problem(*p) for p in saved["problems"])
+        return Library(path, saved["digest"], saved["rounds"], buf, problems)
+
+    digest = hashlib.sha256(buf).hexdigest()
+    index = build_index(buf)
+    # Validation reads the file once more, only when it is (re)indexed
+    problems = tuple(check_text(path, buf.decode("utf-8")))
+    if current:
+        _save_index(path, signature, digest, index, problems)
+    return Library(path, digest, index, buf, problems)
@@ -0,0 +1,29 @@
+from typing import Dict, Optional, Tuple, Any
+import threading
+
+# ---------------------------
+# Live game channels (host publishes, audience displays subscribe); one per room
+# ---------------------------
+Snapshot = Dict[str, Any]  # published snapshots are shared by every viewer: never mutate them
+
+class GameChannel:
+    __slots__ = ("game_id", "version", "snapshot", "_lock")
+
+    def __init__(self, game_id: str):
+        self.game_id = game_id
+        self.version = 0
+        self.snapshot: Optional[Snapshot] = None
+        self._lock = threading.Lock()
+
+    def publish(self, snapshot: Snapshot) -> int:
+        # Identical snapshots (no-op reruns) don't bump the version, so viewers don't redraw
+        with self._lock:
+            if snapshot == self.snapshot:
+                return self.version
+            self.snapshot = snapshot
+            self.version += 1
+            return self.version
+
+    def latest(self) -> Tuple[int, Optional[Snapshot]]:
+        return self.version, self.snapshot
+
@@ -0,0 +1,172 @@
+from typing import Dict, List, NamedTuple, Optional, Sequence, Set, Tuple
+import math
+import re
+import unicodedata
+
+from feud.bank import Question
+
+# ---------------------------
+# Matching what a player said against a question's answers
+# ---------------------------
+# Answers are long ("Matt Hicks - Chief Executive Officer") while players say
+# "Hicks", "the CEO" or "Matt Hiks". Each question's answers are folded
+# (case, accents, punctuation) into tokens once, the first time the question is
+# shown, plus the initials of every multi-word part ("ceo", "nps"). A guess is
+# scored per answer by how much of the guess it explains:
+#
+#   token similarity  1 exact, 0.9 prefix (4+ letters), 1 - d/len for an edit
+#                     distance d of at most 1 (2 for 8+ letters); candidates for
+#                     the edit distance come from a character-trigram index
+#   token weight      rarer tokens among the question's answers weigh more, so
+#                     "chief" alone does not pick an officer
+#
+# The best answer is a MATCH when it explains most of the guess and clearly beats
+# the runner-up, AMBIGUOUS when several answers do about as well, and a MISS when
+# nothing does. Guesses against ~15 answers take a few microseconds.
+MATCH = "match"
+AMBIGUOUS = "ambiguous"
+MISS = "miss"
+
+CONFIDENT = 0.75   # share of the guess an answer must explain to be picked
+MARGIN = 0.2       # ...and by how much it must beat the runner-up
+PLAUSIBLE = 0.45   # below this, no answer counts (a miss)
+TOKEN_MIN = 0.6    # weaker token similarities count as no match
+
+_STOPWORDS = frozenset("a an the of and or to for in on at by with my your our their its is are".split())
+_SPLIT = re.compile(r"[^0-9a-z%]+")
+_PARTS = re.compile(r"\s+-\s+|[/,;:()]")
+
+def fold(text: str) -> str:
+    # Lowercase, accents dropped, everything but letters/digits/% as spaces
+    decomposed = unicodedata.normalize("NFKD", text)
+    plain = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(_SPLIT.split(plain.casefold())).strip()
+
+def tokens(text: str) -> List[str]:
+    words = fold(text).split()
+    kept = [w for w in words if w not in _STOPWORDS]
+    return kept or words
+
+def _initials(text: str) -> List[str]:
+    # "Chief Executive Officer" -> "ceo", per part of the answer
+    out = []
+    for part in _PARTS.split(text):
+        words = fold(part).split()
+        if len(words) >= 2:
+            out.append("".join(w[0] for w in words if w not in _STOPWORDS))
+    return [a for a in out if len(a) >= 2]
+
+def _trigrams(token: str) -> Set[str]:
+    padded = f"^{token}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def _within(a: str, b: str, limit: int) -> Optional[int]:
+    # Levenshtein distance when it is <= limit, else None (banded, early exit)
+    if abs(len(a) - len(b)) > limit:
+        return None
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i] + [0] * len(b)
+        lo = i
+        for j, cb in enumerate(b, 1):
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb))
+            lo = min(lo, cur[j])
+        if lo > limit:
+            return None
+        prev = cur
+    return prev[-1] if prev[-1] <= limit else None
+
+def _limit(length: int) -> int:
+    return 0 if length <= 3 else 1 if length <= 7 else 2
+
+class Guess(NamedTuple):
+    verdict: str                 # MATCH, AMBIGUOUS or MISS
+    answer: Optional[int]        # the matched answer (MATCH only)
+    ranked: Tuple[Tuple[int, float], ...]  # (answer index, score) best first, plausible ones only
+
+class AnswerIndex:
+    __slots__ = ("_answers", "_postings", "_weights", "_grams", "_sizes")
+
+    def __init__(self, texts: Sequence[str]):
+        self._answers: List[Set[str]] = []
+        self._postings: Dict[str, Set[int]] = {}   # token -> answers that have it
+        for i, text in enumerate(texts):
+            toks = set(tokens(text)) | set(_initials(text))
+            self._answers.append(toks)
+            for t in toks:
+                self._postings.setdefault(t, set()).add(i)
+        n = max(1, len(texts))
+        self._weights = {t: 1.0 + math.log(n / len(ids)) for t, ids in self._postings.items()}
+        self._grams: Dict[str, Set[str]] = {}      # trigram -> tokens containing it
+        for t in self._postings:
+            for g in _trigrams(t):
+                self._grams.setdefault(g, set()).add(t)
+        # answer weight, for preferring the answer a guess covers most on ties
+        self._sizes = [sum(self._weights[t] for t in toks) or 1.0 for toks in self._answers]
+
+    def __len__(self) -> int:
+        return len(self._answers)
+
+    def _similar(self, word: str) -> Dict[str, float]:
+        # Answer tokens resembling `word` with their similarity
+        found: Dict[str, float] = {}
+        if word in self._postings:
+            found[word] = 1.0
+        candidates: Set[str] = set()
+        for g in _trigrams(word):
+            candidates |= self._grams.get(g, set())
+        for t in candidates:
+            if t == word:
+                continue
+            short, long_ = (word, t) if len(word) <= len(t) else (t, word)
+            if len(short) >= 4 and long_.startswith(short):
+                found[t] = 0.9
+                continue
+            d = _within(word, t, _limit(len(long_)))
+            if d is not None:
+                sim = 1.0 - d / len(long_)
+                if sim >= TOKEN_MIN:
+                    found[t] = sim
+        return found
+
+    def match(self, guess: str) -> Guess:
+        words = tokens(guess)
+        if not words or not self._answers:
+            return Guess(MISS, None, ())
+        heaviest = max(self._weights.values())
+        got = [0.0] * len(self._answers)     # weighted share of the guess each answer explains
+        covered = [0.0] * len(self._answers)  # weighted share of each answer the guess names
+        total = 0.0
+        for w in words:
+            similar = self._similar(w)
+            # an unknown word weighs like the rarest token: filler dilutes the guess
+            weight = max((self._weights[t] for t in similar), default=heaviest)
+            total += weight
+            best: Dict[int, Tuple[float, str]] = {}
+            for t, sim in similar.items():
+                for i in self._postings[t]:
+                    if sim > best.get(i, (0.0, ""))[0]:
+                        best[i] = (sim, t)
+            for i, (sim, t) in best.items():
+                got[i] += weight * sim
+                covered[i] += self._weights[t] * sim
+        scored = sorted(
+            ((got[i] / total, covered[i] / self._sizes[i], i) for i in range(len(got))),
+            reverse=True,
+        )
+        ranked = tuple((i, round(s, 3)) for s, _, i in scored if s >= PLAUSIBLE)
+        if not ranked:
+            return Guess(MISS, None, ())
+        top, top_cov, top_i = scored[0]
+        second, second_cov = (scored[1][0], scored[1][1]) if len(scored) > 1 else (0.0, 0.0)
+        if top >= CONFIDENT and (top - second >= MARGIN or (top == second and top_cov - second_cov >= MARGIN)):
+            return Guess(MATCH, top_i, ranked)
+        return Guess(AMBIGUOUS, None, ranked)
+
+def index_for(q: Question) -> AnswerIndex:
+    # Built once per question record and kept on it (records are shared by all games)
+    idx = q.match_index
+    if idx is None:
+        idx = AnswerIndex([a.text for a in q.answers])
+        q.match_index = idx
+    return idx
@@ -0,0 +1,153 @@
+from contextlib import contextmanager, nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Tuple
+import bisect
+import functools
+import logging
+import os
+import threading
+import time
+
+# ---------------------------
+# Opt-in timing spans, aggregated per process
+#
+#   FEUD_METRICS=1                 turn spans on (off: span() is a shared no-op)
+#   FEUD_METRICS_PORT=9464         Prometheus text endpoint at :<port>/metrics (0 = off)
+#   FEUD_METRICS_LOG_SECONDS=60    also log a summary every N seconds (0 = off)
+# ---------------------------
+ENABLED = os.environ.get("FEUD_METRICS", "").strip().lower() in ("1", "true", "yes", "on")
+PORT = int(os.environ.get("FEUD_METRICS_PORT", "9464"))
+LOG_SECONDS = float(os.environ.get("FEUD_METRICS_LOG_SECONDS", "0"))
+
+# Seconds; reruns live in the 1 ms .. 1 s range
+BUCKETS: Tuple[float, ...] = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+_LOG = logging.getLogger(__name__)
+_NOOP = nullcontext()
+
+class Histogram:
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self):
+        self.counts: List[int] = [0] * (len(BUCKETS) + 1)  # last slot is +Inf
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+
+_HISTOGRAMS: Dict[str, Histogram] = {}
+_COUNTERS: Dict[str, Tuple[str, str, Callable[[], float]]] = {}  # name -> (type, help, read)
+_LOCK = threading.Lock()
+
+def observe(name: str, seconds: float) -> None:
+    with _LOCK:
+        hist = _HISTOGRAMS.get(name)
+        if hist is None:
+            hist = _HISTOGRAMS[name] = Histogram()
+        hist.observe(seconds)
+
+@contextmanager
+def _timed(name: str):
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - t0)
+
+def span(name: str):
+    # Also records when the block exits through st.stop()/st.rerun()
+    return _timed(name) if ENABLED else _NOOP
+
+def timed(name: str):
+    # Decorator flavour of span(); returns the function untouched when metrics are off
+    def wrap(fn):
+        if not ENABLED:
+            return fn
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            with _timed(name):
+                return fn(*args, **kwargs)
+        return inner
+    return wrap
+
+def register_counter(name: str, help_text: str, read: Callable[[], float]) -> None:
+    # Exported as-is on every scrape (e.g. cache hit/miss counters owned by other modules)
+    _COUNTERS[name] = ("counter", help_text, read)
+
+def register_gauge(name: str, help_text: str, read: Callable[[], float]) -> None:
+    # Same, for values that go up and down (e.g. open rooms)
+    _COUNTERS[name] = ("gauge", help_text, read)
+
+# ---------------------------
+# Export
+# ---------------------------
+def _fmt(v: float) -> str:
+    return repr(float(v)) if v != int(v) else str(int(v))
+
+def render_prometheus() -> str:
+    lines = [
+        "# HELP feud_span_seconds Time spent in app sections and callbacks.",
+        "# TYPE feud_span_seconds histogram",
+    ]
+    with _LOCK:
+        snapshot = [(name, list(h.counts), h.total, h.count) for name, h in sorted(_HISTOGRAMS.items())]
+    for name, counts, total, count in snapshot:
+        cumulative = 0
+        for le, c in zip(BUCKETS + (float("inf"),), counts):
+            cumulative += c
+            le_s = "+Inf" if le == float("inf") else _fmt(le)
+            lines.append(f'feud_span_seconds_bucket{{span="{name}",le="{le_s}"}} {cumulative}')
+        lines.append(f'feud_span_seconds_sum{{span="{name}"}} {total:.6f}')
+        lines.append(f'feud_span_seconds_count{{span="{name}"}} {count}')
+    for name, (kind, help_text, read) in sorted(_COUNTERS.items()):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        lines.append(f"{name} {_fmt(read())}")
+    return "\n".join(lines) + "\n"
+
+def summary() -> str:
+    with _LOCK:
+        items = sorted(_HISTOGRAMS.items())
+        return ", ".join(f"{name}: n={h.count} avg={h.total / h.count * 1000:.1f}ms" for name, h in items if h.count)
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+_started = False
+
+def ensure_started() -> None:
+    # Called on every rerun; starts the exporter threads once per process
+    global _started
+    if not ENABLED or _started:
+        return
+    with _LOCK:
+        if _started:
+            return
+        _started = True
+    if PORT:
+        try:
+            server = ThreadingHTTPServer(("0.0.0.0", PORT), _MetricsHandler)
+            threading.Thread(target=server.serve_forever, name="feud-metrics", daemon=True).start()
+        except OSError as exc:
+            _LOG.warning("Metrics endpoint not started on port %s: %s", PORT, exc)
+    if LOG_SECONDS > 0:
+        def flush():
+            while True:
+                time.sleep(LOG_SECONDS)
+                _LOG.info("feud metrics: %s", summary())
+        threading.Thread(target=flush, name="feud-metrics-log", daemon=True).start()
@@ -0,0 +1,66 @@
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Hashable, Optional, Sequence
+import logging
+import threading
+
+from feud import game, matcher, metrics
+from feud.bank import QuestionBank
+from feud.render import answer_cards_html, scoreboard_html
+
+log = logging.getLogger(__name__)
+
+# ---------------------------
+# Round prefetch (while the round intro is on screen)
+# ---------------------------
+# The host lingers on a round's intro; GO then shows its first question. The
+# intro hands the round to one worker thread, which decodes its questions from
+# the (lazy) library, builds their answer matchers (feud/matcher.py) and puts
+# the all-hidden answer cards and the current scoreboard in the render cache,
+# so GO's rerun only has to lay out widgets. Everything prepared is shared and
+# read-only, so the worker never touches a game: a round still being prefetched
+# when GO comes is simply built by whichever thread gets there first.
+MAX_QUESTIONS = 10    # per round; huge library "rounds" only get their first questions ready
+MAX_REMEMBERED = 256  # rounds already prefetched (or queued), newest kept
+
+_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="feud-prefetch")
+_QUEUED: "OrderedDict[Hashable, Future]" = OrderedDict()
+_LOCK = threading.Lock()
+_STATS = {"rounds": 0, "questions": 0}
+
+metrics.register_counter("feud_prefetch_rounds_total", "Rounds prepared in the background from a round intro.",
+                         lambda: _STATS["rounds"])
+
+def _prepare(bank: QuestionBank, round_index: int, swaps: Dict[int, int],
+             labels: Sequence[str], totals: Sequence[int]) -> None:
+    try:
+        with metrics.span("prefetch.round"):
+            for qi in range(min(MAX_QUESTIONS, len(bank.questions(round_index)))):
+                q = game.slot_question(bank, swaps, round_index, qi)
+                matcher.index_for(q)
+                answer_cards_html(q, 0)
+                _STATS["questions"] += 1
+            scoreboard_html(labels, totals)
+            _STATS["rounds"] += 1
+    except Exception:
+        # Only a head start: the question screen builds whatever is missing
+        log.warning("prefetch of round %d of %s failed", round_index, bank.path, exc_info=True)
+
+def round_ahead(bank: QuestionBank, round_index: int, swaps: Dict[int, int],
+                labels: Sequence[str], totals: Sequence[int]) -> Optional[Future]:
+    # Queue round `round_index` of `bank` (a game's bank) once; None when already queued
+    first = bank.ordinal(round_index, 0)
+    moved = tuple(sorted((o, src) for o, src in swaps.items() if first <= o < first + len(bank.questions(round_index))))
+    key = (id(bank), bank.digest, round_index, moved, tuple(labels), tuple(totals))
+    with _LOCK:
+        if key in _QUEUED:
+            _QUEUED.move_to_end(key)
+            return None
+        fut = _POOL.submit(_prepare, bank, round_index, dict(moved), tuple(labels), tuple(totals))
+        _QUEUED[key] = fut
+        while len(_QUEUED) > MAX_REMEMBERED:
+            _QUEUED.popitem(last=False)
+        return fut
+
+def stats() -> Dict[str, int]:
+    return dict(_STATS, remembered=len(_QUEUED))
@@ -0,0 +1,143 @@
+from collections import OrderedDict
+from typing import Callable, Hashable, Sequence, Tuple
+import html
+import threading
+
+from feud import metrics
+from feud.bank import Question
+
+# ---------------------------
+# Memoized HTML (shared by every session in the process)
+# ---------------------------
+# Boards, pills and standings only change when a reveal or a score does, so the
+# HTML is built once per distinct input and reused by the host, every audience
+# display and every other game showing the same values. Keys hold only what the
+# HTML depends on (boards: question + revealed bitmask); entries are immutable.
+class RenderCache:
+    __slots__ = ("name", "maxsize", "hits", "misses", "_data", "_lock")
+
+    def __init__(self, name: str, maxsize: int):
+        self.name = name
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, object]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, build: Callable[[], object]):
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return value
+            self.misses += 1
+        # Built outside the lock; two sessions racing on a new key just build it twice
+        value = build()
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+BOARDS = RenderCache("boards", 2048)
+SCOREBOARDS = RenderCache("scoreboards", 1024)
+RANKINGS = RenderCache("rankings", 1024)
+BREAKDOWNS = RenderCache("breakdowns", 512)
+BUZZERS = RenderCache("buzzers", 512)
+CACHES: Tuple[RenderCache, ...] = (BOARDS, SCOREBOARDS, RANKINGS, BREAKDOWNS, BUZZERS)
+
+metrics.register_counter("feud_render_cache_hits_total", "HTML fragments served from the render cache.",
+                         lambda: sum(c.hits for c in CACHES))
+metrics.register_counter("feud_render_cache_misses_total", "HTML fragments built because they were not cached.",
+                         lambda: sum(c.misses for c in CACHES))
+
+def stats() -> dict:
+    return {c.name: {"hits": c.hits, "misses": c.misses, "size": len(c)} for c in CACHES}
+
+# ---------------------------
+# Builders
+# ---------------------------
+def _build_cards(q: Question, mask: int) -> Tuple[str, ...]:
+    return tuple(
+        f"<div class='ff-card ff-success ff-center popIn'>"
+        f"<div class='ff-big'>{a.text}</div><div>{a.points} pts</div></div>"
+        if mask >> i & 1 else
+        f"<div class='ff-card ff-center'><div class='ff-num'>#{i+1}</div></div>"
+        for i, a in enumerate(q.answers)
+    )
+
+def answer_cards_html(q: Question, mask: int) -> Tuple[str, ...]:
+    # One card per answer; `mask` is the Board.revealed_mask() bitset. Question
+    # records are shared and never mutated, so the record itself is the key.
+    return BOARDS.get((q, mask), lambda: _build_cards(q, mask))
+
+def _build_scoreboard(labels: Tuple[str, ...], scores: Tuple[int, ...]) -> str:
+    items = ''.join([
+        f"<div class='ff-pill' style='background-color: orange;color: rgb(14, 17, 23);'>"
+        f"<span class='lbl'>Team {l}:</span><span class='val'>{v}</span></div>"
+        for l, v in zip(labels, scores)
+    ])
+    return f"<div class='ff-toolbar'>{items}</div>"
+
+def scoreboard_html(labels: Sequence[str], scores: Sequence[int]) -> str:
+    key = (tuple(labels), tuple(scores))
+    return SCOREBOARDS.get(key, lambda: _build_scoreboard(*key))
+
+def _build_ranking(labels: Tuple[str, ...], scores: Tuple[int, ...], order: Tuple[int, ...]) -> Tuple[str, ...]:
+    return tuple(
+        f"<div class='ff-card' style='margin:.45rem 0; text-align:left;'>"
+        f"<span class='ff-big'>#{pos}</span>"
+        f"<b class='ff-big' style='margin-left: 1%; margin-right: 1%'>Team {labels[t]}</b>"
+        f"{scores[t]} pts</div>"
+        for pos, t in enumerate(order, start=1)
+    )
+
+def ranking_cards_html(labels: Sequence[str], scores: Sequence[int], order: Sequence[int]) -> Tuple[str, ...]:
+    # `order` is ScoreLedger.ranking(): team indices, best first
+    key = (tuple(labels), tuple(scores), tuple(order))
+    return RANKINGS.get(key, lambda: _build_ranking(*key))
+
+def _build_breakdown(labels: Tuple[str, ...], order: Tuple[int, ...], titles: Tuple[str, ...],
+                     rounds: Tuple[Tuple[int, ...], ...], totals: Tuple[int, ...]) -> str:
+    head = ''.join(f"<th>{t}</th>" for t in titles)
+    rows = ''.join(
+        f"<tr><td class='lbl'>Team {labels[t]}</td>"
+        + ''.join(f"<td>{sub[t]}</td>" for sub in rounds)
+        + f"<td class='val'>{totals[t]}</td></tr>"
+        for t in order
+    )
+    return (f"<table class='ff-breakdown'><thead><tr><th></th>{head}<th>Total</th></tr></thead>"
+            f"<tbody>{rows}</tbody></table>")
+
+def breakdown_html(labels: Sequence[str], order: Sequence[int], titles: Sequence[str],
+                   rounds: Sequence[Sequence[int]], totals: Sequence[int]) -> str:
+    # Points per round (one column per title, from ScoreLedger.round_totals) and totals,
+    # one row per team in ranking order
+    key = (tuple(labels), tuple(order), tuple(titles), tuple(tuple(r) for r in rounds), tuple(totals))
+    return BREAKDOWNS.get(key, lambda: _build_breakdown(*key))
+
+def _build_buzzers(labels: Tuple[str, ...], firsts: Tuple[Tuple[int, str, float], ...]) -> str:
+    items = ''.join(
+        f"<div class='ff-pill{' ff-buzz-first' if pos == 0 else ''}'>"
+        f"<span class='lbl'>{'🔔' if pos == 0 else f'#{pos + 1}'} Team {labels[team]}</span>"
+        f"<span>{html.escape(name)}</span>"
+        f"{'' if pos == 0 else f'<span>+{delta_ms:.0f} ms</span>'}</div>"
+        for pos, (team, name, delta_ms) in enumerate(firsts)
+    )
+    return f"<div class='ff-toolbar'>{items}</div>"
+
+def buzzers_html(labels: Sequence[str], firsts: Sequence[Tuple[int, str, float]]) -> str:
+    # Teams in buzz order: (team, player name, ms after the first team); names are
+    # typed by players, so escaped here
+    key = (tuple(labels), tuple(firsts))
+    return BUZZERS.get(key, lambda: _build_buzzers(*key))
@@ -0,0 +1,203 @@
+from typing import Dict, List, Optional
+import glob
+import logging
+import os
+import re
+import secrets
+import threading
+import time
+
+from feud import archive, metrics
+from feud.buzzer import Buzzer
+from feud.bank import QuestionBank, pinned_bank
+from feud.compiled import SUFFIX
+from feud.game import Event, apply_event, game_bank, new_state
+from feud.journal import GameJournal
+from feud.live import GameChannel
+from feud.validate import has_errors
+
+# ---------------------------
+# Rooms: concurrent games in one process, addressed by ?room=<id>
+#
+#   FEUD_MAX_ROOMS=50              rooms kept in memory at once
+#   FEUD_ROOM_IDLE_SECONDS=21600   rooms untouched by a host this long are dropped
+#   FEUD_STRICT_BANKS=1            refuse to start games on banks that fail validation
+#
+# A room owns the game state (its bank, teams and scores), the live channel
+# its audience displays follow, its players' buzzers and its journal. Every event runs under the
+# room's own lock; the registry lock is only taken to add or drop a room.
+# Dropping a room loses nothing: its journal is on disk and the next host
+# request for that id restores it.
+# The room id is public (audience and phone links carry it); hosting takes the
+# room's secret host key too (?room=<id>&key=<key>), kept in the journal's
+# snapshot. A wrong or missing key gets a new room, never the existing one.
+# Phone links carry the room's pad key instead (&pad=<key>, feud/buzzpad.py):
+# it lets a phone join and press, not host.
+# A game keeps the bank version it started with until go_home, however often
+# the file is edited meanwhile: the room holds that version (pinned) so it stays
+# in memory, and audience displays find it by the digest in the snapshot.
+# ---------------------------
+DEFAULT_BANK = os.environ.get("FEUD_QUESTIONS", "files/questions.json")
+MAX_ROOMS = max(1, int(os.environ.get("FEUD_MAX_ROOMS", "50")))
+IDLE_ROOM_SECONDS = float(os.environ.get("FEUD_ROOM_IDLE_SECONDS", str(6 * 3600)))
+STRICT_BANKS = os.environ.get("FEUD_STRICT_BANKS", "").strip().lower() in ("1", "true", "yes", "on")
+
+log = logging.getLogger(__name__)
+
+_ROOM_ID = re.compile(r"[A-Za-z0-9_-]{1,32}")  # also a journal file name
+
+def _same_key(given: Optional[str], key: str) -> bool:
+    return bool(given) and secrets.compare_digest(given.encode(), key.encode())
+
+def bank_choices() -> List[str]:
+    # Banks a room can pick: the default one and any other .json / .feudb next to it
+    folder = os.path.dirname(DEFAULT_BANK) or "."
+    found = glob.glob(os.path.join(folder, "*.json")) + glob.glob(os.path.join(folder, "*" + SUFFIX))
+    others = sorted(p for p in found if os.path.abspath(p) != os.path.abspath(DEFAULT_BANK))
+    return [DEFAULT_BANK] + others
+
+def bank_rejected(bank: QuestionBank) -> bool:
+    # Banks with validation errors still load (skipping what is broken) unless strict
+    return STRICT_BANKS and has_errors(bank.problems)
+
+class Room:
+    __slots__ = ("room_id", "state", "lock", "channel", "journal", "touched_at", "restored", "pinned", "buzzer",
+                 "host_key", "pad_key")
+
+    def __init__(self, room_id: str):
+        self.room_id = room_id
+        self.state = new_state()
+        self.lock = threading.RLock()
+        self.channel = GameChannel(room_id)
+        self.buzzer = Buzzer(room_id)
+        self.journal = GameJournal(room_id)
+        self.host_key = secrets.token_urlsafe(16)
+        self.pad_key = secrets.token_urlsafe(12)
+        self.journal.keys.update(host=self.host_key, pad=self.pad_key)
+        self.touched_at = time.monotonic()
+        self.restored = False
+        self.pinned: Optional[QuestionBank] = None
+
+    def restore(self) -> None:
+        # Game state and keys from the journal (a room never journaled keeps its fresh ones)
+        self.restored = self.journal.restore(self.state, self.bank)
+        self.host_key, self.pad_key = self.journal.keys["host"], self.journal.keys["pad"]
+        self.pin()
+
+    def is_host(self, key: Optional[str]) -> bool:
+        return _same_key(key, self.host_key)
+
+    def is_pad(self, key: Optional[str]) -> bool:
+        return _same_key(key, self.pad_key)
+
+    def bank(self, state=None) -> QuestionBank:
+        # The whole bank the room's current game was started with, in the version
+        # it was started with (the current one at home)
+        s = self.state if state is None else state
+        return pinned_bank(s.bank_path or DEFAULT_BANK, s.bank_digest)
+
+    def pin(self) -> None:
+        # Keep the game's bank version alive until go_home
+        self.pinned = self.bank() if self.state.bank_digest else None
+
+    def game_bank(self) -> QuestionBank:
+        # ...narrowed to the rounds the game plays
+        return game_bank(self.state, self.bank())
+
+    def apply(self, event: Event, now: float) -> None:
+        with self.lock:
+            was_final = self.state.screen == "final"
+            apply_event(self.state, self.bank(), event, now)
+            self.pin()
+            if event[0] in ("start_game", "go_home"):
+                self.buzzer.clear()  # phones rejoin the new game's teams
+            self.journal.append(event, self.state)
+            self.touched_at = time.monotonic()
+            if self.state.screen == "final" and not was_final:
+                # standings are gone after go_home: keep them (feud/archive.py)
+                archive.ARCHIVE.record(archive.game_record(self.room_id, self.state, self.game_bank(), now))
+
+    def touch(self) -> None:
+        self.touched_at = time.monotonic()
+
+class RoomRegistry:
+    def __init__(self, max_rooms: int = MAX_ROOMS, idle_seconds: float = IDLE_ROOM_SECONDS):
+        self.max_rooms = max_rooms
+        self.idle_seconds = idle_seconds
+        self.evicted = 0
+        self._rooms: Dict[str, Room] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._rooms)
+
+    def get(self, room_id: Optional[str]) -> Optional[Room]:
+        # Audience displays look rooms up without keeping them alive
+        return self._rooms.get(room_id) if room_id else None
+
+    def open(self, room_id: Optional[str], key: Optional[str]) -> Room:
+        # Host side: the room for this id and host key (restored from its journal after an
+        # eviction or a restart), or a new room under a fresh id for anything else: a
+        # missing/invalid id, a wrong key, or an id with no game behind it
+        room = self.get(room_id)
+        if room is not None:
+            if room.is_host(key):
+                room.touch()
+                return room
+            room_id, room = None, None
+        if room_id and _ROOM_ID.fullmatch(room_id):
+            # Disk I/O happens outside the registry lock, on a room nobody else sees yet
+            room = Room(room_id)
+            room.restore()
+            if not (room.restored and room.is_host(key)):
+                room.journal.close()
+                room = None
+        if room is None:
+            room = Room(self._new_id())
+        elif room.pinned is not None and room.pinned.digest != room.state.bank_digest:
+            log.warning("room %s: %s changed since its game started (before a restart); playing the current version",
+                        room.room_id, room.pinned.path)
+        with self._lock:
+            existing = self._rooms.get(room.room_id)
+            if existing is None:
+                dropped = self._make_space()
+                self._rooms[room.room_id] = room
+        if existing is not None:
+            room.journal.close()
+            return existing if existing.is_host(key) else self.open(None, None)
+        for gone in dropped:
+            self._retire(gone)
+        return room
+
+    def _new_id(self) -> str:
+        room_id = secrets.token_urlsafe(6)
+        while room_id in self._rooms:
+            room_id = secrets.token_urlsafe(6)
+        return room_id
+
+    def _make_space(self) -> List[Room]:
+        # Under the registry lock: unlink idle rooms, then least recently used ones while at the cap
+        now = time.monotonic()
+        dropped = [r for r in self._rooms.values() if now - r.touched_at > self.idle_seconds]
+        for room in dropped:
+            del self._rooms[room.room_id]
+        while len(self._rooms) >= self.max_rooms:
+            room = min(self._rooms.values(), key=lambda r: r.touched_at)
+            del self._rooms[room.room_id]
+            dropped.append(room)
+        self.evicted += len(dropped)
+        return dropped
+
+    def _retire(self, room: Room) -> None:
+        # After the registry lock is released: a host still inside an event of this
+        # room finishes it first (the room lock), then the journal is closed
+        with room.lock:
+            if room.state.started:
+                room.journal.snapshot(room.state)  # quick resume if the host comes back
+            room.journal.close()
+
+ROOMS = RoomRegistry()
+
+metrics.register_gauge("feud_rooms", "Rooms currently held in memory.", lambda: len(ROOMS))
+metrics.register_counter("feud_rooms_evicted_total", "Rooms dropped for being idle or over FEUD_MAX_ROOMS.",
+                         lambda: ROOMS.evicted)
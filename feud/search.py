@@ -0,0 +1,113 @@
+from typing import Dict, List, NamedTuple, Tuple
+import bisect
+import heapq
+import math
+import threading
+
+from feud.bank import QuestionBank
+from feud.matcher import tokens
+
+# ---------------------------
+# Question search (host console: swap a question that fell flat)
+# ---------------------------
+# An inverted index over every question of a bank file: token -> (question
+# ordinal, field weight) postings, prompts weighing more than answers. It is
+# built once per bank, in the background when a game starts on it (or by the
+# first search), and kept on the bank record (QuestionBank.search_index), so
+# every room playing the file shares it.
+# A query scores each question it touches by the idf of the tokens it contains
+# (query tokens also match as prefixes of longer tokens, for half-typed words),
+# scaled by the share of query tokens it contains, so a search over thousands
+# of questions reads a few short postings lists instead of every question.
+PROMPT_WEIGHT = 2.0
+ANSWER_WEIGHT = 1.0
+PREFIX_FACTOR = 0.7   # a query token that only starts an indexed token
+MIN_PREFIX = 3
+
+Posting = Tuple[int, float]  # question ordinal, field weight
+
+class Hit(NamedTuple):
+    ordinal: int      # in the whole bank (QuestionBank.question_at)
+    round_index: int
+    q_index: int
+    score: float
+
+class SearchIndex:
+    __slots__ = ("_postings", "_idf", "_vocab", "size")
+
+    def __init__(self, bank: QuestionBank):
+        postings: Dict[str, Dict[int, float]] = {}
+        ordinal = 0
+        for r in bank.rounds:
+            # library rounds decode each question for this scan without keeping it
+            read = getattr(r.questions, "peek", r.questions.__getitem__)
+            for qi in range(len(r.questions)):
+                q = read(qi)
+                fields = [(PROMPT_WEIGHT, q.prompt)] + [(ANSWER_WEIGHT, a.text) for a in q.answers]
+                for weight, text in fields:
+                    for t in tokens(text):
+                        seen = postings.setdefault(t, {})
+                        if seen.get(ordinal, 0.0) < weight:
+                            seen[ordinal] = weight
+                ordinal += 1
+        self.size = ordinal
+        self._postings: Dict[str, Tuple[Posting, ...]] = {t: tuple(p.items()) for t, p in postings.items()}
+        self._idf = {t: math.log(1.0 + ordinal / len(p)) for t, p in self._postings.items()}
+        self._vocab: List[str] = sorted(self._postings)
+
+    def _expand(self, word: str) -> List[Tuple[str, float]]:
+        # Indexed tokens a query token stands for, with how much each counts
+        out = [(word, 1.0)] if word in self._postings else []
+        if len(word) >= MIN_PREFIX:
+            at = bisect.bisect_right(self._vocab, word)
+            while at < len(self._vocab) and self._vocab[at].startswith(word):
+                out.append((self._vocab[at], PREFIX_FACTOR))
+                at += 1
+        return out
+
+    def query(self, text: str) -> Dict[int, float]:
+        # question ordinal -> score, for every question matching any query token
+        words = list(dict.fromkeys(tokens(text)))
+        if not words:
+            return {}
+        scores: Dict[int, float] = {}
+        hits: Dict[int, int] = {}
+        for w in words:
+            best: Dict[int, float] = {}
+            for t, factor in self._expand(w):
+                idf = self._idf[t] * factor
+                for o, weight in self._postings[t]:
+                    s = idf * weight
+                    if s > best.get(o, 0.0):
+                        best[o] = s
+            for o, s in best.items():
+                scores[o] = scores.get(o, 0.0) + s
+                hits[o] = hits.get(o, 0) + 1
+        return {o: s * hits[o] / len(words) for o, s in scores.items()}
+
+_BUILD_LOCK = threading.Lock()
+
+def index_for(bank: QuestionBank) -> SearchIndex:
+    # The whole file's index, whichever subset a game plays
+    bank = bank.whole()
+    idx = bank.search_index
+    if idx is None:
+        with _BUILD_LOCK:
+            idx = bank.search_index
+            if idx is None:
+                idx = SearchIndex(bank)
+                bank.search_index = idx
+    return idx
+
+def warm(bank: QuestionBank) -> None:
+    # Build the index in the background (a game just started on `bank`), so the
+    # host's first search does not pay for it
+    if bank.whole().search_index is None:
+        threading.Thread(target=index_for, args=(bank,), name="feud-search-index", daemon=True).start()
+
+def search(bank: QuestionBank, text: str, limit: int = 8) -> List[Hit]:
+    # Best `limit` questions of the whole bank for `text`, best first
+    whole = bank.whole()
+    scores = index_for(whole).query(text)
+    best = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], -item[0]))
+    return [Hit(o, *whole.locate(o), round(s, 3)) for o, s in best]
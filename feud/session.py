@@ -0,0 +1,59 @@
+from typing import Any, Dict, List, Mapping, MutableMapping, Optional, Tuple
+import logging
+import pickle
+import sys
+
+# ---------------------------
+# Session lifecycle
+# ---------------------------
+# A host tab can stay open all day and play dozens of games. Game state lives in
+# the room (feud/rooms.py), so the session only holds widget values, and each
+# answer row owns a selectbox key. Those keys are dropped here as
+# soon as their question is off screen, so a session holds at most one
+# question's worth of widget state no matter how many games it has played.
+ROW_PREFIX = "sel_"
+GAME_SCRATCH = ("scores_dirty", "guess_result", "swap_query")  # per-game flags that must not outlive a game
+WARN_KEYS = 200                   # a host session normally holds ~25 keys
+
+_LOG = logging.getLogger(__name__)
+
+def row_key(round_index: int, q_in_round: int, ans_idx: int) -> str:
+    return f"{ROW_PREFIX}{round_index}_{q_in_round}_{ans_idx}"
+
+def drop_rows(state: MutableMapping, round_index: int, q_in_round: int) -> None:
+    # Forget one question's answer rows (the host swapped the question)
+    prefix = f"{ROW_PREFIX}{round_index}_{q_in_round}_"
+    for k in [k for k in list(state.keys()) if k.startswith(prefix)]:
+        del state[k]
+
+def collect(state: MutableMapping, on_question: Optional[Tuple[int, int]]) -> int:
+    # Drops answer-row keys of every question but `on_question` (all of them off the
+    # question screen) and per-game scratch with them. Returns keys removed.
+    keep = f"{ROW_PREFIX}{on_question[0]}_{on_question[1]}_" if on_question else None
+    stale: List[str] = [
+        k for k in list(state.keys())
+        if k.startswith(ROW_PREFIX) and not (keep and k.startswith(keep))
+    ]
+    if on_question is None:
+        stale += [k for k in GAME_SCRATCH if k in state]
+    for k in stale:
+        del state[k]
+    return len(stale)
+
+def _approx_bytes(value: Any) -> int:
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(value)
+
+def report(state: Mapping) -> Dict[str, Any]:
+    # Key count and approximate (pickled) size, plus the three largest keys
+    sizes = sorted(((_approx_bytes(state[k]), str(k)) for k in list(state.keys())), reverse=True)
+    out = {
+        "keys": len(sizes),
+        "bytes": sum(n for n, _ in sizes),
+        "largest": [[k, n] for n, k in sizes[:3]],
+    }
+    if out["keys"] > WARN_KEYS:
+        _LOG.warning("session holds %d keys (~%d bytes): %s", out["keys"], out["bytes"], out["largest"])
+    return out
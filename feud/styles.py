@@ -0,0 +1,66 @@
+from typing import List, Tuple
+import hashlib
+import os
+
+import streamlit as st
+import streamlit.components.v1 as components
+
+from feud.assets import asset_url
+
+# ---------------------------
+# Stylesheet (feud/styles.css) and self-hosted fonts (static/fonts)
+# ---------------------------
+# The page needs no third-party request: Poppins comes from static/fonts (run
+# tools/fetch_fonts.py once to get the files) and the stylesheet is built once per
+# process, with an id that is a hash of its content.
+# A zero-height component (styles_frontend/index.html) puts it in the page's
+# <head> under that id, replacing an older version. The component answers with
+# the id, and from then on the session's reruns send no CSS at all. Until it
+# answers (its frame loads after the page's first paint) the stylesheet also
+# goes out inline, so the first screen is never unstyled; when the page cannot
+# be reached from the component frame, it answers "" and the stylesheet keeps
+# going out inline with every rerun, as it used to.
+KEY = "ff_styles"
+LOADED = "styles_loaded"  # plain session key: the component's own value goes once it is off the page
+_FRONTEND = os.path.join(os.path.dirname(os.path.abspath(__file__)), "styles_frontend")
+_component = components.declare_component("feud_styles", path=_FRONTEND)
+
+# (weight, file in static/fonts)
+FONTS: List[Tuple[int, str]] = [
+    (300, "Poppins-Light.ttf"),
+    (400, "Poppins-Regular.ttf"),
+    (600, "Poppins-SemiBold.ttf"),
+    (800, "Poppins-ExtraBold.ttf"),
+]
+
+def _font_faces() -> str:
+    # An installed Poppins wins; a missing file only drops its url(), so the text
+    # falls back to the next font instead of waiting on a request
+    rules = []
+    for weight, name in FONTS:
+        srcs = [f'local("{os.path.splitext(name)[0].replace("-", " ")}")', f'local("{os.path.splitext(name)[0]}")']
+        url = asset_url(f"fonts/{name}")
+        if url:
+            srcs.append(f'url("{url}") format("truetype")')
+        rules.append(f"@font-face {{ font-family: \"Poppins\"; font-style: normal; font-weight: {weight}; "
+                     f"font-display: swap; src: {', '.join(srcs)}; }}")
+    return "\n".join(rules)
+
+def _build() -> Tuple[str, str]:
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "styles.css"), encoding="utf-8") as f:
+        css = _font_faces() + "\n\n" + f.read()
+    return css, "ff-css-" + hashlib.sha256(css.encode("utf-8")).hexdigest()[:12]
+
+CSS, STYLE_ID = _build()
+
+def _on_loaded() -> None:
+    st.session_state[LOADED] = st.session_state.get(KEY)
+
+def inject() -> None:
+    # Call first thing on every rerun; costs nothing once the page has the stylesheet
+    loaded = st.session_state.get(LOADED)
+    if loaded == STYLE_ID:
+        return
+    st.markdown(f"<style>{CSS}</style>", unsafe_allow_html=True)
+    if loaded != "":
+        _component(css=CSS, id=STYLE_ID, key=KEY, default=None, on_change=_on_loaded)
@@ -0,0 +1,292 @@
+from bisect import bisect_right
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+import json
+import re
+
+from feud.jsonwalk import read_value, skip_ws, walk_array, walk_object
+
+# ---------------------------
+# Question file validation
+# ---------------------------
+# The loader is lenient on purpose (a game must start even with a bad file): it
+# skips malformed rounds and questions, coerces points with int() and plays the
+# built-in question when nothing is usable. This module reports each of those
+# decisions with its position so a typo is caught before it reaches a stage:
+#   error    content the loader skips, or a file it rejects outright
+#   warning  content that loads but probably isn't what was meant
+ERROR = "error"
+WARNING = "warning"
+MAX_ANSWERS = 15  # as bank._clean_questions
+
+class Problem(NamedTuple):
+    path: str
+    line: int
+    col: int
+    round: Optional[int]     # 1-based position in the file, None for the whole file
+    question: Optional[int]  # 1-based position in its round
+    severity: str
+    message: str
+
+    def __str__(self) -> str:
+        where = ""
+        if self.round is not None:
+            where = f"round {self.round}" + (f", question {self.question}" if self.question is not None else "") + ": "
+        return f"{self.path}:{self.line}:{self.col}: {self.severity}: {where}{self.message}"
+
+def has_errors(problems: List[Problem]) -> bool:
+    return any(p.severity == ERROR for p in problems)
+
+Located = Tuple[Any, int]  # decoded value, char position
+
+class _Checker:
+    def __init__(self, path: str, text: str):
+        self.path = path
+        self.text = text
+        self.newlines = [m.start() for m in re.finditer("\n", text)]
+        self.problems: List[Problem] = []
+        self.round: Optional[int] = None
+        self.question: Optional[int] = None
+
+    def add(self, pos: int, severity: str, message: str) -> None:
+        line = bisect_right(self.newlines, pos - 1)
+        col = pos - (self.newlines[line - 1] + 1 if line else 0)
+        self.problems.append(Problem(self.path, line + 1, col + 1, self.round, self.question, severity, message))
+
+    # structure walking, keeping where every member starts
+    def members(self, pos: int, deep: Tuple[str, ...] = ()) -> Tuple[Dict[str, Located], int]:
+        # Members of the object at pos; keys in `deep` holding an array come back as
+        # a list of located items instead of their decoded value
+        fields: Dict[str, Located] = {}
+
+        def member(key: str, vpos: int) -> int:
+            if key in fields:
+                self.add(vpos, WARNING, f"duplicate key {key!r}: the last one wins")
+            if key in deep and self.text[vpos:vpos + 1] == "[":
+                items, end = self.items(vpos)
+                fields[key] = (items, vpos)
+                return end
+            value, end = read_value(self.text, vpos)
+            fields[key] = (value, vpos)
+            return end
+        return fields, walk_object(self.text, pos, member)
+
+    def items(self, pos: int) -> Tuple[List[Located], int]:
+        items: List[Located] = []
+
+        def item(start: int) -> int:
+            value, end = read_value(self.text, start)
+            items.append((value, start))
+            return end
+        return items, walk_array(self.text, pos, item)
+
+    def unknown(self, fields: Dict[str, Located], known: Tuple[str, ...], what: str) -> None:
+        for key, (_, pos) in fields.items():
+            if key not in known:
+                self.add(pos, WARNING, f"unknown {what} key {key!r} is ignored")
+
+    # questions
+    def questions(self, pos: int) -> int:
+        # Checks the array of questions at pos; returns how many the loader keeps
+        if self.text[pos:pos + 1] != "[":
+            self.add(pos, ERROR, "questions must be a list; round skipped")
+            return 0
+        kept = 0
+        self.question = 0
+
+        def question(start: int) -> int:
+            nonlocal kept
+            self.question += 1
+            if self.text[start:start + 1] != "{":
+                self.add(start, ERROR, "question is not an object; skipped")
+                return read_value(self.text, start)[1]
+            fields, end = self.members(start, deep=("answers",))
+            kept += self.check_question(fields, start)
+            return end
+        walk_array(self.text, pos, question)
+        self.question = None
+        return kept
+
+    def check_question(self, fields: Dict[str, Located], pos: int) -> int:
+        self.unknown(fields, ("prompt", "answers"), "question")
+        ok = True
+        prompt, ppos = fields.get("prompt", (None, pos))
+        if not isinstance(prompt, str):
+            self.add(ppos, ERROR, "prompt must be a string; question skipped")
+            ok = False
+        elif not prompt.strip():
+            self.add(ppos, WARNING, "empty prompt")
+
+        answers, apos = fields.get("answers", ([], pos))
+        if "answers" in fields and self.text[apos:apos + 1] != "[":
+            self.add(apos, ERROR, "answers must be a list; question skipped")
+            return 0
+        if not 1 <= len(answers) <= MAX_ANSWERS:
+            self.add(apos, ERROR, f"{len(answers)} answers (1 to {MAX_ANSWERS} allowed); question skipped")
+            ok = False
+
+        seen: Dict[str, int] = {}
+        for n, (answer, a_pos) in enumerate(answers, start=1):
+            self.check_answer(n, answer, a_pos, seen)
+        return 1 if ok else 0
+
+    def check_answer(self, n: int, answer: Any, pos: int, seen: Dict[str, int]) -> None:
+        if not isinstance(answer, dict):
+            self.add(pos, ERROR, f"answer {n} is not an object; dropped")
+            return
+        for key in answer:
+            if key not in ("text", "points"):
+                self.add(pos, WARNING, f"answer {n}: unknown key {key!r} is ignored")
+
+        text = answer.get("text", "")
+        if not isinstance(text, str):
+            self.add(pos, WARNING, f"answer {n}: text {text!r} is not a string")
+        if not str(text).strip():
+            self.add(pos, WARNING, f"answer {n} has no text")
+        key = str(text).strip().casefold()
+        if key and key in seen:
+            self.add(pos, WARNING, f"answer {n} repeats answer {seen[key]} ({text!r})")
+        seen.setdefault(key, n)
+
+        if "points" not in answer:
+            self.add(pos, WARNING, f"answer {n} has no points; it counts 0")
+            return
+        points = answer["points"]
+        try:
+            if not isinstance(points, (int, float, str)):
+                raise TypeError
+            value = int(points)
+        except (TypeError, ValueError, OverflowError):
+            self.add(pos, ERROR, f"answer {n}: points {points!r} are not a number; the whole file is rejected")
+            return
+        if isinstance(points, bool) or (not isinstance(points, int) and value != points):
+            self.add(pos, WARNING, f"answer {n}: points {points!r} are read as {value}")
+        if value < 0:
+            self.add(pos, WARNING, f"answer {n} has negative points")
+
+    # rounds
+    def check_round(self, start: int) -> Tuple[int, bool]:
+        # Returns where the round ends and whether the loader keeps it
+        if self.text[start:start + 1] != "{":
+            self.add(start, ERROR, "round is not an object; skipped")
+            return read_value(self.text, start)[1], False
+
+        qpos: List[int] = []
+        fields: Dict[str, Located] = {}
+
+        def member(key: str, vpos: int) -> int:
+            if key in fields:
+                self.add(vpos, WARNING, f"duplicate key {key!r}: the last one wins")
+            if key == "questions":
+                qpos.append(vpos)
+                fields[key] = (None, vpos)
+                return read_value(self.text, vpos)[1]
+            value, end = read_value(self.text, vpos)
+            fields[key] = (value, vpos)
+            return end
+        end = walk_object(self.text, start, member)
+        self.unknown(fields, ("title", "questions", "tiebreaker"), "round")
+
+        ok = True
+        title, tpos = fields.get("title", ("Round", start))
+        if not isinstance(title, str):
+            self.add(tpos, ERROR, "title must be a string; round skipped")
+            ok = False
+        elif "title" not in fields:
+            self.add(start, WARNING, "no title; shown as \"Round\"")
+        tiebreaker, bpos = fields.get("tiebreaker", (False, start))
+        if not isinstance(tiebreaker, bool):
+            self.add(bpos, WARNING, f"tiebreaker {tiebreaker!r} should be true or false")
+
+        if not qpos:
+            self.add(start, ERROR, "round has no questions; skipped")
+            return end, False
+        if self.questions(qpos[-1]) == 0:
+            if self.text[qpos[-1]:qpos[-1] + 1] == "[":
+                self.add(qpos[-1], ERROR, "no valid questions; round skipped")
+            return end, False
+        return end, ok
+
+    # whole file
+    def check(self) -> List[Problem]:
+        try:
+            json.loads(self.text)
+        except json.JSONDecodeError as e:
+            self.add(e.pos, ERROR, f"invalid JSON: {e.msg}; the built-in question is played instead")
+            return self.problems
+
+        pos = skip_ws(self.text, 0)
+        top = self.text[pos:pos + 1]
+        if top == "[":
+            # old format: one round of questions
+            self.round = 1
+            if self.questions(pos) == 0:
+                self.round = None
+                self.add(pos, ERROR, "no valid questions; the built-in question is played instead")
+            return self.problems
+        if top != "{":
+            self.add(pos, ERROR, "the file must hold a JSON object or array; the built-in question is played instead")
+            return self.problems
+
+        rounds_at: List[int] = []
+
+        def top_member(key: str, vpos: int) -> int:
+            if key == "rounds":
+                if rounds_at:
+                    self.add(vpos, WARNING, "duplicate key 'rounds': the last one wins")
+                rounds_at.append(vpos)
+            return read_value(self.text, vpos)[1]
+        walk_object(self.text, pos, top_member)
+
+        if not rounds_at or self.text[rounds_at[-1]:rounds_at[-1] + 1] != "[":
+            self.add(rounds_at[-1] if rounds_at else pos, ERROR,
+                     "no \"rounds\" list; the built-in question is played instead")
+            return self.problems
+
+        seen = kept = 0
+
+        def round_at(start: int) -> int:
+            nonlocal seen, kept
+            seen += 1
+            self.round = seen
+            end, ok = self.check_round(start)
+            self.round = None
+            kept += ok
+            return end
+        walk_array(self.text, rounds_at[-1], round_at)
+        if not kept:
+            self.add(rounds_at[-1], ERROR, "no playable round; the built-in question is played instead")
+        return self.problems
+
+def check_text(path: str, text: str) -> List[Problem]:
+    # Problems in file order
+    return sorted(_Checker(path, text).check(), key=lambda p: (p.line, p.col))
+
+def check_file(path: str) -> List[Problem]:
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError as e:
+        return [Problem(path, 1, 1, None, None, ERROR, f"cannot read the file: {e.strerror or e}")]
+    try:
+        text = data.decode("utf-8")
+    except UnicodeDecodeError as e:
+        line = data.count(b"\n", 0, e.start) + 1
+        return [Problem(path, line, 1, None, None, ERROR, f"not UTF-8 ({e.reason}); the built-in question is played instead")]
+    return check_text(path, text)
+
+def describe_failure(path: str, exc: Exception) -> List[Problem]:
+    # Why the loader rejected a file: positioned problems for JSON, else the error itself
+    from feud.compiled import MAGIC
+
+    problems: List[Problem] = []
+    try:
+        with open(path, "rb") as f:
+            compiled = f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        compiled = True  # nothing to check
+    if not compiled:
+        problems = check_file(path)
+    if not has_errors(problems):
+        reason = getattr(exc, "strerror", None) or exc
+        problems.append(Problem(path, 1, 1, None, None, ERROR, f"{reason}; the built-in question is played instead"))
+    return problems
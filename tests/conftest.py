@@ -0,0 +1,29 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from feud.bank import QuestionBank, compile_rounds, parse_rounds  # noqa: E402
+
+def bank_data(rounds=2, questions=3, answers=4, tiebreakers=0):
+    # Same shape as bench/bench_app.py's synthetic banks
+    def question(tag):
+        return {"prompt": f"Question {tag}", "answers": [
+            {"text": f"Answer {tag}.{a + 1}", "points": max(1, 50 - 3 * a)} for a in range(answers)
+        ]}
+    data = {"rounds": [
+        {"title": f"Round {r + 1}", "questions": [question(f"{r + 1}.{q + 1}") for q in range(questions)]}
+        for r in range(rounds)
+    ]}
+    for t in range(tiebreakers):
+        data["rounds"].append({"title": f"Sudden death {t + 1}", "tiebreaker": True, "questions": [question(f"TB{t + 1}")]})
+    return data
+
+def make_bank(path="bank.json", digest="d1", **shape) -> QuestionBank:
+    return QuestionBank(path, compile_rounds(parse_rounds(bank_data(**shape))), (1, 1), digest)
+
+@pytest.fixture
+def bank():
+    return make_bank()
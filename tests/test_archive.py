@@ -0,0 +1,32 @@
+import io
+
+from conftest import make_bank
+from feud.archive import ResultsArchive, game_record
+from feud.game import apply_event, new_state
+
+def finished_game(bank, names, winner):
+    s = new_state()
+    apply_event(s, bank, ["start_game", len(names), names])
+    apply_event(s, bank, ["go_next"])
+    apply_event(s, bank, ["assign_team", 0, winner])
+    apply_event(s, bank, ["show_final"])
+    return s
+
+def test_leaderboard_ranks_named_teams_only(tmp_path):
+    bank = make_bank()
+    arc = ResultsArchive(str(tmp_path / "results.db"))
+    games = [(["Penguins", "B"], 0), (["A", "penguins"], 0), (["Red Hats", "Penguins"], 1), (["A", "B"], 1)]
+    for i, (names, winner) in enumerate(games):
+        arc.record(game_record("room", finished_game(bank, names, winner), bank, 1000.0 + i))
+    arc.flush()
+
+    board = {r["team"].casefold(): r for r in arc.team_leaderboard()}
+    assert set(board) == {"penguins", "red hats"}
+    assert (board["penguins"]["games"], board["penguins"]["wins"]) == (3, 2)
+    assert (board["red hats"]["games"], board["red hats"]["wins"]) == (1, 0)
+    assert arc.team_leaderboard(since=1002.5) == []
+    assert arc.game_count() == 4
+
+    out = io.StringIO()
+    assert arc.export("teams", "csv", out) == 8
+    assert out.getvalue().splitlines()[0].endswith(",named")
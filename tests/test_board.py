@@ -0,0 +1,54 @@
+import copy
+import pickle
+
+import pytest
+
+from feud.board import MAX_ANSWERS, Board
+
+def test_empty_board_reads_as_nothing():
+    b = Board()
+    assert len(b) == 0
+    assert b.revealed_mask(7) == 0 and b.assigned(7, 3) is None and b.strikes(7) == 0
+
+def test_reveal_assign_strike_per_ordinal():
+    b = Board()
+    b.reveal(4, 0)
+    b.reveal(4, MAX_ANSWERS - 1)
+    b.assign(4, 2, 0)
+    b.assign(4, 3, 11)
+    b.set_strikes(2, 3)
+    assert len(b) == 5
+    assert b.revealed(4, MAX_ANSWERS) == [True] + [False] * (MAX_ANSWERS - 2) + [True]
+    assert b.is_revealed(4, 14) and not b.is_revealed(3, 0)
+    assert (b.assigned(4, 2), b.assigned(4, 3), b.assigned(4, 1)) == (0, 11, None)
+    assert b.strikes(2) == 3 and b.strikes(4) == 0
+    b.assign(4, 2, None)
+    assert b.assigned(4, 2) is None
+
+def test_clear_forgets_one_question():
+    b = Board()
+    for o in (0, 1):
+        b.reveal(o, 1)
+        b.assign(o, 1, 1)
+        b.set_strikes(o, 2)
+    b.clear(0)
+    b.clear(9)  # never touched: nothing to do
+    assert (b.revealed_mask(0), b.assigned(0, 1), b.strikes(0)) == (0, None, 0)
+    assert (b.revealed_mask(1), b.assigned(1, 1), b.strikes(1)) == (2, 1, 2)
+
+def test_bytes_round_trip_and_copies():
+    b = Board()
+    b.reveal(3, 5)
+    b.assign(3, 5, 2)
+    b.set_strikes(1, 1)
+    again = Board.from_bytes(b.to_bytes())
+    assert again == b and again.assigned(3, 5) == 2
+    assert pickle.loads(pickle.dumps(b)) == b
+    c = copy.deepcopy(b)
+    c.reveal(0, 0)
+    assert c != b and b.revealed_mask(0) == 0
+
+@pytest.mark.parametrize("data", [b"", b"FFB1", b"XXXX\x00\x00\x00\x00", Board().to_bytes() + b"\x00"])
+def test_from_bytes_rejects_damaged_data(data):
+    with pytest.raises(ValueError):
+        Board.from_bytes(data)
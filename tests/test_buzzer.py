@@ -0,0 +1,191 @@
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from types import SimpleNamespace
+from urllib.parse import urlencode
+
+import pytest
+
+from feud import buzzpad
+from feud.buzzer import Buzzer
+from feud.rooms import ROOMS
+
+def settle(b: Buzzer, since: int) -> None:
+    # The arbiter publishes asynchronously: wait for the version to pass `since`
+    b.wait(since, 2.0)
+    assert b.version > since
+
+def opened(key="q1") -> Buzzer:
+    b = Buzzer("test")
+    b.arm(key)
+    settle(b, 0)
+    assert b.result.opened_ns
+    return b
+
+def test_arm_opens_once_per_key_and_none_closes():
+    b = opened()
+    first_round = b.result.round_no
+    b.arm("q1")  # the open one: nothing queued
+    b.arm(None)
+    settle(b, 1)
+    assert b.result.opened_ns == 0 and b.result.round_no == first_round and b.key is None
+
+def test_presses_order_by_stamp_not_arrival():
+    b = opened()
+    t = b.result.opened_ns
+    b.press(0, "late", "Late", at=t + 2000)
+    b.press(0, "early", "Early", at=t + 1000)
+    b.press(1, "other", "Other", at=t + 1500)
+    assert [(p.team, p.player) for p in b.result.firsts] == [(0, "early"), (1, "other")]
+    assert b.result.presses == 3
+
+def test_one_first_press_per_team():
+    b = opened()
+    t = b.result.opened_ns
+    for i in range(12):
+        b.press(i % 3, f"p{i}", f"P{i}", at=t + 100 * (12 - i))
+    firsts = b.result.firsts
+    assert [p.team for p in firsts] == [2, 1, 0]
+    assert [p.player for p in firsts] == ["p11", "p10", "p9"]
+    assert b.first(1).player == "p10" and b.first(5) is None
+
+def test_presses_before_the_round_opened_are_dropped():
+    b = opened()
+    assert b.press(0, "p", "P", at=b.result.opened_ns - 1) is None
+    assert b.result.firsts == () and b.result.presses == 0
+    closed = Buzzer("closed")
+    assert closed.press(0, "p", "P") is None and closed.version == 0
+
+def test_reset_starts_a_fresh_round_on_the_same_question():
+    b = opened()
+    b.press(0, "p", "P")
+    round_no, version = b.result.round_no, b.version
+    b.reset()
+    settle(b, version)
+    assert b.result.round_no == round_no + 1 and b.result.firsts == () and b.key == "q1"
+
+def test_clear_forgets_players_and_bumps_the_game():
+    b = opened()
+    b.join(0, "p1", "Ann")
+    b.join(1, "p2", "Bob")
+    b.press(0, "p1", "Ann")
+    assert b.team_players(2) == [1, 1]
+    version = b.version
+    b.clear()
+    settle(b, version)
+    assert b.players == {} and b.game == 1 and b.key is None and b.result.opened_ns == 0
+    b.arm("q1")  # the same question in the next game opens a round again
+    settle(b, version + 1)
+    assert b.result.opened_ns
+
+def test_wait_times_out_without_a_change():
+    b = opened()
+    t0 = time.monotonic()
+    assert b.wait(b.version, 0.05) == (b.version, b.result)
+    assert time.monotonic() - t0 >= 0.05
+
+def fake_room(buzzer, teams=("A", "B"), buzzers=True):
+    return SimpleNamespace(buzzer=buzzer, is_pad=lambda key: key == "pad-key", state=SimpleNamespace(
+        started=True, buzzers=buzzers, num_teams=len(teams), team_names=list(teams)))
+
+def test_pad_view():
+    assert buzzpad.view(None, 0, "p")["game"] == -1
+    b = Buzzer("view")
+    assert buzzpad.view(fake_room(b), 0, "p")["text"] == "Buzzers open when the host shows a question."
+    b.arm("q1")
+    settle(b, 0)
+    room = fake_room(b)
+    assert buzzpad.view(room, 1, "p")["text"] == "Round 1: buzz to answer for Team B!"
+    t = b.result.opened_ns
+    b.press(0, "p1", "Ann", at=t + 1_000_000)
+    b.press(1, "p2", "Bob", at=t + 4_000_000)
+    mine, theirs = buzzpad.view(room, 0, "p1"), buzzpad.view(room, 1, "p3")
+    assert (mine["kind"], mine["text"], mine["open"]) == ("success", "⚡ You buzzed first!", True)
+    assert (theirs["kind"], theirs["text"]) == ("warning", "Bob buzzed for Team B, 3 ms after Team A.")
+    assert not buzzpad.view(fake_room(b, buzzers=False), 0, "p1")["open"]
+
+@pytest.fixture
+def pad_server():
+    server = buzzpad._PadServer(("127.0.0.1", 0), buzzpad._PadHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def pad_room():
+    b = opened()
+    b.join(0, "p1", "Ann")
+    b.join(0, "p2", "Bob")
+    b.join(1, "p3", "Cat")
+    deadline = time.monotonic() + 2
+    while len(b.players) < 3 and time.monotonic() < deadline:  # joins go through the arbiter too
+        time.sleep(0.001)
+    ROOMS._rooms["pad-test"] = fake_room(b)
+    yield b
+    del ROOMS._rooms["pad-test"]
+
+def call(url, path, fields, origin=None, post=False):
+    # (status, body) of one request to the handler
+    query = urlencode(dict({"room": "pad-test", "pad": "pad-key", "team": 0, "game": 0}, **fields))
+    req = urllib.request.Request(f"{url}{path}" + ("" if post else f"?{query}"), query.encode() if post else None,
+                                 {"Origin": origin} if origin else {})
+    try:
+        with urllib.request.urlopen(req, timeout=5) as r:
+            return r.status, json.load(r), r.headers
+    except urllib.error.HTTPError as e:
+        return e.code, json.load(e), e.headers
+
+def test_handler_stamps_presses_and_answers_the_long_poll(pad_server, pad_room):
+    def state(since, game=0):
+        return call(pad_server, "/state", {"player": "p1", "since": since, "game": game})[1]
+
+    def press(player, game=0, team=0):
+        return call(pad_server, "/press", {"player": player, "game": game, "team": team}, post=True)[1]
+
+    now = state(-1)
+    assert now["open"] and now["game"] == 0
+    assert state(now["v"], game=5)["v"] == now["v"]  # a stale game answers at once
+
+    waiting = {}
+    poll = threading.Thread(target=lambda: waiting.update(state(now["v"])))
+    poll.start()
+    before = time.monotonic_ns()
+    assert press("p1")["kind"] == "success"
+    poll.join(5)
+    assert waiting["text"] == "⚡ You buzzed first!"
+    assert before <= pad_room.first(0).at_ns <= time.monotonic_ns()
+
+    assert press("p2", game=3)["text"] == "⚡ Ann buzzed first!" and pad_room.result.presses == 1  # old game: ignored
+
+def test_handler_only_takes_presses_of_joined_players_with_the_pad_key(pad_server, pad_room):
+    assert call(pad_server, "/press", {"player": "p1", "pad": "wrong"}, post=True)[0] == 403
+    assert call(pad_server, "/state", {"player": "p1", "pad": ""})[0] == 403
+    assert call(pad_server, "/press", {"player": "stranger"}, post=True)[0] == 200
+    assert call(pad_server, "/press", {"player": "p3", "team": 0}, post=True)[0] == 200  # joined team 1
+    assert pad_room.result.presses == 0
+    status, body, _ = call(pad_server, "/press", {"player": "p3", "team": 1}, post=True)
+    assert status == 200 and body["text"] == "⚡ You buzzed first!" and pad_room.first(1).name == "Cat"
+
+def test_handler_answers_only_the_apps_origin(pad_server, pad_room, monkeypatch):
+    monkeypatch.setattr(buzzpad, "_origins", type(buzzpad._origins)())
+    buzzpad.allow_origin("https://feud.example.com/?room=pad-test")
+    status, _body, headers = call(pad_server, "/state", {"since": -1}, origin="https://feud.example.com")
+    assert status == 200 and headers["Access-Control-Allow-Origin"] == "https://feud.example.com"
+    assert call(pad_server, "/press", {"player": "p1"}, origin="https://evil.example.net", post=True)[0] == 403
+    assert pad_room.result.presses == 0
+    status, _body, headers = call(pad_server, "/state", {"since": -1})  # not from a page: no CORS header
+    assert status == 200 and "Access-Control-Allow-Origin" not in headers
+
+def test_long_polls_over_the_cap_come_back_later(pad_server, pad_room, monkeypatch):
+    monkeypatch.setattr(buzzpad, "_polls", threading.BoundedSemaphore(1))
+    held = threading.Thread(target=call, args=(pad_server, "/state", {"since": pad_room.version}))
+    held.start()
+    time.sleep(0.2)
+    status, body, _ = call(pad_server, "/state", {"since": pad_room.version})
+    assert status == 503 and body["retry_ms"] == buzzpad.BUSY_RETRY_MS
+    assert call(pad_server, "/press", {"player": "p1"}, post=True)[1]["kind"] == "success"  # presses are not capped
+    held.join(5)
+    assert not held.is_alive()
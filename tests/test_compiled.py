@@ -0,0 +1,58 @@
+import json
+import struct
+
+import pytest
+
+from conftest import bank_data
+from feud.bank import parse_rounds
+from feud.compiled import SUFFIX, compile_file, compile_rounds_to_bytes, is_compiled, open_compiled
+from feud.library import open_library
+
+DIGEST = "ab" * 32
+
+def questions(library):
+    return [[(q.prompt, [(a.text, a.points) for a in q.answers]) for q in r.questions] for r in library.rounds()]
+
+def test_round_trip_keeps_rounds_questions_and_answers():
+    data = bank_data(rounds=2, questions=3, answers=15, tiebreakers=1)
+    data["rounds"][0]["title"] = "Ronda uno ✨"
+    data["rounds"][0]["questions"][1]["prompt"] = "¿Qué hay en la nevera?"
+    rounds = parse_rounds(data)
+    buf = compile_rounds_to_bytes(rounds, DIGEST)
+    assert is_compiled(buf)
+
+    lib = open_compiled("q" + SUFFIX, buf)
+    assert lib.digest == DIGEST
+    got = lib.rounds()
+    assert [(r.title, r.tiebreaker) for r in got] == [(r["title"], r.get("tiebreaker", False)) for r in rounds]
+    assert got[0].questions[1].prompt == "¿Qué hay en la nevera?"
+    assert [len(r.questions) for r in got] == [3, 3, 1]
+    first = got[1].questions[2]
+    assert [(a.text, a.points) for a in first.answers] == [(a["text"], a["points"]) for a in rounds[1]["questions"][2]["answers"]]
+
+def test_compile_file_matches_the_json_bank(tmp_path):
+    src, dst = tmp_path / "q.json", tmp_path / ("q" + SUFFIX)
+    src.write_text(json.dumps(bank_data()), encoding="utf-8")
+    stats = compile_file(str(src), str(dst))
+    assert stats["rounds"] == 2 and stats["questions"] == 6
+    st_src, st_dst = src.stat(), dst.stat()
+    from_json = open_library(str(src), (st_src.st_mtime_ns, st_src.st_size))
+    from_bin = open_library(str(dst), (st_dst.st_mtime_ns, st_dst.st_size))
+    assert questions(from_json) == questions(from_bin)
+    assert from_json.digest == from_bin.digest
+
+def test_damaged_files_are_rejected():
+    buf = compile_rounds_to_bytes(parse_rounds(bank_data()), DIGEST)
+    with pytest.raises(ValueError):
+        open_compiled("q", buf[:-1])
+    with pytest.raises(ValueError):
+        open_compiled("q", buf[:20])
+    newer = buf[:4] + struct.pack("<H", 99) + buf[6:]
+    with pytest.raises(ValueError, match="recompile"):
+        open_compiled("q", newer)
+
+def test_points_beyond_the_format_do_not_compile():
+    data = bank_data(rounds=1, questions=1)
+    data["rounds"][0]["questions"][0]["answers"][0]["points"] = 2 ** 40
+    with pytest.raises(struct.error):
+        compile_rounds_to_bytes(parse_rounds(data), DIGEST)
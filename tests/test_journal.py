@@ -0,0 +1,116 @@
+import json
+import os
+
+from conftest import make_bank
+from feud.game import apply_event, new_state, state_to_dict
+from feud.journal import GameJournal
+
+START = ["start_game", 2, ["A", "B"], {"bank": "bank.json", "digest": "d1"}]
+EVENTS = [START, ["go_next"], ["assign_team", 0, 0], ["assign_team", 3, 1], ["strike"],
+          ["go_next"], ["reveal_only", 1], ["assign_team", 2, 0]]
+
+def play(journal, bank, events):
+    s = new_state()
+    for event in events:
+        apply_event(s, bank, event)
+        journal.append(event, s)
+    return s
+
+def restored(tmp_path, bank, snapshot_every=3):
+    journal = GameJournal("g", str(tmp_path), snapshot_every)
+    s = new_state()
+    return journal, s, journal.restore(s, lambda _s: bank)
+
+def test_snapshot_plus_tail_replay(tmp_path, bank):
+    journal = GameJournal("g", str(tmp_path), snapshot_every=3)
+    played = play(journal, bank, EVENTS)
+    journal.close()
+    snap = json.loads((tmp_path / "g.snap").read_text())
+    assert snap["seq"] == 6 and 0 < snap["offset"] < os.path.getsize(tmp_path / "g.log")
+
+    journal, s, ok = restored(tmp_path, bank)
+    assert ok and journal.seq == len(EVENTS)
+    assert state_to_dict(s) == state_to_dict(played)
+    assert s.ledger.totals() == played.ledger.totals()
+
+def test_snapshot_only_replays_the_tail(tmp_path, bank):
+    journal = GameJournal("g", str(tmp_path), snapshot_every=3)
+    play(journal, bank, EVENTS)
+    journal.close()
+    # Damage a line the snapshot already covers: restore must not read it
+    log = (tmp_path / "g.log").read_bytes().split(b"\n")
+    log[1] = b"x" * len(log[1])
+    (tmp_path / "g.log").write_bytes(b"\n".join(log))
+    _journal, s, ok = restored(tmp_path, bank)
+    assert ok and s.screen == "question" and s.q_in_round == 1
+
+def test_torn_last_line_is_dropped(tmp_path, bank):
+    journal = GameJournal("g", str(tmp_path), snapshot_every=100)
+    play(journal, bank, EVENTS[:3])
+    journal.close()
+    size = os.path.getsize(tmp_path / "g.log")
+    with open(tmp_path / "g.log", "ab") as f:
+        f.write(b'["assign_team",1,')
+    journal, s, ok = restored(tmp_path, bank)
+    assert ok and journal.seq == 3
+    assert os.path.getsize(tmp_path / "g.log") == size
+    assert not (tmp_path / "g.rejected").exists()
+
+def test_event_the_edited_bank_cannot_apply_stops_replay(tmp_path, bank):
+    journal = GameJournal("g", str(tmp_path), snapshot_every=100)
+    play(journal, bank, EVENTS[:3] + [["assign_team", 3, 1], ["go_next"]])
+    journal.close()
+    lines = (tmp_path / "g.log").read_bytes().splitlines(keepends=True)
+
+    # After a restart the bank has only 3 answers per question: answer 3 is gone
+    smaller = make_bank(answers=3)
+    journal, s, ok = restored(tmp_path, smaller)
+    assert ok and journal.seq == 3
+    assert s.screen == "question" and s.q_in_round == 0
+    assert s.ledger.totals() == (50, 0)
+    assert (tmp_path / "g.log").read_bytes() == b"".join(lines[:3])
+    assert (tmp_path / "g.rejected").read_bytes() == b"".join(lines[3:])
+
+    # The game goes on from there and resumes cleanly next time
+    play_on = ["go_next"]
+    apply_event(s, smaller, play_on)
+    journal.append(play_on, s)
+    journal.close()
+    journal, s, ok = restored(tmp_path, smaller)
+    assert ok and journal.seq == 4 and s.q_in_round == 1
+
+def test_corrupt_complete_line_stops_replay(tmp_path, bank):
+    journal = GameJournal("g", str(tmp_path), snapshot_every=100)
+    play(journal, bank, EVENTS[:2])
+    journal.close()
+    with open(tmp_path / "g.log", "ab") as f:
+        f.write(b'{"not an event"\n["go_next"]\n')
+    journal, s, ok = restored(tmp_path, bank)
+    assert ok and journal.seq == 2 and s.screen == "question"
+    assert (tmp_path / "g.rejected").read_bytes() == b'{"not an event"\n["go_next"]\n'
+
+def test_unknown_event_stops_replay(tmp_path, bank):
+    journal = GameJournal("g", str(tmp_path), snapshot_every=100)
+    play(journal, bank, EVENTS[:2])
+    journal.close()
+    with open(tmp_path / "g.log", "ab") as f:
+        f.write(b'["teleport"]\n')
+    journal, s, ok = restored(tmp_path, bank)
+    assert ok and journal.seq == 2
+
+def test_keys_are_saved_with_the_first_event(tmp_path, bank):
+    journal = GameJournal("g", str(tmp_path), snapshot_every=100)
+    journal.keys["host"] = "secret"
+    play(journal, bank, EVENTS[:2])
+    journal.close()
+    assert json.loads((tmp_path / "g.snap").read_text())["seq"] == 1
+
+    journal = GameJournal("g", str(tmp_path), snapshot_every=100)
+    journal.keys.update(host="fresh", pad="new")
+    s = new_state()
+    assert journal.restore(s, lambda _s: bank) and s.q_in_round == 0
+    assert journal.keys == {"host": "secret", "pad": "new"}
+    play_on = ["go_next"]
+    apply_event(s, bank, play_on)
+    journal.append(play_on, s)  # "pad" is not on disk yet: this event writes a snapshot
+    assert json.loads((tmp_path / "g.snap").read_text())["keys"] == {"host": "secret", "pad": "new"}
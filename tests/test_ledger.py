@@ -0,0 +1,53 @@
+import copy
+
+import pytest
+
+from feud.ledger import ScoreLedger
+
+def test_record_and_withdraw_keep_totals_and_rounds():
+    led = ScoreLedger(3)
+    led.record(0, 0, 1, 0, 30)
+    led.record(0, 1, 2, 0, 20)
+    led.record(5, 0, 1, 1, 10)
+    assert led.totals() == (0, 40, 20)
+    assert led.round_totals(0) == (0, 30, 20) and led.round_totals(1) == (0, 10, 0)
+    assert led.round_totals(7) == (0, 0, 0)
+    assert led.rounds() == [0, 1]
+    assert led.award(0, 1) == (2, 0, 20)
+
+    assert led.withdraw(5, 0) == 1
+    assert led.withdraw(5, 0) is None
+    assert led.totals() == (0, 30, 20) and led.rounds() == [0]
+
+def test_reassignment_moves_exactly_its_points():
+    led = ScoreLedger(2)
+    led.record(0, 0, 0, 0, 40)
+    led.record(0, 0, 1, 0, 40)
+    assert led.totals() == (0, 40)
+    assert led.award(0, 0) == (1, 0, 40)
+
+def test_ranking_best_first_ties_in_team_order():
+    led = ScoreLedger(4)
+    assert led.ranking() == (0, 1, 2, 3) and led.top_is_tied()
+    led.record(0, 0, 2, 0, 10)
+    assert led.ranking() == (2, 0, 1, 3) and not led.top_is_tied()
+    led.record(0, 1, 3, 0, 10)
+    assert led.ranking() == (2, 3, 0, 1) and led.top_is_tied()
+    led.record(0, 2, 3, 0, 5)
+    led.withdraw(0, 0)
+    assert led.ranking() == (3, 0, 1, 2)
+
+def test_list_round_trip_and_copies():
+    led = ScoreLedger(2)
+    led.record(3, 1, 1, 0, 12)
+    led.record(8, 0, 0, 2, 7)
+    again = ScoreLedger.from_list(led.to_list())
+    assert again == led and again.totals() == (7, 12) and again.ranking() == (1, 0)
+    c = copy.deepcopy(led)
+    c.withdraw(3, 1)
+    assert c != led and led.total(1) == 12
+
+@pytest.mark.parametrize("data", [[], [[2], [0, 0, 5, 0, 10]], [[2], [0, 0]], "nope"])
+def test_from_list_rejects_damaged_data(data):
+    with pytest.raises(ValueError):
+        ScoreLedger.from_list(data)
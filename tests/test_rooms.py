@@ -0,0 +1,35 @@
+import pytest
+
+from feud import rooms
+from feud.journal import GameJournal
+from feud.rooms import RoomRegistry
+
+START = ["start_game", 2, ["A", "B"], {}]
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    monkeypatch.setattr(rooms, "GameJournal", lambda room_id: GameJournal(room_id, str(tmp_path)))
+    return RoomRegistry(max_rooms=10)
+
+def test_host_key_is_needed_to_open_a_room(registry):
+    room = registry.open(None, None)
+    assert registry.open(room.room_id, room.host_key) is room
+    for key in (None, "", "wrong", room.host_key[:-1]):
+        other = registry.open(room.room_id, key)
+        assert other.room_id != room.room_id and other.host_key != room.host_key
+    assert registry.get(room.room_id) is room
+
+def test_host_key_survives_a_restart(registry):
+    room = registry.open(None, None)
+    room.apply(START, 0.0)
+    room.journal.close()
+
+    restarted = RoomRegistry()
+    back = restarted.open(room.room_id, room.host_key)
+    assert back.room_id == room.room_id and back.restored and back.state.started
+    assert back.pad_key == room.pad_key and not back.is_host(room.pad_key)
+    assert restarted.open(room.room_id, "wrong").room_id != room.room_id
+
+def test_an_id_without_a_game_is_not_handed_out(registry):
+    room = registry.open("never-played", "guess")
+    assert room.room_id != "never-played" and not room.restored
@@ -0,0 +1,38 @@
+import json
+
+from conftest import bank_data
+from feud.validate import ERROR, WARNING, check_file, check_text, has_errors
+
+def test_valid_bank_has_no_problems():
+    assert check_text("q.json", json.dumps(bank_data(tiebreakers=1), indent=1)) == []
+
+def test_points_not_a_number_is_positioned():
+    text = json.dumps(bank_data(), indent=1).replace('"points": 50', '"points": "ten"', 1)
+    (p,) = check_text("q.json", text)
+    assert (p.severity, p.round, p.question) == (ERROR, 1, 1)
+    assert text.splitlines()[p.line - 1][p.col - 1:] == "{"  # the first answer of the first question
+    assert "points 'ten' are not a number" in str(p)
+
+def test_invalid_json_is_one_error():
+    (p,) = check_text("q.json", '{"rounds": [ {"title": "R", "questions": []}')
+    assert p.severity == ERROR and p.round is None and "invalid JSON" in p.message
+
+def test_repeated_answer_is_a_warning():
+    text = '[{"prompt": "P", "answers": [{"text": "a", "points": 1}, {"text": "a", "points": 2}]}]'
+    (p,) = check_text("q.json", text)
+    assert (p.severity, p.round, p.question) == (WARNING, 1, 1) and not has_errors([p])
+
+def test_question_without_answers_is_skipped():
+    problems = check_text("q.json", '[{"prompt": "P", "answers": []}]')
+    assert has_errors(problems)
+    assert any("question skipped" in p.message for p in problems)
+    assert any("no valid questions" in p.message for p in problems)
+    assert [(p.line, p.col) for p in problems] == sorted((p.line, p.col) for p in problems)
+
+def test_check_file_reports_unreadable_and_non_utf8(tmp_path):
+    (p,) = check_file(str(tmp_path / "missing.json"))
+    assert p.severity == ERROR and "cannot read" in p.message
+    path = tmp_path / "latin1.json"
+    path.write_bytes(b'[{"prompt": "\xe9t\xe9"}]')
+    (p,) = check_file(str(path))
+    assert p.severity == ERROR and "not UTF-8" in p.message
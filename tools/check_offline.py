@@ -0,0 +1,120 @@
+"""Check that the app makes no request outside its own server.
+
+    python tools/check_offline.py [--bank files/questions.json]
+
+Plays a short game headlessly (Streamlit's AppTest: home, round intro, a
+question with a reveal and a strike, final, audience display, leaderboard) and
+scans everything the server sends to the browser for URLs of other hosts: page
+elements, component arguments (the stylesheet), the component frontends.
+Also checks that Streamlit's usage statistics are off and reports missing font
+files (those only fall back to other fonts). Exits 1 on any external URL.
+"""
+import argparse
+import glob
+import os
+import re
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+SCRIPT = os.path.join(ROOT, "family_feud_streamlit.py")
+# scheme-relative //host too; the app's own URLs are relative (app/static/..., ?view=...)
+EXTERNAL = re.compile(r"""(?:https?:)?//(?!localhost[:/]|127\.0\.0\.1[:/])[A-Za-z0-9.-]+\.[A-Za-z]{2,}[^\s'"()<>\\]*""")
+
+def walk(node):
+    yield node
+    for child in getattr(node, "children", {}).values():
+        yield from walk(child)
+
+def scan(text, where, found):
+    for url in EXTERNAL.findall(text):
+        found.setdefault(url, set()).add(where)
+
+def scan_page(at, where, found):
+    assert not at.exception, f"{where}: {at.exception}"
+    for node in walk(at._tree):
+        proto = getattr(node, "proto", None)
+        if proto is not None:
+            scan(str(proto), where, found)
+
+def play(found):
+    from streamlit.testing.v1 import AppTest
+
+    def button(at, text):
+        return next(b for b in at.button if text in b.label)
+
+    at = AppTest.from_file(SCRIPT, default_timeout=60).run()
+    scan_page(at, "home", found)
+    button(at, "Start").click().run()
+    scan_page(at, "round intro", found)
+    button(at, "GO").click().run()
+    at.selectbox(key="sel_0_0_0").set_value("Show").run()
+    at.button(key="strike_btn").click().run()
+    scan_page(at, "question", found)
+
+    room = at.session_state.room_id
+    audience = AppTest.from_file(SCRIPT, default_timeout=60)
+    audience.query_params.update(room=room, view="audience")
+    scan_page(audience.run(), "audience", found)
+
+    from feud.rooms import ROOMS
+    state = ROOMS.open(room, at.session_state.host_key).state
+    while not state.finished:
+        button(at, "Next").click().run()
+        if state.screen == "round_intro":
+            button(at, "GO").click().run()
+    button(at, "Continue").click().run()
+    scan_page(at, "final", found)
+
+    board = AppTest.from_file(SCRIPT, default_timeout=60)
+    board.query_params["view"] = "leaderboard"
+    scan_page(board.run(), "leaderboard", found)
+
+def usage_stats_off():
+    if os.environ.get("STREAMLIT_BROWSER_GATHER_USAGE_STATS", "").strip().lower() == "false":
+        return True
+    try:
+        with open(os.path.join(ROOT, ".streamlit", "config.toml"), encoding="utf-8") as f:
+            config = f.read()
+    except OSError:
+        return False
+    return re.search(r"^\s*gatherUsageStats\s*=\s*false\s*$", config, re.M) is not None
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--bank", help="question bank to play (default: $FEUD_QUESTIONS or files/questions.json)")
+    args = ap.parse_args(argv)
+
+    os.chdir(ROOT)
+    if args.bank:
+        os.environ["FEUD_QUESTIONS"] = args.bank
+    # keep the check's game out of the real journal and results archive
+    os.environ["FEUD_DATA_DIR"] = tempfile.mkdtemp(prefix="feud-offline-")
+    os.environ.setdefault("FEUD_ARCHIVE", os.path.join(os.environ["FEUD_DATA_DIR"], "results.db"))
+
+    found = {}
+    for path in glob.glob(os.path.join(ROOT, "feud", "*_frontend", "*.html")) + [os.path.join(ROOT, "feud", "styles.css")]:
+        with open(path, encoding="utf-8") as f:
+            scan(f.read(), os.path.relpath(path, ROOT), found)
+    play(found)
+
+    ok = True
+    for url, where in sorted(found.items()):
+        print(f"external: {url}  ({', '.join(sorted(where))})")
+        ok = False
+    if not usage_stats_off():
+        print("external: Streamlit usage statistics are on (set browser.gatherUsageStats = false)")
+        ok = False
+
+    from feud.styles import FONTS
+    missing = [name for _, name in FONTS if not os.path.exists(os.path.join(ROOT, "static", "fonts", name))]
+    if missing:
+        print(f"note: {len(missing)} font file(s) missing in static/fonts ({', '.join(missing)}); "
+              f"Poppins falls back to other fonts. Get them with: python tools/fetch_fonts.py (--lock to pin them first)")
+    print("offline: OK" if ok else "offline: external requests found")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+"""Validate question files and compile them into banks the app opens instantly.
+
+    python tools/compile_bank.py files/*.json [--check] [--out-dir DIR] [--jobs N] [--strict] [--json]
+
+Every file is checked in its own process (one per core by default); problems
+are printed as <file>:<line>:<col>: <severity>: round R, question Q: <message>.
+Files without errors are compiled next to the source (or into --out-dir) as
+<name>.feudb; point FEUD_QUESTIONS at that file to load it without indexing.
+Exits with 1 when any file has errors (or warnings, with --strict).
+"""
+import argparse
+import json
+import os
+import struct
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from feud.compiled import SUFFIX, compile_file  # noqa: E402
+from feud.validate import ERROR, WARNING, Problem, check_file  # noqa: E402
+
+def process(path, out_dir, check_only, strict):
+    # Runs in a worker: validate, then compile when the file is clean enough
+    t = time.perf_counter()
+    problems = check_file(path)
+    errors = sum(p.severity == ERROR for p in problems)
+    warnings = sum(p.severity == WARNING for p in problems)
+    if not check_only and not errors and not (strict and warnings):
+        base = os.path.splitext(os.path.basename(path))[0] + SUFFIX
+        dst = os.path.join(out_dir or os.path.dirname(path) or ".", base)
+        try:
+            stats = dict(compile_file(path, dst), output=dst)
+        except (OSError, struct.error) as e:
+            problems.append(Problem(path, 1, 1, None, None, ERROR, f"cannot compile: {e}"))
+            errors += 1
+            stats = {"output": None}
+    else:
+        stats = {"output": None}
+    return dict(path=path, errors=errors, warnings=warnings, problems=[p._asdict() for p in problems],
+                seconds=round(time.perf_counter() - t, 4), **stats)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("files", nargs="+", help="question files (JSON)")
+    ap.add_argument("--check", action="store_true", help="only validate, write nothing")
+    ap.add_argument("--out-dir", help="where to write the .feudb files (default: next to each source)")
+    ap.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="worker processes (default: one per core)")
+    ap.add_argument("--strict", action="store_true", help="treat warnings as errors")
+    ap.add_argument("--json", action="store_true", help="print one JSON report instead of text")
+    args = ap.parse_args(argv)
+
+    if args.out_dir:
+        os.makedirs(args.out_dir, exist_ok=True)
+    jobs = max(1, min(args.jobs, len(args.files)))
+    work = [(path, args.out_dir, args.check, args.strict) for path in args.files]
+    if jobs == 1:
+        results = [process(*w) for w in work]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(process, *zip(*work)))
+
+    failed = any(r["errors"] or (args.strict and r["warnings"]) for r in results)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 1 if failed else 0
+
+    for r in results:
+        for p in r["problems"]:
+            print(Problem(**p))
+        summary = f"{r['path']}: {r['errors']} error(s), {r['warnings']} warning(s)"
+        if r["output"]:
+            summary += (f"; {r['rounds']} rounds, {r['questions']} questions -> {r['output']}"
+                        f" ({r['bytes'] / 1024:.1f} KB from {r['json_bytes'] / 1024:.1f} KB)")
+        elif not args.check:
+            summary += "; not compiled"
+        print(summary, file=sys.stderr)
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+"""Export the results archive (every finished game) as CSV or JSON.
+
+    python tools/export_results.py <games|teams|rounds|questions|answers> [--format csv|json|jsonl]
+                                   [--since YYYY-MM-DD] [--db data/results.db] [-o out.csv]
+
+Rows are streamed from the database to the output, so archives of any size
+export in constant memory. Without -o the export goes to stdout.
+"""
+import argparse
+import datetime
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from feud.archive import ARCHIVE_PATH, EXPORT_TABLES, ResultsArchive  # noqa: E402
+
+def parse_since(text):
+    if not text:
+        return 0.0
+    return datetime.datetime.strptime(text, "%Y-%m-%d").timestamp()
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("table", choices=EXPORT_TABLES)
+    ap.add_argument("--format", default="csv", choices=("csv", "json", "jsonl"))
+    ap.add_argument("--since", help="only games finished on or after this date (YYYY-MM-DD)")
+    ap.add_argument("--db", default=ARCHIVE_PATH, help=f"archive database (default: {ARCHIVE_PATH})")
+    ap.add_argument("-o", "--out", help="output file (default: stdout)")
+    args = ap.parse_args(argv)
+
+    if not os.path.exists(args.db):
+        ap.error(f"no archive at {args.db}")
+    try:
+        since = parse_since(args.since)
+    except ValueError:
+        ap.error(f"--since expects YYYY-MM-DD, got {args.since!r}")
+
+    archive = ResultsArchive(args.db)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8", newline="") as out:
+            n = archive.export(args.table, args.format, out, since)
+        print(f"{n} row(s) -> {args.out}", file=sys.stderr)
+    else:
+        archive.export(args.table, args.format, sys.stdout, since)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
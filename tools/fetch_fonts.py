@@ -0,0 +1,110 @@
+"""Download the Poppins font files the app serves from static/fonts.
+
+    python tools/fetch_fonts.py [--dest static/fonts] [--force] [--strict]
+    python tools/fetch_fonts.py --lock    # pin: resolve google/fonts main once, record it
+
+Files come from one pinned google/fonts commit and are checked against the
+sha256 recorded for them in tools/fonts.lock.json; a file that does not match is
+not written. Run --lock once on a connected machine and commit the lock file (or
+commit static/fonts itself). Without a lock nothing is downloaded.
+
+The container build runs it (Containerfile). A missing or failed font only
+warns (exit 0): the app falls back to the next font. --strict exits 1 instead.
+The app itself never requests fonts from a third party.
+Poppins is licensed under the SIL Open Font License; OFL.txt is fetched too.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from feud.assets import STATIC_DIR  # noqa: E402
+
+REPO = "google/fonts"
+FOLDER = "ofl/poppins"
+NAMES = ["Poppins-Light.ttf", "Poppins-Regular.ttf", "Poppins-SemiBold.ttf", "Poppins-ExtraBold.ttf", "OFL.txt"]
+LOCK = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fonts.lock.json")
+
+def fetch(url: str) -> bytes:
+    with urllib.request.urlopen(url, timeout=30) as resp:
+        return resp.read()
+
+def source(commit: str, name: str) -> str:
+    return f"https://raw.githubusercontent.com/{REPO}/{commit}/{FOLDER}/{name}"
+
+def write(path: str, data: bytes) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+def pin(dest: str) -> int:
+    # Resolve main to a commit, download every file from it and record their digests
+    try:
+        commit = json.loads(fetch(f"https://api.github.com/repos/{REPO}/commits/main"))["sha"]
+        files = {name: fetch(source(commit, name)) for name in NAMES}
+    except (OSError, ValueError, KeyError) as e:
+        print(f"lock failed: {e}", file=sys.stderr)
+        return 1
+    for name, data in files.items():
+        write(os.path.join(dest, name), data)
+        print(f"{name}: {len(data)} bytes")
+    lock = {"repo": REPO, "commit": commit, "sha256": {n: hashlib.sha256(d).hexdigest() for n, d in files.items()}}
+    with open(LOCK, "w", encoding="utf-8") as f:
+        json.dump(lock, f, indent=2)
+        f.write("\n")
+    print(f"pinned {REPO}@{commit} in {os.path.relpath(LOCK)}; commit it")
+    return 0
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--dest", default=os.path.join(STATIC_DIR, "fonts"), help="output directory (default: static/fonts)")
+    ap.add_argument("--force", action="store_true", help="download files that are already there too")
+    ap.add_argument("--strict", action="store_true", help="exit 1 when a file is missing afterwards")
+    ap.add_argument("--lock", action="store_true", help=f"pin the current {REPO} main in {os.path.basename(LOCK)}")
+    args = ap.parse_args(argv)
+
+    os.makedirs(args.dest, exist_ok=True)
+    if args.lock:
+        return pin(args.dest)
+
+    todo = [n for n in NAMES if args.force or not os.path.exists(os.path.join(args.dest, n))]
+    for name in sorted(set(NAMES) - set(todo)):
+        print(f"{name}: already there")
+    try:
+        with open(LOCK, encoding="utf-8") as f:
+            lock = json.load(f)
+    except (OSError, ValueError) as e:
+        lock = None
+        if todo:
+            print(f"no usable {os.path.basename(LOCK)} ({e}); not downloading unpinned fonts. "
+                  f"Run with --lock on a connected machine, or put the files in {args.dest}", file=sys.stderr)
+        todo = []
+
+    missing = [n for n in NAMES if n not in todo and not os.path.exists(os.path.join(args.dest, n))]
+    for name in todo:
+        try:
+            data = fetch(source(lock["commit"], name))
+        except (OSError, KeyError, TypeError) as e:
+            print(f"{name}: download failed: {e}", file=sys.stderr)
+            missing.append(name)
+            continue
+        digest = hashlib.sha256(data).hexdigest()
+        if digest != lock.get("sha256", {}).get(name):
+            print(f"{name}: sha256 {digest} does not match the lock; not written", file=sys.stderr)
+            missing.append(name)
+            continue
+        write(os.path.join(args.dest, name), data)
+        print(f"{name}: {len(data)} bytes")
+
+    if missing:
+        print(f"warning: not in {args.dest}: {', '.join(missing)} (text falls back to the next font)", file=sys.stderr)
+        return 1 if args.strict else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+"""Rebuild final standings from a game journal.
+
+    python tools/replay_game.py <game_id | path/to/<game_id>.log> [--bank files/questions.json] [--json]
+
+Every game played in the log (one per Start ... Play again) is replayed
+through the same transitions the app uses and its standings are printed.
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from feud import game  # noqa: E402
+from feud.bank import get_bank  # noqa: E402
+from feud.journal import JOURNAL_DIR, read_events  # noqa: E402
+from feud.rooms import DEFAULT_BANK  # noqa: E402
+
+def standings(s):
+    return [(s.team_names[t], s.ledger.total(t)) for t in s.ledger.ranking()]
+
+def replay(log_path, bank_path=None):
+    games = []
+    s = game.new_state()
+    bank = get_bank(bank_path) if bank_path else None
+    current = None
+
+    for event in read_events(log_path):
+        if event[0] == "start_game":
+            meta = event[3] if len(event) > 3 and isinstance(event[3], dict) else {}
+            if not bank_path:
+                bank = get_bank(meta.get("bank") or DEFAULT_BANK)  # as Room.bank: $FEUD_QUESTIONS by default
+            if meta.get("digest") and bank.digest != meta["digest"]:
+                print(f"warning: {bank.path} changed since this game was played", file=sys.stderr)
+            current = {"teams": event[2], "finished": False}
+            games.append(current)
+        if bank is None:
+            continue
+        if event[0] == "go_home" and current is not None:
+            current["standings"], current["finished"] = standings(s), s.finished
+        game.apply_event(s, bank, event)
+
+    if current is not None and "standings" not in current:
+        current["standings"], current["finished"] = standings(s), s.finished
+    return games
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("game", help="game id (looked up in --dir) or path to a .log file")
+    ap.add_argument("--dir", default=JOURNAL_DIR, help=f"journal directory (default: {JOURNAL_DIR})")
+    ap.add_argument("--bank", help="question bank to replay against (default: the one recorded in the log, "
+                    "else $FEUD_QUESTIONS or files/questions.json)")
+    ap.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    args = ap.parse_args(argv)
+
+    log_path = args.game if args.game.endswith(".log") else os.path.join(args.dir, f"{args.game}.log")
+    if not os.path.exists(log_path):
+        ap.error(f"no journal at {log_path}")
+
+    games = replay(log_path, args.bank)
+    if args.json:
+        print(json.dumps(games, indent=2))
+        return 0
+
+    for n, g in enumerate(games, start=1):
+        state = "finished" if g["finished"] else "in progress"
+        print(f"Game {n} ({state})")
+        for pos, (lab, pts) in enumerate(g["standings"], start=1):
+            print(f"  #{pos}  Team {lab:<3} {pts:>5} pts")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())